@@ -6,6 +6,10 @@ Responsável por mostrar resultado da verificação em tempo real.
 
 import streamlit as st
 from typing import Dict, Any
+from app.services.barcode_handler import clear_scanned_items
+from app.services.artifact_cache import get_artifact_key
+from app.services.report_jobs import submit_report_job, get_report_job
+from app.components.report_jobs_component import render_job_status
 
 
 def render_comparison_result(result: Dict[str, Any]):
@@ -66,6 +70,28 @@ def render_comparison_result(result: Dict[str, Any]):
                 unsafe_allow_html=True
             )
         
+        # Serial repetido na base: mostra todos os registros candidatos
+        if result.get('candidates'):
+            st.warning(
+                f"🔁 Serial duplicado na base: **{len(result['candidates'])} registros**. "
+                "Foi considerado o primeiro; confira os demais abaixo.",
+                icon="🔁"
+            )
+            st.dataframe(
+                [
+                    {
+                        "Serial": c['serialnumber'],
+                        "Estado": str(c['state']).upper(),
+                        "Hostname": c['name'],
+                        "Último Usuário": c['lastuser'],
+                        "Patrimônio": c.get('ativo')
+                    }
+                    for c in result['candidates']
+                ],
+                use_container_width=True,
+                hide_index=True
+            )
+        
         if result['found']:
             # Details Section
             if result['requires_adjustment']:
@@ -122,74 +148,109 @@ def render_session_metrics():
     # PDF Export Buttons
     if total > 0:
         st.markdown("### 📄 Gerar Relatórios PDF")
-        col1, col2 = st.columns(2)
+        render_session_reports(total_adj)
+    
+    st.divider()
+
+
+@st.fragment
+def render_session_reports(total_adj: int):
+    """
+    Renderiza os botões dos relatórios PDF da sessão.
+    
+    O clique agenda a geração em segundo plano com o histórico daquele
+    momento; o botão de download aparece quando o PDF fica pronto, sem
+    bloquear o scanner (só o andamento é atualizado periodicamente, ver
+    render_job_status).
+    
+    Args:
+        total_adj: Quantidade de itens que requerem ajuste
+    """
+    from app.services.pdf_generator import generate_session_report_pdf, generate_adjustment_list_pdf
+    from datetime import datetime
+    from zoneinfo import ZoneInfo
+    import pandas as pd
+    
+    session_id = st.session_state.get('session_id', 'current')
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("📊 Relatório Completo (PDF)", use_container_width=True, type="primary"):
+            session_data = {
+                'session_id': session_id,
+                'timestamp': datetime.now(ZoneInfo("America/Sao_Paulo"))
+            }
+            items = list(st.session_state.scanned_items)
+            dataframe = st.session_state.get('dataframe', pd.DataFrame())
+            
+            submit_report_job(
+                'session_pdf',
+                get_artifact_key('session_pdf', session_id),
+                lambda: generate_session_report_pdf(
+                    session_data=session_data,
+                    scanned_items=items,
+                    dataframe=dataframe,
+                    format_type="complete"
+                )
+            )
         
-        with col1:
-            if st.button("📊 Relatório Completo (PDF)", use_container_width=True, type="primary"):
-                try:
-                    from app.services.pdf_generator import generate_session_report_pdf
-                    from datetime import datetime
-                    from zoneinfo import ZoneInfo
-                    import pandas as pd
-                    
-                    session_data = {
-                        'session_id': st.session_state.get('session_id', 'current'),
-                        'timestamp': datetime.now(ZoneInfo("America/Sao_Paulo"))
-                    }
-                    
-                    pdf_bytes = generate_session_report_pdf(
-                        session_data=session_data,
-                        scanned_items=st.session_state.scanned_items,
-                        dataframe=st.session_state.get('dataframe', pd.DataFrame()),
-                        format_type="complete"
-                    )
-                    
-                    filename = f"verificacao_completa_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-                    
-                    st.download_button(
-                        label="⬇️ Baixar Relatório Completo",
-                        data=pdf_bytes,
-                        file_name=filename,
-                        mime="application/pdf",
-                        use_container_width=True
+        _render_session_report_job(
+            'session_pdf',
+            session_id,
+            label="⬇️ Baixar Relatório Completo",
+            file_prefix="verificacao_completa"
+        )
+    
+    with col2:
+        if total_adj > 0:
+            if st.button("⚠️ Lista de Ajustes (PDF)", use_container_width=True, type="secondary"):
+                items = list(st.session_state.scanned_items)
+                
+                submit_report_job(
+                    'adjustment_pdf',
+                    get_artifact_key('adjustment_pdf', session_id),
+                    lambda: generate_adjustment_list_pdf(
+                        scanned_items=items,
+                        session_id=session_id
                     )
-                    
-                    st.success("✅ Relatório gerado com sucesso!")
-                    
-                except Exception as e:
-                    st.error(f"❌ Erro ao gerar PDF: {str(e)}")
-        
-        with col2:
-            if total_adj > 0:
-                if st.button("⚠️ Lista de Ajustes (PDF)", use_container_width=True, type="secondary"):
-                    try:
-                        from app.services.pdf_generator import generate_adjustment_list_pdf
-                        from datetime import datetime
-                        
-                        session_id = st.session_state.get('session_id', 'current')
-                        pdf_bytes = generate_adjustment_list_pdf(
-                            scanned_items=st.session_state.scanned_items,
-                            session_id=session_id
-                        )
-                        
-                        filename = f"ajustes_lansweeper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-                        
-                        st.download_button(
-                            label="⬇️ Baixar Lista de Ajustes",
-                            data=pdf_bytes,
-                            file_name=filename,
-                            mime="application/pdf",
-                            use_container_width=True
-                        )
-                        
-                        st.success(f"✅ Lista com {total_adj} item(ns) gerada!")
-                        
-                    except Exception as e:
-                        st.error(f"❌ Erro ao gerar PDF: {str(e)}")
-            else:
-                st.info("✅ Nenhum item requer ajuste!")
+                )
+            
+            _render_session_report_job(
+                'adjustment_pdf',
+                session_id,
+                label="⬇️ Baixar Lista de Ajustes",
+                file_prefix="ajustes_lansweeper"
+            )
+        else:
+            st.info("✅ Nenhum item requer ajuste!")
+
+
+def _render_session_report_job(name: str, session_id: str, label: str, file_prefix: str):
+    """
+    Renderiza o andamento ou o download de um relatório PDF da sessão.
     
-    st.divider()
+    Args:
+        name: Nome do relatório ('session_pdf' ou 'adjustment_pdf')
+        session_id: Identificador da sessão (parte da chave do relatório)
+        label: Rótulo do botão de download
+        file_prefix: Prefixo do nome do arquivo
+    """
+    from datetime import datetime
+    
+    job = get_report_job(name)
+    if job is None:
+        return
+    
+    render_job_status(
+        job,
+        label=label,
+        file_name=f"{file_prefix}_{datetime.fromtimestamp(job['submitted_at']).strftime('%Y%m%d_%H%M%S')}.pdf",
+        mime="application/pdf",
+        key=f"btn_{name}_download"
+    )
+    
+    if job['key'] != get_artifact_key(name, session_id):
+        st.caption("Há leituras novas desde a geração; gere novamente para incluí-las.")
 
 
 def render_comparison_component():
@@ -214,7 +275,7 @@ def render_history_table():
         col_head.markdown("#### 🕒 Histórico da Sessão")
         
         if col_btn.button("🗑️ Limpar Sessão", type="secondary", use_container_width=True):
-            st.session_state.scanned_items = []
+            clear_scanned_items()
             st.session_state.last_scan_result = None
             st.rerun()
 
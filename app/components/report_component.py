@@ -3,6 +3,7 @@ import pandas as pd
 from datetime import datetime
 from app.services.excel_handler import export_adjustment_list, export_scanned_history
 from app.services.report_metrics import calculate_general_metrics, get_adjustment_items
+from app.components.report_jobs_component import render_report_download
 from app.utils.constants import STATE_EMOJI
 
 def render_report_component():
@@ -105,53 +106,48 @@ def render_report_component():
             }
         )
         
-        # Export missing items
-        from app.services.excel_handler import export_excel
+        # Export missing items (gerados em segundo plano; a leitura continua)
         from app.services.pdf_generator import generate_conciliation_pdf
         from io import BytesIO
-        import openpyxl
         
-        # Excel Button
-        output = BytesIO()
-        missing_stock.to_excel(output, index=False, engine='openpyxl')
-        output.seek(0)
+        def build_missing_xlsx() -> bytes:
+            output = BytesIO()
+            missing_stock.to_excel(output, index=False, engine='openpyxl')
+            return output.getvalue()
+        
+        session_data = {
+            'session_id': st.session_state.get('session_id', 'current'),
+            'timestamp': datetime.now()
+        }
         
         col_btn_excel, col_btn_pdf = st.columns(2)
         
         with col_btn_excel:
-            st.download_button(
+            render_report_download(
+                'missing_stock_xlsx',
+                build_missing_xlsx,
+                (),
                 label="📥 Excel (.xlsx)",
-                data=output.getvalue(),
                 file_name=f"faltantes_estoque_{datetime.now().strftime('%Y%m%d')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                key="btn_missing_stock_xlsx",
-                use_container_width=True,
+                key="btn_missing_stock_xlsx"
             )
         
         # PDF Button
         with col_btn_pdf:
-            try:
-                session_data = {
-                    'session_id': st.session_state.get('session_id', 'current'),
-                    'timestamp': datetime.now()
-                }
-                
-                pdf_bytes = generate_conciliation_pdf(
+            render_report_download(
+                'conciliation_pdf',
+                lambda: generate_conciliation_pdf(
                     session_data=session_data,
                     missing_stock=missing_stock
-                )
-                
-                st.download_button(
-                    label="📄 Relatório PDF",
-                    data=pdf_bytes,
-                    file_name=f"relatorio_conciliacao_{datetime.now().strftime('%Y%m%d')}.pdf",
-                    mime="application/pdf",
-                    key="btn_missing_stock_pdf",
-                    use_container_width=True,
-                    type="primary"
-                )
-            except Exception as e:
-                st.error(f"Erro PDF: {e}")
+                ),
+                (session_data['session_id'],),
+                label="📄 Relatório PDF",
+                file_name=f"relatorio_conciliacao_{datetime.now().strftime('%Y%m%d')}.pdf",
+                mime="application/pdf",
+                key="btn_missing_stock_pdf",
+                type="primary"
+            )
     else:
         st.success("✅ Todos os itens de estoque conferem com o sistema!")
 
@@ -173,15 +169,14 @@ def render_report_component():
             st.caption(f"Itens ativos encontrados: **{count_adjustment}**")
             
             if count_adjustment > 0:
-                df_adj = pd.DataFrame(items_adjustment)
-                excel_adj = export_adjustment_list(df_adj)
-                st.download_button(
+                render_report_download(
+                    'adjustment_xlsx',
+                    lambda: export_adjustment_list(pd.DataFrame(items_adjustment)),
+                    (),
                     label="Baixar Planilha de Ajustes (.xlsx)",
-                    data=excel_adj,
                     file_name="ajustar_lansweeper.xlsx",
                     mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                     key="btn_rep_adj",
-                    use_container_width=True,
                     type="primary"
                 )
             else:
@@ -194,14 +189,14 @@ def render_report_component():
             st.caption(f"Total de registros: **{total_scanned}**")
             
             current_date = datetime.now().strftime("%d_%m_%Y")
-            excel_hist = export_scanned_history(scanned_items)
+            history_items = list(scanned_items)
             
-            st.download_button(
+            render_report_download(
+                'history_xlsx',
+                lambda: export_scanned_history(history_items),
+                (),
                 label="Baixar Relatório Completo (.xlsx)",
-                data=excel_hist,
                 file_name=f"verificacao_stock_{current_date}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                key="btn_rep_full",
-                use_container_width=True
+                key="btn_rep_full"
             )
-
@@ -0,0 +1,133 @@
+"""
+Componente de acompanhamento dos relatórios gerados em segundo plano.
+
+Exibe o andamento da geração e o botão de download quando o relatório fica
+pronto. Só o andamento é um fragmento atualizado periodicamente (sem rerun
+da página inteira: o scanner continua disponível durante a geração); ao
+concluir, um único rerun troca o andamento pelo botão de download, que é
+estático e não reenvia os bytes a cada atualização.
+"""
+
+import time
+import streamlit as st
+from typing import Callable, Dict, Any, Hashable, Tuple
+from app.config import REPORT_JOB_POLL_SECONDS
+from app.services.report_jobs import (
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_FAILED,
+    request_report,
+    get_report_job,
+    get_job_status,
+    get_job_error,
+    collect_report_job,
+    submit_report_job
+)
+
+STATUS_LABELS = {
+    JOB_QUEUED: "⏳ Relatório na fila...",
+    JOB_RUNNING: "⚙️ Gerando relatório em segundo plano...",
+}
+
+
+def render_job_status(
+    job: Dict[str, Any],
+    label: str,
+    file_name: str,
+    mime: str,
+    key: str,
+    **button_kwargs: Any
+) -> None:
+    """
+    Renderiza o estado de um job: andamento, erro ou botão de download.
+
+    Args:
+        job: Job de submit_report_job
+        label: Rótulo do botão de download
+        file_name: Nome do arquivo baixado
+        mime: Tipo do arquivo
+        key: Chave do widget de download
+        **button_kwargs: Demais argumentos de st.download_button
+    """
+    status = get_job_status(job)
+
+    if status in STATUS_LABELS:
+        render_job_progress(job)
+        return
+
+    if status == JOB_FAILED:
+        st.error(f"❌ Erro ao gerar relatório: {get_job_error(job)}")
+        if st.button("🔄 Tentar novamente", key=f"{key}_retry", use_container_width=True):
+            submit_report_job(job['name'], job['key'], job['build'], retry=True)
+            st.rerun()
+        return
+
+    st.download_button(
+        label=label,
+        data=collect_report_job(job),
+        file_name=file_name,
+        mime=mime,
+        key=key,
+        use_container_width=True,
+        **button_kwargs
+    )
+
+
+@st.fragment(run_every=REPORT_JOB_POLL_SECONDS)
+def render_job_progress(job: Dict[str, Any]) -> None:
+    """
+    Exibe o andamento de um job na fila ou em execução, atualizado periodicamente.
+
+    Ao concluir (ou falhar), dispara o rerun da página: o fragmento deixa de
+    ser renderizado e o polling termina.
+
+    Args:
+        job: Job de submit_report_job
+    """
+    status = get_job_status(job)
+
+    if status not in STATUS_LABELS:
+        st.rerun()
+
+    elapsed = time.time() - job['submitted_at']
+    st.caption(f"{STATUS_LABELS[status]} ({elapsed:.0f}s)")
+
+
+def render_report_download(
+    name: str,
+    build: Callable[[], bytes],
+    parts: Tuple[Hashable, ...],
+    label: str,
+    file_name: str,
+    mime: str,
+    key: str,
+    **button_kwargs: Any
+) -> None:
+    """
+    Gera em segundo plano o relatório do estado atual e exibe o download quando pronto.
+
+    Args:
+        name: Nome do relatório (ex: 'history_xlsx')
+        build: Função que gera os bytes (sem acesso a st.session_state)
+        parts: Entradas adicionais da chave do relatório
+        label: Rótulo do botão de download
+        file_name: Nome do arquivo baixado
+        mime: Tipo do arquivo
+        key: Chave do widget de download
+        **button_kwargs: Demais argumentos de st.download_button
+    """
+    _, data = request_report(name, build, *parts)
+
+    if data is None:
+        render_job_status(get_report_job(name), label, file_name, mime, key, **button_kwargs)
+        return
+
+    st.download_button(
+        label=label,
+        data=data,
+        file_name=file_name,
+        mime=mime,
+        key=key,
+        use_container_width=True,
+        **button_kwargs
+    )
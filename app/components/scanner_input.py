@@ -5,8 +5,14 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from app.services.barcode_handler import process_serial
+from app.services.barcode_handler import (
+    process_serial,
+    is_already_scanned,
+    add_scanned_item,
+    pop_scanned_item
+)
 from app.services.comparator import compare_and_flag
+from app.services.serial_suggestions import suggest_similar_serials, search_prefix
 from app.services.history_manager import save_session_to_sharepoint
 
 
@@ -19,13 +25,33 @@ def show_not_found_dialog(serial):
     st.warning(f"O serial **{serial}** não foi encontrado na base de dados.")
     st.info("💡 Isso pode ter ocorrido devido a uma leitura incorreta do código de barras ou equipamento não cadastrado.")
     
+    # Sugestões de seriais parecidos (leitura incorreta / digitação)
+    suggestions = suggest_similar_serials(
+        serial,
+        st.session_state.dataframe,
+        st.session_state.get('suggestion_index')
+    )
+    
+    if suggestions:
+        st.markdown("**Você quis dizer?**")
+        for i, suggestion in enumerate(suggestions):
+            label = f"{suggestion['serialnumber']} · {suggestion['state'].upper()} · {suggestion['name']}"
+            if st.button(label, use_container_width=True, key=f"btn_suggestion_{i}"):
+                _replace_not_found_with(suggestion['serialnumber'])
+                st.session_state.blocked_scan = False
+                st.session_state.blocked_serial = None
+                st.session_state.scanner_input = ""
+                st.session_state.force_verification_tab = True  # Força voltar para aba Verificação
+                st.rerun()
+        st.divider()
+    
     col1, col2 = st.columns(2)
     
     with col1:
         if st.button("🗑️ Remover do Registro", use_container_width=True, type="primary", key="btn_remove"):
             # Remove última entrada (que foi a não encontrada)
             if st.session_state.scanned_items:
-                st.session_state.scanned_items.pop(0)
+                pop_scanned_item(0)
                 st.session_state.last_scan_result = st.session_state.scanned_items[0] if st.session_state.scanned_items else None
             st.session_state.blocked_scan = False
             st.session_state.blocked_serial = None
@@ -96,7 +122,11 @@ def render_scanner_input():
             
             if valid_format:
                 # 2. Compara com a base de dados
-                result = compare_and_flag(processed_serial, st.session_state.dataframe)
+                result = compare_and_flag(
+                    processed_serial,
+                    st.session_state.dataframe,
+                    st.session_state.get('lookup_index')
+                )
                 
                 # Adiciona timestamp com horário de Brasília (não do servidor Streamlit)
                 result['timestamp'] = datetime.now(ZoneInfo("America/Sao_Paulo"))
@@ -105,7 +135,7 @@ def render_scanner_input():
                 # IMPORTANTE: Usar serialnumber do resultado, não o input digitado
                 # Se buscar por patrimônio 9856, deve verificar duplicidade pelo serial JQHP813
                 serial_to_check = result.get('serialnumber', processed_serial) if result.get('found') else processed_serial
-                already_scanned = any(item['serialnumber'] == serial_to_check for item in st.session_state.scanned_items)
+                already_scanned = is_already_scanned(serial_to_check)
                 
                 if already_scanned:
                      st.toast(f"⚠️ Item '{serial_to_check}' já verificado nesta sessão!", icon="⚠️")
@@ -121,7 +151,7 @@ def render_scanner_input():
                         st.toast(f"✅ {processed_serial} verificado com sucesso!", icon="✅")
                     
                     # Adiciona ao histórico (topo)
-                    st.session_state.scanned_items.insert(0, result)
+                    add_scanned_item(result)
                     st.session_state.last_scan_result = result
                     _auto_save_session()  # AUTO-SAVE
                     
@@ -130,7 +160,7 @@ def render_scanner_input():
                     st.toast(f"❌ {processed_serial} não encontrado na base!", icon="❌")
                     
                     # Adiciona ao histórico mesmo não encontrado
-                    st.session_state.scanned_items.insert(0, result)
+                    add_scanned_item(result)
                     st.session_state.last_scan_result = result
                     _auto_save_session()  # AUTO-SAVE
                     
@@ -157,6 +187,78 @@ def render_scanner_input():
         on_change=on_scan,
         help="Certifique-se que o leitor USB está conectado."
     )
+    
+    _render_manual_search(on_scan)
+
+
+def _render_manual_search(on_scan):
+    """
+    Renderiza busca manual com autocompletar (entrada sem leitor, ex: MacBooks).
+    
+    Args:
+        on_scan: Callback de leitura usado quando um candidato é escolhido
+    """
+    with st.expander("⌨️ Digitação manual (autocompletar)"):
+        prefix = st.text_input(
+            "Início do serial, hostname ou patrimônio:",
+            key="manual_search_prefix",
+            placeholder="Ex: JQH, NB-, 98..."
+        )
+        
+        if not prefix:
+            return
+        
+        matches = [
+            m for m in search_prefix(prefix, st.session_state.get('prefix_index'), limit=20)
+            if not m['removed']
+        ][:8]
+        
+        if not matches:
+            st.caption("Nenhum equipamento da base começa com esse texto.")
+            return
+        
+        df = st.session_state.dataframe
+        for i, match in enumerate(matches):
+            serial = str(df.iloc[match['position']]['Serialnumber'])
+            label = serial if match['field'] == 'serial' else f"{serial} ({match['field']}: {match['value']})"
+            st.button(
+                label,
+                key=f"btn_manual_{i}",
+                use_container_width=True,
+                on_click=_select_manual_candidate,
+                args=(serial, on_scan)
+            )
+
+
+def _select_manual_candidate(serial: str, on_scan):
+    """Envia o candidato escolhido pelo mesmo fluxo de leitura do scanner."""
+    st.session_state.scanner_input = serial
+    st.session_state.manual_search_prefix = ""
+    on_scan()
+
+
+def _replace_not_found_with(serial: str):
+    """
+    Substitui o último registro (não encontrado) pelo serial sugerido escolhido.
+    
+    Args:
+        serial: Serial da base escolhido pelo operador
+    """
+    pop_scanned_item(0)
+    
+    result = compare_and_flag(serial, st.session_state.dataframe, st.session_state.get('lookup_index'))
+    result['timestamp'] = datetime.now(ZoneInfo("America/Sao_Paulo"))
+    
+    already_scanned = is_already_scanned(result['serialnumber'])
+    
+    if already_scanned:
+        st.toast(f"⚠️ Item '{result['serialnumber']}' já verificado nesta sessão!", icon="⚠️")
+    else:
+        add_scanned_item(result)
+        st.toast(f"✅ {result['serialnumber']} verificado com sucesso!", icon="✅")
+    
+    st.session_state.last_scan_result = st.session_state.scanned_items[0] if st.session_state.scanned_items else None
+    _auto_save_session()  # AUTO-SAVE
 
 
 def _auto_save_session():
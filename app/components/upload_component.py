@@ -11,9 +11,17 @@ Responsabilidades:
 import streamlit as st
 import pandas as pd
 from typing import Optional
-from app.services.excel_handler import import_excel, validate_excel_structure
+from app.services.excel_handler import import_excel, validate_excel_structure, get_file_extension
+from app.services.comparator import build_lookup_index, get_normalized_states, get_duplicate_serials
+from app.services.serial_suggestions import build_suggestion_index, build_prefix_index, search_prefix
+from app.services.base_refresh import diff_bases, apply_base_delta, refresh_scanned_items
+from app.services.barcode_handler import replace_scanned_items
 from app.config import MAX_FILE_SIZE_MB
-from app.utils.constants import ALLOWED_EXTENSIONS
+from app.utils.helpers import format_file_size
+from app.utils.profiling import measure_stage, log_stage_report, get_peak_rss_bytes
+from app.utils.constants import (
+    ALLOWED_EXTENSIONS, STATE_NORMALIZED_COLUMN, FILTER_REASON_COLUMN, FILTER_REASONS
+)
 
 
 def render_upload_component() -> Optional[pd.DataFrame]:
@@ -26,7 +34,8 @@ def render_upload_component() -> Optional[pd.DataFrame]:
     st.markdown("## 📥 Upload da Base Lansweeper")
     st.markdown(
         """
-        Faça upload do arquivo Excel exportado do **Lansweeper** contendo os dados dos equipamentos.
+        Faça upload do arquivo Excel ou CSV exportado do **Lansweeper** contendo os dados dos equipamentos.
+        Para bases grandes, prefira a exportação CSV (importação bem mais rápida).
         
         **Colunas obrigatórias:** `Serialnumber`, `State`, `Name`, `lastuser`
         """
@@ -34,8 +43,8 @@ def render_upload_component() -> Optional[pd.DataFrame]:
     
     # File uploader
     uploaded_file = st.file_uploader(
-        "Selecione o arquivo Excel (.xlsx ou .xls)",
-        type=['xlsx', 'xls'],
+        "Selecione o arquivo (.xlsx, .xls, .csv ou .csv.gz)",
+        type=[extension.rsplit('.', 1)[-1] for extension in ALLOWED_EXTENSIONS],
         help=f"Tamanho máximo: {MAX_FILE_SIZE_MB} MB"
     )
     
@@ -52,25 +61,58 @@ def render_upload_component() -> Optional[pd.DataFrame]:
         )
         return None
     
+    extension = get_file_extension(uploaded_file.name)
+    if not extension:
+        st.error(
+            f"❌ Formato não suportado: **{uploaded_file.name}**. "
+            f"Use um dos formatos: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+        return None
+    
     # Show file info
     st.success(f"✅ Arquivo carregado: **{uploaded_file.name}** ({file_size_mb:.2f} MB)")
     
-    # Load Excel with spinner
-    with st.spinner("🔄 Processando arquivo Excel..."):
-        try:
-            # Save to temporary file for processing
-            import tempfile
-            import os
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_path = tmp_file.name
+    # With a base already loaded, a new export can be applied as a delta.
+    # The choice is confirmed (and kept per file_id) before anything is imported,
+    # so the loaded base is never replaced before the user decides.
+    refresh_mode = False
+    if (
+        st.session_state.get('dataframe') is not None
+        and uploaded_file.file_id != st.session_state.get('base_file_id')
+    ):
+        choice = st.session_state.get('upload_choice') or {}
+        
+        if choice.get('file_id') != uploaded_file.file_id:
+            selected = st.radio(
+                "Como usar este arquivo?",
+                options=[False, True],
+                format_func=lambda value: (
+                    "🔄 Atualizar base carregada (mantém os itens já bipados)" if value
+                    else "📥 Substituir base carregada"
+                ),
+                key="upload_refresh_mode"
+            )
             
-            # Import Excel
-            df, df_removed = import_excel(tmp_path)
+            if not st.button("✅ Confirmar", key="upload_refresh_confirm"):
+                st.info("ℹ️ Escolha como usar o arquivo e confirme para continuar. A base atual segue carregada.")
+                return st.session_state.dataframe
             
-            # Remove temporary file
-            os.unlink(tmp_path)
+            choice = {'file_id': uploaded_file.file_id, 'refresh': selected}
+            st.session_state.upload_choice = choice
+        
+        refresh_mode = choice['refresh']
+    
+    if refresh_mode and st.session_state.get('refreshed_file_id') == uploaded_file.file_id:
+        _render_refresh_summary(st.session_state.base_refresh_summary)
+        return st.session_state.dataframe
+    
+    # Load file with spinner
+    with st.spinner("🔄 Processando arquivo..."):
+        try:
+            # Import straight from the in-memory upload buffer (no temp file copy);
+            # its name carries the extension that selects the reader
+            import_report = {}
+            df, df_removed = import_excel(uploaded_file, import_report=import_report)
             
             if df is None:
                 st.error("❌ Erro ao processar arquivo. Verifique o formato e tente novamente.")
@@ -99,17 +141,68 @@ def render_upload_component() -> Optional[pd.DataFrame]:
                 "foram importados. Desktops e VMs foram excluídos automaticamente."
             )
             
+            if import_report.get('cache') == 'hit':
+                st.caption("⚡ Base já importada anteriormente: carregada do cache local.")
+            elif 'engine' in import_report:
+                st.caption(
+                    f"⏱️ Leitura do arquivo: {import_report['parse_seconds']:.2f} s "
+                    f"(engine: {import_report['engine']})"
+                )
+            
+            # Memory footprint of the compact base
+            if 'memory' in import_report:
+                memory = import_report['memory']
+                st.caption(
+                    f"💾 Base compacta em memória: {format_file_size(memory['compact_bytes'])} "
+                    f"({memory['kept_columns']} de {memory['source_columns']} colunas). "
+                    f"Sem o modo compacto: ~{format_file_size(memory['raw_bytes_estimate'])} "
+                    f"(estimativa), economia de ~{format_file_size(memory['saved_bytes_estimate'])}, "
+                    f"dos quais {format_file_size(memory['category_saved_bytes'])} na conversão "
+                    f"para Categorical."
+                )
+            
+            stages = import_report.setdefault('stages', [])
+            
+            if refresh_mode:
+                with measure_stage(stages, 'refresh', rows_in=len(df)) as stage:
+                    summary = _apply_base_refresh(df, df_removed)
+                    stage['rows_out'] = summary['total']
+                st.session_state.refreshed_file_id = uploaded_file.file_id
+                st.session_state.base_identity = f"{st.session_state.get('base_identity')}+{uploaded_file.file_id}"
+                st.session_state.base_refresh_summary = summary
+                st.session_state.filename = uploaded_file.name
+                _render_refresh_summary(summary)
+                _report_import_stages(uploaded_file.name, import_report)
+                return st.session_state.dataframe
+            
             # Display preview
-            _render_data_preview(df)
+            with measure_stage(stages, 'preview', rows_in=len(df)):
+                _render_data_preview(df)
+            
+            # Build lookup indexes once per upload
+            with measure_stage(stages, 'indexes', rows_in=len(df)):
+                lookup_index = build_lookup_index(df)
+                prefix_index = build_prefix_index(df, df_removed)
+                suggestion_index = build_suggestion_index(df)
+            
+            # Duplicate serials summary (re-imaged machines, laptop + dock, etc.)
+            _render_duplicate_summary(df, get_duplicate_serials(lookup_index))
             
             # Render debug tool
             if df_removed is not None:
-                _render_debug_tool(df, df_removed)
+                _render_debug_tool(df, df_removed, prefix_index)
             
             # Store in session state
             st.session_state.dataframe = df
+            st.session_state.lookup_index = lookup_index
+            st.session_state.suggestion_index = suggestion_index
+            st.session_state.prefix_index = prefix_index
             st.session_state.removed_dataframe = df_removed
             st.session_state.filename = uploaded_file.name
+            st.session_state.base_file_id = uploaded_file.file_id
+            st.session_state.base_identity = uploaded_file.file_id
+            
+            _report_import_stages(uploaded_file.name, import_report)
             
             return df
         
@@ -118,6 +211,146 @@ def render_upload_component() -> Optional[pd.DataFrame]:
             return None
 
 
+def _report_import_stages(file_name: str, import_report: dict) -> None:
+    """
+    Exibe o tempo por etapa da importação e registra a linha JSON no log.
+    
+    Args:
+        file_name: Nome do arquivo enviado
+        import_report: Relatório preenchido por import_excel (com 'stages')
+    """
+    stages = import_report.get('stages', [])
+    
+    if not stages:
+        return
+    
+    log_stage_report(
+        stages,
+        file=file_name,
+        engine=import_report.get('engine'),
+        cache=import_report.get('cache')
+    )
+    
+    total_seconds = sum(stage['seconds'] for stage in stages)
+    with st.expander(f"⏱️ Tempo de importação por etapa ({total_seconds:.2f} s)"):
+        report_df = pd.DataFrame(stages)
+        report_df['rss_after'] = report_df['rss_after_bytes'].map(_format_optional_size)
+        report_df['rss_delta'] = report_df['rss_delta_bytes'].map(_format_size_delta)
+        columns = {
+            'stage': 'Etapa',
+            'seconds': 'Tempo (s)',
+            'rows_in': 'Linhas (entrada)',
+            'rows_out': 'Linhas (saída)',
+            'rss_after': 'Memória (RSS) ao fim',
+            'rss_delta': 'Variação de RSS na etapa'
+        }
+        if 'peak_traced_bytes' in report_df.columns:
+            report_df['peak_traced'] = report_df['peak_traced_bytes'].map(_format_optional_size)
+            columns['peak_traced'] = 'Pico alocado na etapa'
+        
+        st.dataframe(
+            report_df[list(columns)].rename(columns=columns),
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        peak_rss = get_peak_rss_bytes()
+        if peak_rss is not None:
+            st.caption(f"Pico de memória do processo (desde o início): {format_file_size(peak_rss)}")
+
+
+def _format_optional_size(value) -> str:
+    """Formata bytes para exibição ('-' se indisponível)."""
+    return format_file_size(value) if pd.notna(value) else '-'
+
+
+def _format_size_delta(value) -> str:
+    """Formata variação de bytes com sinal ('-' se indisponível)."""
+    if pd.isna(value):
+        return '-'
+    sign = '-' if value < 0 else '+'
+    return f"{sign}{format_file_size(abs(value))}"
+
+
+def _apply_base_refresh(df: pd.DataFrame, df_removed: Optional[pd.DataFrame]) -> dict:
+    """
+    Aplica nova exportação como delta sobre a base da sessão.
+    
+    O lookup_index é corrigido in-place; os índices de sugestão e de prefixo
+    (arrays ordenados) são reconstruídos; os itens bipados afetados são reavaliados.
+    
+    Args:
+        df: Nova exportação filtrada (notebooks)
+        df_removed: Registros removidos pelo filtro na nova exportação
+        
+    Returns:
+        Resumo com contagens de incluídos, removidos, alterados e reavaliados
+    """
+    database = st.session_state.dataframe
+    lookup_index = st.session_state.get('lookup_index') or build_lookup_index(database)
+    
+    delta = diff_bases(database, df)
+    updated = apply_base_delta(database, df, lookup_index, delta)
+    
+    items, reevaluated = refresh_scanned_items(
+        st.session_state.get('scanned_items', []), updated, lookup_index, delta
+    )
+    replace_scanned_items(items)
+    
+    st.session_state.dataframe = updated
+    st.session_state.lookup_index = lookup_index
+    st.session_state.suggestion_index = build_suggestion_index(updated)
+    st.session_state.prefix_index = build_prefix_index(updated, df_removed)
+    st.session_state.removed_dataframe = df_removed
+    
+    return {
+        'added': len(delta['added']),
+        'removed': len(delta['removed']),
+        'changed': len(delta['changed']),
+        'reevaluated': reevaluated,
+        'total': len(updated)
+    }
+
+
+def _render_refresh_summary(summary: dict) -> None:
+    """
+    Renderiza o resultado da atualização incremental da base.
+    
+    Args:
+        summary: Resumo retornado por _apply_base_refresh
+    """
+    st.success(f"🔄 **Base atualizada!** {summary['total']} registros de notebooks.")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("➕ Incluídos", summary['added'])
+    col2.metric("➖ Removidos", summary['removed'])
+    col3.metric("✏️ Alterados", summary['changed'])
+    col4.metric("🔁 Itens reavaliados", summary['reevaluated'])
+
+
+def _render_duplicate_summary(df: pd.DataFrame, duplicates: dict) -> None:
+    """
+    Renderiza resumo de seriais que aparecem em mais de uma linha da base.
+    
+    Args:
+        df: DataFrame importado
+        duplicates: Grupos {serial: posições} de get_duplicate_serials
+    """
+    if not duplicates:
+        return
+    
+    total_rows = sum(len(positions) for positions in duplicates.values())
+    st.warning(
+        f"⚠️ **{len(duplicates)} serial(is) duplicado(s)** na base ({total_rows} registros). "
+        "Ao bipar um deles, todos os candidatos serão exibidos."
+    )
+    
+    with st.expander("🔁 Ver seriais duplicados"):
+        columns = [col for col in ['Serialnumber', 'State', 'Name', 'lastuser', 'Model'] if col in df.columns]
+        positions = [p for group in duplicates.values() for p in group]
+        st.dataframe(df.iloc[positions][columns], use_container_width=True, hide_index=True)
+
+
 def _render_data_preview(df: pd.DataFrame) -> None:
     """
     Renderiza preview dos dados carregados.
@@ -138,13 +371,14 @@ def _render_data_preview(df: pd.DataFrame) -> None:
         unique_states = df['State'].nunique()
         st.metric("🏷️ Estados Únicos", unique_states)
     
+    # Contagem direta na coluna normalizada (Categorical) da importação
+    normalized_counts = get_normalized_states(df).value_counts()
+    
     with col3:
-        active_count = len(df[df['State'].str.lower() == 'active'])
-        st.metric("⚠️ Equipamentos Ativos", active_count)
+        st.metric("⚠️ Equipamentos Ativos", int(normalized_counts.get('active', 0)))
     
     with col4:
-        stock_count = len(df[df['State'].str.lower() == 'stock'])
-        st.metric("✅ Em Estoque", stock_count)
+        st.metric("✅ Em Estoque", int(normalized_counts.get('stock', 0)))
     
     # State distribution
     st.markdown("#### Distribuição por Estado")
@@ -154,12 +388,8 @@ def _render_data_preview(df: pd.DataFrame) -> None:
     # Data table preview
     st.markdown("#### Primeiros Registros")
     
-    # Format Ativo column as integer if present
-    preview_df = df.head(10).copy()
-    if 'Ativo' in preview_df.columns:
-        preview_df['Ativo'] = preview_df['Ativo'].apply(
-            lambda x: int(float(x)) if pd.notna(x) and str(x) != '' else x
-        )
+    # Ativo já vem como inteiro anulável (Int64) da importação
+    preview_df = df.head(10).drop(columns=[STATE_NORMALIZED_COLUMN], errors='ignore')
     
     st.dataframe(
         preview_df,
@@ -170,17 +400,22 @@ def _render_data_preview(df: pd.DataFrame) -> None:
     # Show all columns available
     with st.expander("📋 Ver todas as colunas disponíveis"):
         st.write("**Colunas encontradas no arquivo:**")
-        for i, col in enumerate(df.columns, 1):
+        for i, col in enumerate(df.columns.drop(STATE_NORMALIZED_COLUMN, errors='ignore'), 1):
             st.text(f"{i}. {col}")
 
 
-def _render_debug_tool(df_included: pd.DataFrame, df_excluded: pd.DataFrame) -> None:
+def _render_debug_tool(
+    df_included: pd.DataFrame,
+    df_excluded: pd.DataFrame,
+    prefix_index: Optional[dict] = None
+) -> None:
     """
     Renderiza ferramenta de diagnóstico para verificar por que um serial foi ou não importado.
     
     Args:
         df_included: DataFrame com registros aceitos
         df_excluded: DataFrame com registros rejeitados/filtrados
+        prefix_index: Índice de busca por prefixo (ver build_prefix_index)
     """
     with st.expander("🕵️ Debug de Importação / Serial não encontrado"):
         st.markdown("Use esta ferramenta se você escaneou um item e ele não foi encontrado na base.")
@@ -190,17 +425,18 @@ def _render_debug_tool(df_included: pd.DataFrame, df_excluded: pd.DataFrame) ->
         if search_serial:
             search_term = search_serial.strip().lower()
             
-            # Search in Included
-            found_included = df_included[
-                df_included['Serialnumber'].fillna('').astype(str).str.lower() == search_term
-            ]
+            if prefix_index is None:
+                prefix_index = build_prefix_index(df_included, df_excluded)
+            
+            # Busca no índice (aceitos e removidos) em vez de varrer as colunas
+            matches = search_prefix(search_term, prefix_index, fields=('serial',), limit=50)
+            exact = [m for m in matches if m['value'].lower() == search_term]
+            
+            found_included = df_included.iloc[[m['position'] for m in exact if not m['removed']]]
             
-            # Search in Excluded
             # Handle case where df_excluded might be None (though logic prevents it) or empty
             if df_excluded is not None and not df_excluded.empty:
-                found_excluded = df_excluded[
-                    df_excluded['Serialnumber'].fillna('').astype(str).str.lower() == search_term
-                ]
+                found_excluded = df_excluded.iloc[[m['position'] for m in exact if m['removed']]]
             else:
                 found_excluded = pd.DataFrame()
             
@@ -212,37 +448,22 @@ def _render_debug_tool(df_included: pd.DataFrame, df_excluded: pd.DataFrame) ->
                 st.markdown("**Detalhes do registro excluído:**")
                 st.dataframe(found_excluded)
                 
-                # Try to explain why
+                # Explain why (reason code computed by the notebook filter)
                 record = found_excluded.iloc[0]
-                reasons = []
-                
-                # Check Model
-                model = str(record.get('Model', '')).lower()
-                from app.utils.constants import NOTEBOOK_MODEL_PATTERNS, EXCLUDE_MODEL_PATTERNS
-                
-                is_notebook = any(p in model for p in NOTEBOOK_MODEL_PATTERNS)
-                is_excluded = any(p in model for p in EXCLUDE_MODEL_PATTERNS)
+                reason = record.get(FILTER_REASON_COLUMN)
                 
-                if is_excluded:
-                    reasons.append(f"Modelo '{record.get('Model')}' contém padrão de exclusão (ex: 'virtual', 'vm', 'desktop').")
-                elif not is_notebook:
-                    reasons.append(f"Modelo '{record.get('Model')}' não foi reconhecido como notebook (Dell Latitude/Pro, MacBook, OptiPlex).")
-                
-                # Check OS/Type if notebook check failed
-                if not is_notebook and not is_excluded:
-                    os_val = str(record.get('OS', '')).lower()
-                    type_val = str(record.get('Type', '')).lower()
-                    
-                    if 'linux' not in os_val and 'ubuntu' not in os_val and 'linux' not in type_val:
-                         reasons.append("Não possui OS (Linux/Ubuntu) ou Type (Notebook/Linux) identificados como válidos.")
-
-                if reasons:
-                    st.write("**Possíveis motivos:**")
-                    for r in reasons:
-                        st.markdown(f"- {r}")
+                if pd.notna(reason) and reason in FILTER_REASONS:
+                    st.write("**Motivo da exclusão:**")
+                    st.markdown(f"- {FILTER_REASONS[reason].format(model=record.get('Model'))}")
                 else:
                     st.write("Motivo exato não identificado automaticamente. Verifique as colunas Model, OS e Type.")
                     
             else:
                 st.error(f"❌ O serial **{search_serial}** NÃO FOI ENCONTRADO em nenhum lugar do arquivo Excel carregado.")
                 st.info("Verifique se digitou corretamente ou se o arquivo Excel está atualizado.")
+                
+                if matches:
+                    st.markdown("**Seriais que começam com esse texto:**")
+                    for m in matches[:10]:
+                        origem = "filtrado" if m['removed'] else "importado"
+                        st.markdown(f"- `{m['value']}` ({origem})")
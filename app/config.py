@@ -13,7 +13,9 @@ PAGE_TITLE = "Stock Check"
 PAGE_ICON = "📦"
 
 # Configurações de upload de arquivos
-MAX_FILE_SIZE_MB = 10
+# O Streamlit também limita uploads (server.maxUploadSize, padrão 200 MB);
+# para aceitar mais que isso, aumente os dois valores
+MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "200"))
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
 
 # Colunas obrigatórias do Excel do Lansweeper
@@ -22,6 +24,41 @@ REQUIRED_COLUMNS = ["Serialnumber", "State", "Name", "lastuser"]
 # Colunas opcionais (podem ou não estar presentes)
 OPTIONAL_COLUMNS = ["Ativo"]
 
+# Colunas usadas pelo filtro automático de notebooks
+FILTER_COLUMNS = ["Model", "OS", "Type"]
+
+# Modo compacto: mantém em memória apenas as colunas usadas pela aplicação,
+# com textos repetitivos como Categorical (reduz memória por sessão)
+COMPACT_IMPORT = os.getenv("COMPACT_IMPORT", "True").lower() == "true"
+
+# Engine de leitura de planilhas: "auto" escolhe a mais rápida instalada
+# (calamine > openpyxl/xlrd); ou force uma engine do pandas (ex: "openpyxl")
+EXCEL_ENGINE = os.getenv("EXCEL_ENGINE", "auto").lower()
+
+# Importação paralela (conversão de Ativo, estado e filtro em blocos, em
+# processos separados). 1 = desligada; só vale para bases muito grandes
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "1"))
+IMPORT_PARALLEL_MIN_ROWS = int(os.getenv("IMPORT_PARALLEL_MIN_ROWS", "200000"))
+
+# Cache local das bases importadas (Parquet, chaveado pelo hash do arquivo)
+BASE_CACHE_ENABLED = os.getenv("BASE_CACHE_ENABLED", "True").lower() == "true"
+BASE_CACHE_DIR = os.getenv("BASE_CACHE_DIR", "data/cache")
+BASE_CACHE_MAX_MB = int(os.getenv("BASE_CACHE_MAX_MB", "200"))
+
+# Relatórios gerados (xlsx/PDF) mantidos em memória por sessão, reaproveitados
+# enquanto o histórico e a base não mudam
+ARTIFACT_CACHE_MAX_ENTRIES = int(os.getenv("ARTIFACT_CACHE_MAX_ENTRIES", "8"))
+ARTIFACT_CACHE_MAX_MB = int(os.getenv("ARTIFACT_CACHE_MAX_MB", "50"))
+
+# Geração de relatórios em segundo plano (threads compartilhadas pelo
+# processo) e intervalo de atualização do status na tela
+REPORT_JOB_WORKERS = int(os.getenv("REPORT_JOB_WORKERS", "2"))
+REPORT_JOB_POLL_SECONDS = float(os.getenv("REPORT_JOB_POLL_SECONDS", "1.0"))
+
+# Pico de memória por etapa da importação via tracemalloc (diagnóstico;
+# deixa a importação ~2x mais lenta). Desligado, reporta apenas o RSS atual antes/depois de cada etapa.
+PROFILE_IMPORT_MEMORY = os.getenv("PROFILE_IMPORT_MEMORY", "False").lower() == "true"
+
 # Debug mode
 DEBUG = os.getenv("DEBUG", "False").lower() == "true"
 
@@ -102,6 +102,12 @@ def main():
     # Initialize session state variables if they don't exist
     if 'dataframe' not in st.session_state:
         st.session_state.dataframe = None
+    if 'lookup_index' not in st.session_state:
+        st.session_state.lookup_index = None
+    if 'suggestion_index' not in st.session_state:
+        st.session_state.suggestion_index = None
+    if 'prefix_index' not in st.session_state:
+        st.session_state.prefix_index = None
     if 'filename' not in st.session_state:
         st.session_state.filename = None
 
@@ -0,0 +1,118 @@
+"""
+Cache dos relatórios gerados na sessão (xlsx e PDF).
+
+Responsabilidades:
+- Reaproveitar os bytes de um relatório entre reruns do Streamlit
+- Regenerar apenas quando o histórico de leituras ou a base mudam
+- Limitar o cache por quantidade de relatórios e por tamanho (LRU)
+
+A chave de cada relatório combina o nome, a versão do histórico
+(get_scanned_version), a quantidade de itens e a identidade da base
+carregada (st.session_state.base_identity).
+"""
+
+import streamlit as st
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+from app.config import ARTIFACT_CACHE_MAX_ENTRIES, ARTIFACT_CACHE_MAX_MB
+from app.services.barcode_handler import get_scanned_version
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def get_artifact_key(name: str, *parts: Hashable) -> Tuple[Hashable, ...]:
+    """
+    Monta a chave de um relatório a partir do estado atual da sessão.
+    
+    Args:
+        name: Nome do relatório (ex: 'history_xlsx')
+        *parts: Entradas adicionais que alteram o conteúdo
+        
+    Returns:
+        Tupla usada como chave no cache
+    """
+    return (
+        name,
+        get_scanned_version(),
+        len(st.session_state.get('scanned_items', [])),
+        st.session_state.get('base_identity'),
+        *parts
+    )
+
+
+def _get_cache(cache: Optional[OrderedDict]) -> OrderedDict:
+    """Cache informado ou o da sessão (criado na primeira chamada)."""
+    if cache is not None:
+        return cache
+    if 'artifact_cache' not in st.session_state:
+        st.session_state.artifact_cache = OrderedDict()
+    return st.session_state.artifact_cache
+
+
+def get_cached_artifact(
+    key: Tuple[Hashable, ...],
+    cache: Optional[OrderedDict] = None
+) -> Optional[bytes]:
+    """
+    Retorna o relatório do cache, sem gerá-lo.
+    
+    Args:
+        key: Chave do relatório (ver get_artifact_key)
+        cache: Cache a usar (padrão: st.session_state.artifact_cache)
+        
+    Returns:
+        Bytes do relatório (None se não estiver em cache)
+    """
+    cache = _get_cache(cache)
+    
+    if key not in cache:
+        return None
+    
+    cache.move_to_end(key)
+    return cache[key]
+
+
+def get_or_build_artifact(
+    key: Tuple[Hashable, ...],
+    build: Callable[[], bytes],
+    cache: Optional[OrderedDict] = None,
+    max_entries: int = ARTIFACT_CACHE_MAX_ENTRIES,
+    max_bytes: int = ARTIFACT_CACHE_MAX_MB * 1024 * 1024
+) -> bytes:
+    """
+    Retorna o relatório do cache ou o gera e guarda.
+    
+    Relatórios vazios (falha na geração) não são guardados. Ao exceder os
+    limites, os relatórios usados há mais tempo são descartados.
+    
+    Args:
+        key: Chave do relatório (ver get_artifact_key)
+        build: Função que gera os bytes do relatório
+        cache: Cache a usar (padrão: st.session_state.artifact_cache)
+        max_entries: Quantidade máxima de relatórios em cache
+        max_bytes: Tamanho máximo somado dos relatórios em cache
+        
+    Returns:
+        Bytes do relatório
+    """
+    cache = _get_cache(cache)
+    
+    cached = get_cached_artifact(key, cache)
+    if cached is not None:
+        return cached
+    
+    data = build()
+    
+    if not data:
+        return data
+    
+    cache[key] = data
+    
+    total = sum(len(value) for value in cache.values())
+    while len(cache) > 1 and (len(cache) > max_entries or total > max_bytes):
+        evicted_key, evicted = cache.popitem(last=False)
+        total -= len(evicted)
+        logger.debug("Relatório descartado do cache: %s", evicted_key[0])
+    
+    return data
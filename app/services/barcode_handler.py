@@ -1,7 +1,8 @@
 
 import re
 import streamlit as st
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Dict, Any, Set, List
+from app.utils.helpers import normalize_serial
 
 def process_serial(serial: str) -> Tuple[bool, str, Optional[str]]:
     """
@@ -29,12 +30,132 @@ def process_serial(serial: str) -> Tuple[bool, str, Optional[str]]:
     if len(clean_serial) < 3:
         return False, "Serial muito curto", f"O serial '{clean_serial}' parece incompleto."
         
-    # Validação de duplicidade na sessão
+    # Validação de duplicidade na sessão (serial ou patrimônio já lido) - O(1)
+    if is_already_scanned(clean_serial):
+        return False, clean_serial, f"O item '{clean_serial}' já foi verificado nesta sessão!"
+        
+    return True, clean_serial, "Serial válido"
+
+
+def _item_keys(item: Dict[str, Any]) -> Set[str]:
+    """Chaves de duplicidade de um item: serial normalizado e patrimônio."""
+    keys = {normalize_serial(str(item.get('serialnumber', '')))}
+    
+    ativo = item.get('ativo')
+    if ativo not in (None, ''):
+        try:
+            keys.add(str(int(float(ativo))))
+        except (ValueError, TypeError, OverflowError):
+            pass
+    
+    keys.discard('')
+    return keys
+
+
+def get_scanned_keys() -> Set[str]:
+    """
+    Retorna o conjunto de seriais/patrimônios já lidos na sessão.
+    
+    O conjunto é mantido junto com st.session_state.scanned_items e
+    reconstruído a partir da lista caso não exista (ex: sessão antiga).
+    
+    Returns:
+        Conjunto de chaves normalizadas
+    """
     if 'scanned_items' not in st.session_state:
         st.session_state.scanned_items = []
+    
+    if 'scanned_keys' not in st.session_state:
+        keys = set()
+        for item in st.session_state.scanned_items:
+            keys |= _item_keys(item)
+        st.session_state.scanned_keys = keys
+    
+    return st.session_state.scanned_keys
+
+
+def is_already_scanned(serial: str) -> bool:
+    """
+    Verifica em O(1) se serial ou patrimônio já foi lido nesta sessão.
+    
+    Args:
+        serial: Serial ou patrimônio (qualquer capitalização)
         
-    # Verifica se já foi lido (case insensitive se necessário)
-    if clean_serial in st.session_state.scanned_items:
-        return False, clean_serial, f"O item '{clean_serial}' já foi verificado nesta sessão!"
+    Returns:
+        True se já consta no histórico da sessão
+    """
+    return normalize_serial(serial) in get_scanned_keys()
+
+
+def add_scanned_item(item: Dict[str, Any]) -> None:
+    """
+    Adiciona item no topo do histórico, atualizando o conjunto de duplicidade.
+    
+    Args:
+        item: Resultado de compare_and_flag (com timestamp)
+    """
+    keys = get_scanned_keys()
+    st.session_state.scanned_items.insert(0, item)
+    keys |= _item_keys(item)
+    _bump_scanned_version()
+
+
+def pop_scanned_item(position: int = 0) -> Optional[Dict[str, Any]]:
+    """
+    Remove item do histórico (padrão: o mais recente), atualizando o conjunto.
+    
+    Args:
+        position: Posição na lista (0 = topo)
         
-    return True, clean_serial, "Serial válido"
+    Returns:
+        Item removido ou None se histórico vazio
+    """
+    keys = get_scanned_keys()
+    
+    if not st.session_state.scanned_items:
+        return None
+    
+    item = st.session_state.scanned_items.pop(position)
+    keys -= _item_keys(item)
+    _bump_scanned_version()
+    return item
+
+
+def replace_scanned_items(items: List[Dict[str, Any]]) -> None:
+    """
+    Substitui o histórico da sessão (ex: após reavaliação contra base atualizada).
+    
+    Args:
+        items: Nova lista de itens, na mesma ordem de exibição
+    """
+    st.session_state.scanned_items = items
+    keys = set()
+    for item in items:
+        keys |= _item_keys(item)
+    st.session_state.scanned_keys = keys
+    _bump_scanned_version()
+
+
+def clear_scanned_items() -> None:
+    """Limpa o histórico da sessão e o conjunto de duplicidade."""
+    st.session_state.scanned_items = []
+    st.session_state.scanned_keys = set()
+    _bump_scanned_version()
+
+
+def get_scanned_version() -> int:
+    """
+    Retorna o contador de alterações do histórico da sessão.
+    
+    Incrementado a cada inclusão, remoção ou substituição feita pelas funções
+    deste módulo; usado como chave de cache dos relatórios gerados.
+    
+    Returns:
+        Versão atual (0 se o histórico nunca foi alterado)
+    """
+    return st.session_state.get('scanned_version', 0)
+
+
+def _bump_scanned_version() -> None:
+    """Marca o histórico da sessão como alterado."""
+    st.session_state.scanned_version = get_scanned_version() + 1
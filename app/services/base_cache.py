@@ -0,0 +1,209 @@
+"""
+Cache local das bases Lansweeper já importadas.
+
+Responsabilidades:
+- Identificar uploads repetidos pelo hash SHA256 do conteúdo do arquivo
+- Guardar os DataFrames filtrado e removido em Parquet (colunar)
+- Limitar o tamanho do cache, removendo as bases usadas há mais tempo (LRU)
+
+Reenviar a mesma exportação (refresh do navegador, outro dispositivo,
+outro operador) carrega do cache em milissegundos, sem refazer o parse
+do Excel nem o filtro de notebooks.
+"""
+
+import os
+import hashlib
+import tempfile
+import pandas as pd
+from typing import Optional, Tuple, List, Union, BinaryIO
+from app.config import BASE_CACHE_DIR, BASE_CACHE_MAX_MB
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Incrementar quando o formato dos DataFrames importados mudar
+CACHE_FORMAT_VERSION = 3
+
+_PARTS = ('included', 'removed')
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def make_cache_key(source: Union[bytes, str, BinaryIO], *options: object) -> str:
+    """
+    Gera a chave do cache a partir do conteúdo do arquivo e das opções de importação.
+    
+    Buffers em memória (ex: upload do Streamlit) são lidos sem cópia; arquivos
+    em disco e streams são lidos em blocos.
+    
+    Args:
+        source: Bytes, caminho ou buffer binário do arquivo enviado
+        *options: Opções que alteram o resultado da importação (ex: modo compacto)
+        
+    Returns:
+        Hash hexadecimal SHA256
+    """
+    digest = hashlib.sha256()
+    
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    elif isinstance(source, str):
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    elif hasattr(source, 'getbuffer'):
+        with source.getbuffer() as view:
+            digest.update(view)
+    else:
+        source.seek(0)
+        for chunk in iter(lambda: source.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+        source.seek(0)
+    
+    digest.update(repr((CACHE_FORMAT_VERSION,) + options).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_cached_base(
+    key: str,
+    cache_dir: Optional[str] = None
+) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Carrega base importada do cache.
+    
+    Args:
+        key: Chave gerada por make_cache_key
+        cache_dir: Diretório do cache (padrão: BASE_CACHE_DIR)
+        
+    Returns:
+        Tupla (DataFrame filtrado, DataFrame removido) ou None se não estiver em cache
+    """
+    cache_dir = cache_dir or BASE_CACHE_DIR
+    paths = [_part_path(cache_dir, key, part) for part in _PARTS]
+    
+    if not all(os.path.exists(path) for path in paths):
+        return None
+    
+    try:
+        frames = tuple(pd.read_parquet(path) for path in paths)
+    except Exception as e:
+        logger.warning("Cache da base corrompido (%s). Descartando: %s", key[:12], e)
+        _remove_entry(cache_dir, key)
+        return None
+    
+    # Marca como usado recentemente (LRU por data de modificação)
+    for path in paths:
+        os.utime(path, None)
+    
+    logger.info("Base carregada do cache (%s)", key[:12])
+    return frames
+
+
+def save_cached_base(
+    key: str,
+    df_included: pd.DataFrame,
+    df_removed: Optional[pd.DataFrame],
+    cache_dir: Optional[str] = None,
+    max_bytes: int = BASE_CACHE_MAX_MB * 1024 * 1024
+) -> bool:
+    """
+    Salva base importada no cache e aplica o limite de tamanho.
+    
+    Args:
+        key: Chave gerada por make_cache_key
+        df_included: DataFrame filtrado (notebooks)
+        df_removed: DataFrame com registros removidos pelo filtro
+        cache_dir: Diretório do cache (padrão: BASE_CACHE_DIR)
+        max_bytes: Tamanho máximo do cache em bytes
+        
+    Returns:
+        True se salvo com sucesso, False caso contrário
+    """
+    cache_dir = cache_dir or BASE_CACHE_DIR
+    tmp_paths = []
+    
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        frames = (df_included, df_removed if df_removed is not None else pd.DataFrame())
+        
+        for part, frame in zip(_PARTS, frames):
+            # Temporário exclusivo por escrita: sessões salvando a mesma base
+            # ao mesmo tempo não misturam os arquivos antes do replace
+            with tempfile.NamedTemporaryFile(
+                dir=cache_dir, prefix=f"{key}.{part}.", suffix='.tmp', delete=False
+            ) as tmp:
+                tmp_paths.append(tmp.name)
+                frame.to_parquet(tmp)
+            os.replace(tmp.name, _part_path(cache_dir, key, part))  # Escrita atômica
+            tmp_paths.remove(tmp.name)
+        
+        evict_cache(cache_dir, max_bytes)
+        return True
+    
+    except Exception as e:
+        logger.warning("Não foi possível salvar a base no cache: %s", e)
+        for tmp_path in tmp_paths:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+        _remove_entry(cache_dir, key)
+        return False
+
+
+def evict_cache(
+    cache_dir: Optional[str] = None,
+    max_bytes: int = BASE_CACHE_MAX_MB * 1024 * 1024
+) -> List[str]:
+    """
+    Remove as bases usadas há mais tempo até o cache caber no limite.
+    
+    Args:
+        cache_dir: Diretório do cache (padrão: BASE_CACHE_DIR)
+        max_bytes: Tamanho máximo do cache em bytes
+        
+    Returns:
+        Lista de chaves removidas
+    """
+    cache_dir = cache_dir or BASE_CACHE_DIR
+    
+    if not os.path.isdir(cache_dir):
+        return []
+    
+    entries = {}
+    for filename in os.listdir(cache_dir):
+        if not filename.endswith('.parquet'):
+            continue
+        key = filename.split('.', 1)[0]
+        stat = os.stat(os.path.join(cache_dir, filename))
+        size, last_used = entries.get(key, (0, 0.0))
+        entries[key] = (size + stat.st_size, max(last_used, stat.st_mtime))
+    
+    total = sum(size for size, _ in entries.values())
+    evicted = []
+    
+    for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+        if total <= max_bytes:
+            break
+        _remove_entry(cache_dir, key)
+        total -= size
+        evicted.append(key)
+    
+    if evicted:
+        logger.info("Cache da base: %d entrada(s) removida(s) por limite de tamanho", len(evicted))
+    
+    return evicted
+
+
+def _part_path(cache_dir: str, key: str, part: str) -> str:
+    """Caminho do arquivo Parquet de uma parte (included/removed) da base."""
+    return os.path.join(cache_dir, f"{key}.{part}.parquet")
+
+
+def _remove_entry(cache_dir: str, key: str) -> None:
+    """Remove todos os arquivos de uma entrada do cache."""
+    for part in _PARTS:
+        try:
+            os.remove(_part_path(cache_dir, key, part))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,220 @@
+"""
+Atualização incremental da base Lansweeper.
+
+Responsabilidades:
+- Comparar uma nova exportação com a base carregada, por serial
+- Aplicar apenas as linhas incluídas, removidas e alteradas
+- Manter o índice de busca (lookup_index) atualizado in-place
+- Reavaliar os itens já bipados afetados pela atualização
+
+No meio da contagem, uma nova exportação (após o TI corrigir estados)
+entra como delta: a sessão de verificação continua, e só os itens cujo
+registro mudou têm o resultado recalculado.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Set, Tuple
+from pandas.util import hash_pandas_object
+from app.services.comparator import (
+    get_serial_keys,
+    compare_many,
+    remove_from_lookup_index,
+    add_to_lookup_index
+)
+from app.utils.constants import STATE_NORMALIZED_COLUMN, FILTER_REASON_COLUMN
+from app.utils.helpers import normalize_serial
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Colunas derivadas na importação (não entram na comparação)
+DIFF_IGNORED_COLUMNS = [STATE_NORMALIZED_COLUMN, FILTER_REASON_COLUMN]
+
+# Campos produzidos por compare_and_flag (substituídos na reavaliação)
+COMPARISON_FIELDS = [
+    'found', 'serialnumber', 'state', 'requires_adjustment', 'status_emoji',
+    'status_message', 'ativo', 'candidates', 'name', 'lastuser'
+]
+
+
+def diff_bases(database: pd.DataFrame, new_database: pd.DataFrame) -> Dict[str, Set[str]]:
+    """
+    Compara duas versões da base por serial.
+
+    Cada serial recebe uma impressão digital (quantidade de linhas e soma dos
+    hashes das linhas), então seriais duplicados são comparados como grupo.
+
+    Args:
+        database: Base atualmente carregada
+        new_database: Nova exportação (já importada e filtrada)
+
+    Returns:
+        Dicionário com conjuntos de seriais normalizados:
+        - 'added': presentes apenas na nova exportação
+        - 'removed': presentes apenas na base atual
+        - 'changed': presentes nas duas, com algum campo diferente
+    """
+    columns = [
+        col for col in database.columns
+        if col in new_database.columns and col not in DIFF_IGNORED_COLUMNS
+    ]
+
+    old_prints = _serial_fingerprints(database, columns)
+    new_prints = _serial_fingerprints(new_database, columns)
+
+    common = old_prints.index.intersection(new_prints.index)
+    differs = (old_prints.loc[common] != new_prints.loc[common]).any(axis=1)
+
+    return {
+        'added': set(new_prints.index.difference(old_prints.index)),
+        'removed': set(old_prints.index.difference(new_prints.index)),
+        'changed': set(common[differs.to_numpy()])
+    }
+
+
+def apply_base_delta(
+    database: pd.DataFrame,
+    new_database: pd.DataFrame,
+    lookup_index: Dict[str, Dict[Any, Any]],
+    delta: Dict[str, Set[str]]
+) -> pd.DataFrame:
+    """
+    Aplica o delta de diff_bases na base carregada.
+
+    Linhas removidas ou alteradas liberam suas posições; as linhas novas ou
+    alteradas da nova exportação ocupam essas posições (ou vão para o fim).
+    Se sobrarem posições livres, as últimas linhas da base são movidas para
+    elas. Assim só as linhas afetadas mudam de posição e o lookup_index é
+    corrigido in-place em O(delta), sem reconstrução.
+
+    Args:
+        database: Base atualmente carregada
+        new_database: Nova exportação (já importada e filtrada)
+        lookup_index: Índice de database (modificado in-place)
+        delta: Resultado de diff_bases
+
+    Returns:
+        Nova base, com posições consistentes com lookup_index
+    """
+    outgoing = delta['removed'] | delta['changed']
+    incoming = delta['added'] | delta['changed']
+
+    holes = np.flatnonzero(get_serial_keys(database).isin(outgoing).to_numpy())
+    incoming_positions = np.flatnonzero(get_serial_keys(new_database).isin(incoming).to_numpy())
+
+    order, moved = _slot_order(len(database), holes, len(incoming_positions))
+
+    combined = pd.concat(
+        [database, new_database.iloc[incoming_positions]],
+        ignore_index=True
+    )
+    updated = combined.iloc[order].reset_index(drop=True)
+
+    # Categorias diferentes entre as duas bases viram texto no concat
+    for col in database.columns:
+        if isinstance(database[col].dtype, pd.CategoricalDtype) and col in updated.columns:
+            if not isinstance(updated[col].dtype, pd.CategoricalDtype):
+                updated[col] = updated[col].astype('category')
+
+    remove_from_lookup_index(lookup_index, database, np.concatenate([holes, moved]))
+    # Posições antigas que receberam outra linha, mais as acrescentadas no fim
+    # (estas nem sempre diferem de arange: só inclusões não deixam buracos)
+    kept = order[:len(database)]
+    replaced = np.flatnonzero(kept != np.arange(len(kept)))
+    appended = np.arange(len(database), len(updated))
+    add_to_lookup_index(lookup_index, updated, np.concatenate([replaced, appended]))
+
+    logger.info(
+        "Base atualizada: %d incluído(s), %d removido(s), %d alterado(s) (%d → %d registros)",
+        len(delta['added']), len(delta['removed']), len(delta['changed']),
+        len(database), len(updated)
+    )
+
+    return updated
+
+
+def refresh_scanned_items(
+    scanned_items: List[Dict[str, Any]],
+    database: pd.DataFrame,
+    lookup_index: Dict[str, Dict[Any, Any]],
+    delta: Dict[str, Set[str]]
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Reavalia os itens bipados afetados pela atualização da base.
+
+    São recalculados os itens cujo serial foi incluído, removido ou alterado
+    e os que não tinham sido encontrados (podem ter entrado na base).
+    Timestamp e demais campos da sessão são preservados.
+
+    Args:
+        scanned_items: Histórico da sessão (st.session_state.scanned_items)
+        database: Base já atualizada
+        lookup_index: Índice da base atualizada
+        delta: Resultado de diff_bases
+
+    Returns:
+        Tupla (nova lista de itens, quantidade de itens reavaliados)
+    """
+    affected = delta['added'] | delta['removed'] | delta['changed']
+
+    targets = [
+        position for position, item in enumerate(scanned_items)
+        if not item.get('found') or normalize_serial(str(item.get('serialnumber', ''))) in affected
+    ]
+
+    if not targets:
+        return scanned_items, 0
+
+    results = compare_many(
+        [scanned_items[position]['serialnumber'] for position in targets],
+        database,
+        lookup_index
+    )
+
+    items = list(scanned_items)
+    for position, result in zip(targets, results):
+        session_fields = {
+            key: value for key, value in items[position].items() if key not in COMPARISON_FIELDS
+        }
+        items[position] = {**result, **session_fields}
+
+    return items, len(targets)
+
+
+def _serial_fingerprints(database: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Quantidade de linhas e soma (uint64, com overflow) dos hashes das linhas por serial."""
+    row_hashes = hash_pandas_object(database[columns], index=False).to_numpy()
+    frame = pd.DataFrame({'key': get_serial_keys(database).to_numpy(), 'hash': row_hashes})
+    return frame.groupby('key', sort=False)['hash'].agg(['size', 'sum'])
+
+
+def _slot_order(size: int, holes: np.ndarray, incoming: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula a ordem das linhas da base atualizada.
+
+    Args:
+        size: Quantidade de linhas da base atual
+        holes: Posições liberadas (ordenadas)
+        incoming: Quantidade de linhas novas (posições size.. no concat)
+
+    Returns:
+        Tupla (ordem: posição no concat para cada posição final,
+        posições antigas das linhas movidas para preencher buracos)
+    """
+    order = np.arange(size)
+    filled = min(len(holes), incoming)
+    order[holes[:filled]] = size + np.arange(filled)
+
+    if incoming > len(holes):
+        return np.concatenate([order, size + np.arange(filled, incoming)]), np.array([], dtype=int)
+
+    final_size = size - (len(holes) - incoming)
+    remaining = holes[filled:]
+
+    # Linhas do fim que não foram removidas descem para os buracos restantes
+    tail = np.arange(final_size, size)
+    tail = tail[~np.isin(tail, remaining)]
+    order[remaining[remaining < final_size]] = tail
+
+    return order[:final_size], tail
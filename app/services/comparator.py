@@ -7,10 +7,23 @@ Responsabilidades:
 - Otimizar busca para performance em grandes volumes
 """
 
+import logging
+import numpy as np
 import pandas as pd
-from typing import Optional, Dict, Any
-from app.utils.constants import VALID_STATES, REQUIRES_ADJUSTMENT_STATE, STATE_NORMALIZATION
-from app.utils.helpers import normalize_serial
+from typing import Optional, Dict, Any, Iterable, List, Mapping, Tuple
+from app.utils.constants import (
+    VALID_STATES,
+    REQUIRES_ADJUSTMENT_STATE,
+    STATE_NORMALIZATION,
+    STATE_NORMALIZED_COLUMN
+)
+from app.utils.helpers import normalize_serial, normalize_ativo_series
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Categorias possíveis do estado normalizado
+STATE_CATEGORIES = list(dict.fromkeys(STATE_NORMALIZATION.values())) + ['unknown']
 
 
 def normalize_state(state: str) -> str:
@@ -31,93 +44,405 @@ def normalize_state(state: str) -> str:
     return STATE_NORMALIZATION.get(state_lower, 'unknown')
 
 
-def find_equipment(serial: str, database: pd.DataFrame) -> Optional[Dict[str, Any]]:
+def normalize_state_series(states: pd.Series) -> pd.Series:
+    """
+    Normaliza uma coluna inteira de estados (PT-BR/EN) para Categorical.
+    
+    A normalização roda apenas uma vez por valor distinto, não por linha.
+    
+    Args:
+        states: Série com os estados brutos da base
+        
+    Returns:
+        Série Categorical com estados em inglês minúsculo ('unknown' se inválido)
+    """
+    codes, uniques = pd.factorize(states, use_na_sentinel=True)
+    mapped = np.array([normalize_state(value) for value in uniques] + ['unknown'], dtype=object)
+    return pd.Series(
+        pd.Categorical(mapped[codes], categories=STATE_CATEGORIES),
+        index=states.index,
+        name=STATE_NORMALIZED_COLUMN
+    )
+
+
+def get_normalized_states(database: pd.DataFrame) -> pd.Series:
+    """
+    Retorna o estado normalizado da base, usando a coluna pré-calculada na importação.
+    
+    Args:
+        database: DataFrame com base de dados (com ou sem STATE_NORMALIZED_COLUMN)
+        
+    Returns:
+        Série Categorical com estados normalizados
+    """
+    if STATE_NORMALIZED_COLUMN in database.columns:
+        return database[STATE_NORMALIZED_COLUMN]
+    return normalize_state_series(database['State'])
+
+
+def build_lookup_index(database: pd.DataFrame) -> Dict[str, Dict[Any, Any]]:
+    """
+    Constrói índices de busca da base para consultas O(1) por scan.
+    
+    Deve ser construído uma única vez no upload e guardado em
+    st.session_state.lookup_index junto com o DataFrame.
+    
+    Args:
+        database: DataFrame com base de dados do Lansweeper
+        
+    Returns:
+        Dicionário com:
+        - 'serial': {serial_normalizado: posição da primeira linha}
+        - 'serial_duplicates': {serial_normalizado: (posições...)} apenas para
+          seriais que aparecem em mais de uma linha
+        - 'ativo' / 'ativo_duplicates': idem para patrimônio (chave int)
+    """
+    index = {'serial': {}, 'serial_duplicates': {}, 'ativo': {}, 'ativo_duplicates': {}}
+    
+    if database is None or database.empty:
+        return index
+    
+    if 'Serialnumber' in database.columns:
+        serials = get_serial_keys(database)
+        index['serial'], index['serial_duplicates'] = _index_positions(serials, serials.to_numpy() != '')
+    
+    if 'Ativo' in database.columns:
+        ativos = get_ativo_keys(database)
+        index['ativo'], index['ativo_duplicates'] = _index_positions(ativos, ativos.notna().to_numpy())
+    
+    return index
+
+
+def get_serial_keys(database: pd.DataFrame) -> pd.Series:
+    """
+    Chaves de serial usadas no índice: texto sem espaços nas pontas, em maiúsculas.
+    
+    Args:
+        database: DataFrame com coluna Serialnumber
+        
+    Returns:
+        Série de strings alinhada a database ('' quando vazio)
+    """
+    return database['Serialnumber'].fillna('').astype(str).str.strip().str.upper()
+
+
+def get_ativo_keys(database: pd.DataFrame) -> pd.Series:
+    """
+    Chaves de patrimônio usadas no índice (Int64, <NA> quando ausente).
+    
+    Args:
+        database: DataFrame com coluna Ativo
+        
+    Returns:
+        Série Int64 alinhada a database
+    """
+    raw = database['Ativo']
+    return raw if isinstance(raw.dtype, pd.Int64Dtype) else normalize_ativo_series(raw)
+
+
+def remove_from_lookup_index(
+    lookup_index: Dict[str, Dict[Any, Any]],
+    database: pd.DataFrame,
+    positions: Iterable[int]
+) -> None:
+    """
+    Remove do índice (in-place) as linhas nas posições informadas.
+    
+    Usado na atualização incremental da base: o custo é proporcional ao
+    número de linhas alteradas, não ao tamanho da base.
+    
+    Args:
+        lookup_index: Índice de build_lookup_index (modificado in-place)
+        database: DataFrame ao qual as posições se referem
+        positions: Posições (iloc) das linhas a remover
+    """
+    for field, key, position in _row_keys(database, positions):
+        _discard_position(lookup_index[field], lookup_index[f'{field}_duplicates'], key, position)
+
+
+def add_to_lookup_index(
+    lookup_index: Dict[str, Dict[Any, Any]],
+    database: pd.DataFrame,
+    positions: Iterable[int]
+) -> None:
+    """
+    Adiciona ao índice (in-place) as linhas nas posições informadas.
+    
+    Args:
+        lookup_index: Índice de build_lookup_index (modificado in-place)
+        database: DataFrame ao qual as posições se referem
+        positions: Posições (iloc) das linhas a adicionar
+    """
+    for field, key, position in _row_keys(database, positions):
+        _add_position(lookup_index[field], lookup_index[f'{field}_duplicates'], key, position)
+
+
+def _row_keys(database: pd.DataFrame, positions: Iterable[int]) -> List[Tuple[str, Any, int]]:
+    """Chaves válidas (campo do índice, chave, posição) das linhas informadas."""
+    positions = [int(p) for p in positions]
+    entries = []
+    
+    if not positions:
+        return entries
+    
+    rows = database.iloc[positions]
+    
+    if 'Serialnumber' in database.columns:
+        for key, position in zip(get_serial_keys(rows).tolist(), positions):
+            if key != '':
+                entries.append(('serial', key, position))
+    
+    if 'Ativo' in database.columns:
+        for key, position in zip(get_ativo_keys(rows).tolist(), positions):
+            if key is not pd.NA:
+                entries.append(('ativo', int(key), position))
+    
+    return entries
+
+
+def _discard_position(primary: Dict[Any, int], duplicates: Dict[Any, Tuple[int, ...]], key: Any, position: int) -> None:
+    """Remove uma posição de uma chave, mantendo primary/duplicates consistentes."""
+    group = duplicates.get(key)
+    
+    if group is None:
+        if primary.get(key) == position:
+            del primary[key]
+        return
+    
+    remaining = tuple(p for p in group if p != position)
+    if len(remaining) > 1:
+        duplicates[key] = remaining
+    else:
+        del duplicates[key]
+    primary[key] = remaining[0]
+
+
+def _add_position(primary: Dict[Any, int], duplicates: Dict[Any, Tuple[int, ...]], key: Any, position: int) -> None:
+    """Adiciona uma posição a uma chave, promovendo-a a duplicada se já existir."""
+    if key not in primary:
+        primary[key] = position
+        return
+    
+    group = tuple(sorted(set(duplicates.get(key, (primary[key],)) + (position,))))
+    if len(group) > 1:
+        duplicates[key] = group
+    primary[key] = group[0]
+
+
+def _index_positions(keys: pd.Series, valid: np.ndarray) -> Tuple[Dict[Any, int], Dict[Any, Tuple[int, ...]]]:
+    """
+    Mapeia cada chave válida para a posição da primeira ocorrência e,
+    para chaves repetidas, para todas as posições (um único groupby).
+    """
+    keep = ~keys.duplicated(keep='first').to_numpy() & valid
+    first = dict(zip(keys[keep].tolist(), np.flatnonzero(keep).tolist()))
+    
+    repeated = keys.duplicated(keep=False).to_numpy() & valid
+    duplicates = {}
+    if repeated.any():
+        grouped = pd.Series(np.flatnonzero(repeated)).groupby(keys.to_numpy()[repeated], sort=False)
+        duplicates = {key: tuple(positions.tolist()) for key, positions in grouped}
+    
+    return first, duplicates
+
+
+def get_duplicate_serials(lookup_index: Optional[Dict[str, Dict[Any, Any]]]) -> Dict[str, Tuple[int, ...]]:
+    """
+    Retorna os grupos de seriais repetidos na base (para o resumo da importação).
+    
+    Args:
+        lookup_index: Índice gerado por build_lookup_index
+        
+    Returns:
+        Dicionário {serial_normalizado: (posições das linhas)}
+    """
+    if not lookup_index:
+        return {}
+    return lookup_index.get('serial_duplicates', {})
+
+
+def _lookup_positions(
+    normalized_serial: str,
+    lookup_index: Dict[str, Dict[Any, Any]],
+    search_ativo: bool
+) -> Tuple[int, ...]:
+    """Resolve serial (prioridade 1) ou patrimônio (prioridade 2) em posições da base."""
+    # 1. Search by Serialnumber (prioridade 1) - consulta direta no índice
+    position = lookup_index['serial'].get(normalized_serial)
+    if position is not None:
+        return lookup_index.get('serial_duplicates', {}).get(normalized_serial, (position,))
+    
+    # 2. If not found and Ativo column exists, search by patrimônio (prioridade 2)
+    if search_ativo:
+        try:
+            # Patrimônio é indexado como inteiro (Ativo pode vir como float do Excel)
+            input_as_number = int(float(normalized_serial))
+        except (ValueError, TypeError, OverflowError) as e:
+            logger.debug("Não é número válido (%s), patrimônio não pesquisado.", e)
+            return ()
+        
+        position = lookup_index.get('ativo', {}).get(input_as_number)
+        if position is not None:
+            return lookup_index.get('ativo_duplicates', {}).get(input_as_number, (position,))
+    
+    return ()
+
+
+def find_equipment(
+    serial: str,
+    database: pd.DataFrame,
+    lookup_index: Optional[Dict[str, Dict[Any, Any]]] = None
+) -> Optional[Dict[str, Any]]:
     """
     Busca equipamento na base de dados pelo número de série ou patrimônio.
     
     Args:
         serial: Número de série ou patrimônio a ser buscado
         database: DataFrame com base de dados do Lansweeper
+        lookup_index: Índice gerado por build_lookup_index (construído na hora se ausente)
         
     Returns:
-        Dicionário com dados do equipamento ou None se não encontrado
+        Dicionário com dados do equipamento (primeira linha encontrada) ou None
+        se não encontrado. Se várias linhas compartilham o serial/patrimônio,
+        inclui 'candidates' com todas elas.
     """
     if database is None or database.empty:
-        print("⚠️ DEBUG: Database is None or empty")
+        logger.debug("Database is None or empty")
         return None
     
+    if lookup_index is None:
+        lookup_index = build_lookup_index(database)
+    
     # Normalize serial for comparison
     normalized_serial = normalize_serial(serial)
-    print(f"\n🔍 DEBUG: Buscando serial/patrimônio: '{serial}' -> Normalizado: '{normalized_serial}'")
+    logger.debug("Buscando serial/patrimônio: '%s' -> Normalizado: '%s'", serial, normalized_serial)
     
-    # Debug: Show sample of database serials
-    if 'Serialnumber' in database.columns:
-        sample_serials = database['Serialnumber'].head(5).tolist()
-        print(f"📊 DEBUG: Amostra de serials na base: {sample_serials}")
+    # Amostra da base só é calculada quando o debug está ligado
+    if logger.isEnabledFor(logging.DEBUG) and 'Serialnumber' in database.columns:
+        logger.debug("Amostra de serials na base: %s", database['Serialnumber'].head(5).tolist())
     
-    # 1. Search by Serialnumber (prioridade 1)
-    print(f"🔎 DEBUG: Procurando em 'Serialnumber'...")
-    mask = database['Serialnumber'].str.upper() == normalized_serial.upper()
-    result = database[mask]
-    print(f"   Resultados encontrados: {len(result)}")
+    positions = _lookup_positions(normalized_serial, lookup_index, 'Ativo' in database.columns)
+    logger.debug("Linhas encontradas: %d", len(positions))
     
-    # 2. If not found and Ativo column exists, search by patrimônio (prioridade 2)
-    if result.empty and 'Ativo' in database.columns:
-        print(f"🔎 DEBUG: Não encontrado no Serial. Procurando em 'Ativo' (patrimônio)...")
-        
-        # Debug: Show sample of Ativo values
-        sample_ativos = database['Ativo'].dropna().head(5).tolist()
-        print(f"📊 DEBUG: Amostra de valores em 'Ativo': {sample_ativos}")
-        
-        try:
-            # Tentar converter input para número (patrimônio pode ser numérico)
-            input_as_number = int(float(normalized_serial))
-            print(f"   Input convertido para número: {input_as_number}")
-            
-            # Comparar como números (Ativo pode vir como float do Excel)
-            mask_ativo = database['Ativo'].apply(
-                lambda x: int(float(x)) == input_as_number if pd.notna(x) else False
-            )
-            result = database[mask_ativo]
-            print(f"   Resultados encontrados por número: {len(result)}")
-        except (ValueError, TypeError) as e:
-            print(f"   Não é número válido ({e}), tentando como string...")
-            # Se não for número, tentar comparação como string (fallback)
-            mask_ativo = database['Ativo'].astype(str).str.upper() == normalized_serial.upper()
-            result = database[mask_ativo]
-            print(f"   Resultados encontrados por string: {len(result)}")
-    
-    
-    if result.empty:
-        print(f"❌ DEBUG: Nenhum resultado encontrado para '{serial}'")
+    if not positions:
+        logger.debug("Nenhum resultado encontrado para '%s'", serial)
         return None
     
-    # Get first match
-    equipment = result.iloc[0]
-    print(f"✅ DEBUG: Equipamento encontrado! Serial: {equipment['Serialnumber']}, State: {equipment.get('State', 'N/A')}")
+    rows = database.iloc[list(positions)].to_dict('records')
+    equipment = _equipment_from_row(rows[0])
+    logger.debug("Equipamento encontrado! Serial: %s, State: %s", equipment['serialnumber'], equipment['state'])
     
+    if len(rows) > 1:
+        equipment['candidates'] = [_equipment_from_row(row) for row in rows]
+    
+    return equipment
+
+
+def _equipment_from_row(equipment: Mapping[str, Any]) -> Dict[str, Any]:
+    """Converte uma linha da base (Series ou dict) no dicionário de equipamento."""
     return {
         'serialnumber': equipment['Serialnumber'],
-        'state': normalize_state(equipment['State']) if pd.notna(equipment['State']) else 'unknown',
+        'state': get_row_state(equipment),
         'name': equipment['Name'] if pd.notna(equipment['Name']) else 'N/A',
         'lastuser': equipment['lastuser'] if pd.notna(equipment['lastuser']) else 'N/A',
         'ativo': int(float(equipment['Ativo'])) if 'Ativo' in equipment and pd.notna(equipment['Ativo']) else None
     }
 
 
-def compare_and_flag(serial: str, database: pd.DataFrame) -> Dict[str, Any]:
+def get_row_state(equipment: Mapping[str, Any]) -> str:
+    """Estado normalizado de uma linha (pré-calculado na importação quando disponível)."""
+    if STATE_NORMALIZED_COLUMN in equipment:
+        return str(equipment[STATE_NORMALIZED_COLUMN])
+    return normalize_state(equipment['State']) if pd.notna(equipment['State']) else 'unknown'
+
+
+def compare_and_flag(
+    serial: str,
+    database: pd.DataFrame,
+    lookup_index: Optional[Dict[str, Dict[Any, Any]]] = None
+) -> Dict[str, Any]:
     """
     Compara serial com base e retorna status de ajuste.
     
     Args:
         serial: Número de série lido
         database: DataFrame com base de dados
+        lookup_index: Índice pré-construído da base (ver build_lookup_index)
         
     Returns:
         Dicionário com informações e flag de ajuste necessário
     """
-    equipment = find_equipment(serial, database)
+    equipment = find_equipment(serial, database, lookup_index)
+    return _flag_equipment(serial, equipment)
+
+
+def compare_many(
+    serials: Iterable[str],
+    database: pd.DataFrame,
+    lookup_index: Optional[Dict[str, Dict[Any, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Compara vários seriais/patrimônios com a base em uma única passada.
     
+    Usado em fluxos em lote (reconferir sessão salva contra nova exportação,
+    importar memória offline do scanner). A normalização e a resolução no
+    índice são vetorizadas; o custo não depende do tamanho da base.
+    
+    Args:
+        serials: Seriais ou patrimônios lidos (na ordem desejada)
+        database: DataFrame com base de dados
+        lookup_index: Índice pré-construído da base (ver build_lookup_index)
+        
+    Returns:
+        Lista de dicionários no mesmo formato de compare_and_flag, na ordem de entrada.
+        Use pd.DataFrame(resultado) para obter um DataFrame.
+    """
+    serials = list(serials)
+    
+    if not serials:
+        return []
+    
+    if database is None or database.empty:
+        return [_flag_equipment(serial, None) for serial in serials]
+    
+    if lookup_index is None:
+        lookup_index = build_lookup_index(database)
+    
+    normalized = pd.Series(serials, dtype=object).fillna('').astype(str).str.strip().str.upper()
+    
+    # 1. Resolve todos pelo serial; 2. os que faltarem, pelo patrimônio
+    positions = normalized.map(lookup_index['serial'])
+    groups = normalized.map(lookup_index.get('serial_duplicates', {}))
+    missing = positions.isna()
+    if missing.any() and 'Ativo' in database.columns:
+        # Não numéricos, infinitos e fora do int64 viram <NA> (não encontrados)
+        ativos = normalize_ativo_series(normalized.where(missing))
+        positions = positions.fillna(ativos.map(lookup_index.get('ativo', {})))
+        groups = groups.where(~missing, ativos.map(lookup_index.get('ativo_duplicates', {})))
+    
+    # Uma única extração de linhas para todos os encontrados (e candidatos duplicados)
+    found = positions.notna()
+    needed = positions[found].astype(int).tolist()
+    for group in groups[found].dropna():
+        needed.extend(group)
+    needed = list(dict.fromkeys(needed))
+    records = dict(zip(needed, database.iloc[needed].to_dict('records')))
+    
+    results = []
+    for serial, is_found, position, group in zip(serials, found, positions.tolist(), groups.tolist()):
+        if not is_found:
+            results.append(_flag_equipment(serial, None))
+            continue
+        equipment = _equipment_from_row(records[int(position)])
+        if isinstance(group, tuple):
+            equipment['candidates'] = [_equipment_from_row(records[p]) for p in group]
+        results.append(_flag_equipment(serial, equipment))
+    
+    return results
+
+
+def _flag_equipment(serial: str, equipment: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Monta o resultado de comparação (status e flag de ajuste) de um equipamento."""
     if not equipment:
         return {
             'found': False,
@@ -154,6 +479,10 @@ def compare_and_flag(serial: str, database: pd.DataFrame) -> Dict[str, Any]:
     if equipment.get('ativo'):
         result['ativo'] = equipment['ativo']
     
+    # Serial/patrimônio repetido na base: devolve todos os candidatos
+    if equipment.get('candidates'):
+        result['candidates'] = equipment['candidates']
+    
     # Add Name and lastuser only for active equipment
     if requires_adjustment:
         result['name'] = equipment['name']
@@ -176,7 +505,7 @@ def get_adjustment_list(database: pd.DataFrame) -> pd.DataFrame:
         return pd.DataFrame()
     
     # Filter equipment with 'active' state
-    mask = database['State'].str.lower() == REQUIRES_ADJUSTMENT_STATE
+    mask = get_normalized_states(database) == REQUIRES_ADJUSTMENT_STATE
     adjustment_list = database[mask].copy()
     
     # Select only relevant columns
@@ -2,63 +2,600 @@
 Módulo de manipulação de arquivos Excel.
 
 Responsabilidades:
-- Importação de arquivos Excel do Lansweeper
+- Importação de arquivos Excel e CSV (opcionalmente gzip) do Lansweeper
 - Validação de estrutura e colunas obrigatórias
 - Exportação de relatórios em formato Excel
 - FILTRO AUTOMÁTICO: Apenas notebooks
 """
 
+import re
+import gzip
+import logging
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
 import pandas as pd
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Dict, Any, List, Union, BinaryIO
 from datetime import datetime
-from app.config import REQUIRED_COLUMNS
-from app.utils.helpers import sanitize_excel_value
+from app.config import (
+    REQUIRED_COLUMNS, OPTIONAL_COLUMNS, FILTER_COLUMNS, COMPACT_IMPORT, BASE_CACHE_ENABLED,
+    EXCEL_ENGINE, IMPORT_WORKERS, IMPORT_PARALLEL_MIN_ROWS
+)
+from app.utils.helpers import sanitize_excel_series, normalize_ativo_series, compile_pattern_groups
+from app.utils.constants import (
+    STATE_NORMALIZED_COLUMN, ALLOWED_EXTENSIONS, CSV_EXTENSIONS, CSV_DELIMITERS,
+    NOTEBOOK_MODEL_PATTERNS, EXCLUDE_MODEL_PATTERNS, VALID_OS_PATTERNS, VALID_TYPE_PATTERNS,
+    FILTER_REASON_COLUMN, FILTER_REASONS, HISTORY_TIMESTAMP_FORMAT
+)
+from app.utils.logger import get_logger
+from app.utils.profiling import measure_stage, trace_memory
+from app.services.comparator import normalize_state_series
+from app.services.base_cache import make_cache_key, load_cached_base, save_cached_base
 
+logger = get_logger(__name__)
 
-def import_excel(file_path: str) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+# Origem de uma importação: caminho em disco ou buffer binário em memória
+FileSource = Union[str, BinaryIO]
+
+# Processos do pool de importação não usam fork: o servidor do Streamlit tem
+# várias threads, e um fork com um lock tomado (ex: do logging) trava o worker
+_POOL_START_METHOD = (
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+# Chave de DataFrame.attrs com o total de colunas do arquivo (leitura com projeção)
+SOURCE_COLUMNS_ATTR = 'source_columns'
+
+# pyarrow (dependência do cache Parquet) lê CSV em paralelo; senão, parser C do pandas
+try:
+    import pyarrow  # noqa: F401
+    _CSV_ENGINE = 'pyarrow'
+except ImportError:
+    _CSV_ENGINE = 'c'
+
+# Engines do pandas por extensão, da mais rápida para a mais lenta
+EXCEL_ENGINE_PREFERENCE = {
+    '.xlsx': ['calamine', 'openpyxl'],
+    '.xls': ['calamine', 'xlrd'],
+}
+
+# Módulo que precisa estar instalado para cada engine
+_ENGINE_MODULES = {
+    'calamine': 'python_calamine',
+    'openpyxl': 'openpyxl',
+    'xlrd': 'xlrd',
+}
+
+# Regex compiladas do filtro de notebooks (uma por coluna)
+_MODEL_MATCHER = compile_pattern_groups(exclude=EXCLUDE_MODEL_PATTERNS, notebook=NOTEBOOK_MODEL_PATTERNS)
+_OS_MATCHER = compile_pattern_groups(valid=VALID_OS_PATTERNS)
+_TYPE_MATCHER = compile_pattern_groups(valid=VALID_TYPE_PATTERNS)
+
+
+def import_excel(
+    file_path: FileSource,
+    compact: bool = COMPACT_IMPORT,
+    import_report: Optional[Dict[str, Any]] = None,
+    use_cache: bool = BASE_CACHE_ENABLED
+) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
     """
-    Importa arquivo Excel do Lansweeper e valida estrutura.
+    Importa arquivo Excel ou CSV do Lansweeper e valida estrutura.
     
     IMPORTANTE: Filtra automaticamente apenas NOTEBOOKS da base completa.
     
     Args:
-        file_path: Caminho do arquivo Excel
+        file_path: Caminho ou buffer em memória do arquivo (.xlsx, .xls, .csv ou
+            .csv.gz); buffers precisam do atributo name (ex: UploadedFile)
+        compact: Lê apenas as colunas usadas (leitura em streaming) e as mantém
+            em formato compacto (ver compact_dataframe)
+        import_report: Dicionário opcional preenchido com estatísticas da importação
+            (ex: 'memory' com os bytes antes e depois de compact_dataframe e o
+            tamanho estimado sem o modo compacto, somando as colunas não lidas
+            pela média das lidas; 'cache' com 'hit' ou 'miss'; 'engine' e
+            'parse_seconds' da leitura do arquivo; 'stages' com tempo, linhas e
+            memória por etapa, ver measure_stage)
+        use_cache: Reutiliza o resultado de uma importação anterior do mesmo
+            arquivo (cache Parquet chaveado pelo hash do conteúdo)
         
     Returns:
         Tupla (DataFrame filtrado, DataFrame removido) ou (None, None) se erro
     """
+    stages = import_report.setdefault('stages', []) if import_report is not None else None
+    
     try:
-        # Read Excel file
-        df = pd.read_excel(file_path, engine='openpyxl')
+        with trace_memory():
+            return _run_import(file_path, compact, import_report, use_cache, stages)
+    
+    except Exception as e:
+        logger.error("Erro ao importar Excel: %s", e)
+        return None, None
+
+
+def _run_import(
+    file_path: FileSource,
+    compact: bool,
+    import_report: Optional[Dict[str, Any]],
+    use_cache: bool,
+    stages: Optional[List[Dict[str, Any]]]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Etapas da importação, cada uma medida com measure_stage (ver import_excel)."""
+    cache_key = None
+    
+    if use_cache:
+        with measure_stage(stages, 'cache_lookup') as stage:
+            cache_key = make_cache_key(file_path, compact)
+            cached = load_cached_base(cache_key)
+            if cached is not None:
+                stage['rows_out'] = len(cached[0]) + len(cached[1])
+        
+        if import_report is not None:
+            import_report['cache'] = 'hit' if cached is not None else 'miss'
+        
+        if cached is not None:
+            return cached
+    
+    # Read file (compact mode only materializes the columns the app uses)
+    columns = get_import_columns() if compact else None
+    
+    with measure_stage(stages, 'read') as stage:
+        df, engine = read_spreadsheet(file_path, columns)
+        stage['rows_out'] = len(df)
+    
+    logger.info(
+        "Arquivo carregado: %d registros totais (engine %s, %.2f s)",
+        len(df), engine, stage['seconds']
+    )
+    
+    if compact:
+        # As colunas descartadas na leitura nunca chegam à memória: seu tamanho
+        # é estimado pela média das colunas lidas
+        source_columns = df.attrs.get(SOURCE_COLUMNS_ATTR, len(df.columns))
+        read_bytes = int(df.memory_usage(index=False, deep=True).sum())
+        dropped_bytes_estimate = (
+            int(read_bytes / len(df.columns) * (source_columns - len(df.columns)))
+            if len(df.columns) else 0
+        )
+    if import_report is not None:
+        import_report['engine'] = engine
+        import_report['parse_seconds'] = stage['seconds']
+    
+    # Validate structure
+    with measure_stage(stages, 'validate', rows_in=len(df)) as stage:
+        is_valid, error_message = validate_excel_structure(df)
+        stage['rows_out'] = len(df)
+    
+    if not is_valid:
+        raise ValueError(error_message)
+    
+    if IMPORT_WORKERS > 1 and len(df) >= IMPORT_PARALLEL_MIN_ROWS:
+        # Base muito grande: Ativo, estado e filtro em paralelo, por blocos
+        with measure_stage(stages, 'prepare_parallel', rows_in=len(df)) as stage:
+            df_notebooks, df_removed = prepare_import_frame_parallel(df, IMPORT_WORKERS)
+            stage['rows_out'] = len(df_notebooks)
+    else:
+        # Convert Ativo column to nullable integer once (prevent decimal display
+        # and allow O(1) patrimônio lookup without per-scan conversion)
+        if 'Ativo' in df.columns:
+            with measure_stage(stages, 'ativo', rows_in=len(df)) as stage:
+                df['Ativo'] = normalize_ativo_series(df['Ativo'])
+                stage['rows_out'] = len(df)
         
-        print(f"\\n📂 Arquivo carregado: {len(df)} registros totais")
+        # Normalize State once (PT-BR → EN) as Categorical for all consumers
+        with measure_stage(stages, 'state', rows_in=len(df)) as stage:
+            df[STATE_NORMALIZED_COLUMN] = normalize_state_series(df['State'])
+            stage['rows_out'] = len(df)
         
-        # Validate structure
-        is_valid, error_message = validate_excel_structure(df)
+        # Filtro automático de notebooks
+        with measure_stage(stages, 'filter', rows_in=len(df)) as stage:
+            df_notebooks, df_removed = filter_notebooks_only(df)
+            stage['rows_out'] = len(df_notebooks)
+    
+    if df_notebooks.empty:
+        raise ValueError(
+            "Nenhum notebook encontrado após aplicar filtro. "
+            "Verifique se a base contém Dell Latitude, Dell Pro, OptiPlex, MacBook ou Linux."
+        )
+    
+    if compact:
+        # Medido sobre os DataFrames que entram na compactação: a leitura já
+        # trouxe só as colunas usadas e Ativo/State já estão convertidos, então
+        # não é o tamanho da planilha original
+        pre_compact_bytes = int(
+            df_notebooks.memory_usage(deep=True).sum() + df_removed.memory_usage(deep=True).sum()
+        )
         
-        if not is_valid:
-            raise ValueError(error_message)
+        with measure_stage(stages, 'compact', rows_in=len(df_notebooks) + len(df_removed)) as stage:
+            df_notebooks = compact_dataframe(df_notebooks)
+            df_removed = compact_dataframe(df_removed)
+            stage['rows_out'] = len(df_notebooks) + len(df_removed)
         
-        # Convert Ativo column to integer if present (prevent decimal display)
-        if 'Ativo' in df.columns:
-            df['Ativo'] = df['Ativo'].apply(
-                lambda x: int(float(x)) if pd.notna(x) and x != '' else None
-            )
+        compact_bytes = int(
+            df_notebooks.memory_usage(deep=True).sum() + df_removed.memory_usage(deep=True).sum()
+        )
+        raw_bytes_estimate = pre_compact_bytes + dropped_bytes_estimate
+        logger.info(
+            "Modo compacto: %d de %d colunas lidas; ~%d → %d bytes em memória "
+            "(%d economizados na conversão para Categorical)",
+            len(df_notebooks.columns), source_columns, raw_bytes_estimate, compact_bytes,
+            pre_compact_bytes - compact_bytes
+        )
+        if import_report is not None:
+            import_report['memory'] = {
+                'source_columns': source_columns,
+                'kept_columns': len(df_notebooks.columns),
+                'raw_bytes_estimate': raw_bytes_estimate,
+                'pre_compact_bytes': pre_compact_bytes,
+                'compact_bytes': compact_bytes,
+                'category_saved_bytes': pre_compact_bytes - compact_bytes,
+                'saved_bytes_estimate': raw_bytes_estimate - compact_bytes
+            }
+    
+    if cache_key is not None:
+        with measure_stage(stages, 'cache_save', rows_in=len(df_notebooks) + len(df_removed)):
+            save_cached_base(cache_key, df_notebooks, df_removed)
+    
+    return df_notebooks, df_removed
+
+
+def prepare_import_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Converte Ativo, normaliza State e aplica o filtro de notebooks.
+    
+    Mesmo processamento feito por import_excel após a validação; é a
+    unidade de trabalho de cada bloco em prepare_import_frame_parallel.
+    
+    Args:
+        df: DataFrame validado (ou um bloco dele)
         
-        # Filtro automático de notebooks
-        df_notebooks, df_removed = filter_notebooks_only(df)
+    Returns:
+        Tupla (DataFrame filtrado, DataFrame removido com FILTER_REASON_COLUMN)
+    """
+    df = df.copy()
+    
+    if 'Ativo' in df.columns:
+        df['Ativo'] = normalize_ativo_series(df['Ativo'])
+    
+    df[STATE_NORMALIZED_COLUMN] = normalize_state_series(df['State'])
+    return filter_notebooks_only(df)
+
+
+def prepare_import_frame_parallel(
+    df: pd.DataFrame,
+    workers: int = IMPORT_WORKERS
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Executa prepare_import_frame em blocos, em um pool de processos.
+    
+    A base é dividida em um bloco por worker; os resultados são concatenados
+    na ordem original (índice preservado). As categorias de State e do motivo
+    de exclusão são fixas, então as colunas continuam Categorical.
+    Se o pool não puder ser criado, processa tudo no processo atual.
+    
+    Args:
+        df: DataFrame validado
+        workers: Quantidade de processos
         
-        if df_notebooks.empty:
-            raise ValueError(
-                "Nenhum notebook encontrado após aplicar filtro. "
-                "Verifique se a base contém Dell Latitude, Dell Pro, OptiPlex, MacBook ou Linux."
-            )
+    Returns:
+        Tupla (DataFrame filtrado, DataFrame removido), igual a prepare_import_frame
+    """
+    chunk_rows = -(-len(df) // max(workers, 1))
+    chunks = [df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows)]
+    
+    if len(chunks) <= 1:
+        return prepare_import_frame(df)
+    
+    try:
+        with ProcessPoolExecutor(
+            max_workers=len(chunks),
+            mp_context=multiprocessing.get_context(_POOL_START_METHOD)
+        ) as executor:
+            results = list(executor.map(prepare_import_frame, chunks))
+    except (OSError, BrokenProcessPool) as e:
+        logger.warning("Pool de processos indisponível (%s). Processando sem paralelismo.", e)
+        return prepare_import_frame(df)
+    
+    logger.info("Importação paralela: %d blocos de até %d registros", len(chunks), chunk_rows)
+    
+    df_notebooks = pd.concat([notebooks for notebooks, _ in results])
+    df_removed = pd.concat([removed for _, removed in results if not removed.empty] or [pd.DataFrame()])
+    return df_notebooks, df_removed
+
+
+def get_import_columns() -> List[str]:
+    """
+    Retorna as colunas da exportação do Lansweeper usadas pela aplicação.
+    
+    Returns:
+        Colunas obrigatórias, opcionais e de filtro (config.py), sem repetição
+    """
+    return list(dict.fromkeys(REQUIRED_COLUMNS + OPTIONAL_COLUMNS + FILTER_COLUMNS))
+
+
+def get_file_extension(file_name: FileSource) -> str:
+    """
+    Retorna a extensão suportada de um nome de arquivo.
+    
+    Args:
+        file_name: Nome ou caminho do arquivo, ou buffer com atributo name
         
-        return df_notebooks, df_removed
+    Returns:
+        Extensão em minúsculas (ex: '.xlsx', '.csv.gz') ou string vazia se não suportada
+    """
+    name = (file_name if isinstance(file_name, str) else getattr(file_name, 'name', '')).lower()
     
-    except Exception as e:
-        print(f"Erro ao importar Excel: {str(e)}")
-        return None, None
+    # Longest first so '.csv.gz' wins over a plain suffix check
+    for extension in sorted(ALLOWED_EXTENSIONS, key=len, reverse=True):
+        if name.endswith(extension):
+            return extension
+    
+    return ''
+
+
+def is_csv_file(file_name: FileSource) -> bool:
+    """
+    Verifica se o arquivo deve ser lido como CSV.
+    
+    Args:
+        file_name: Nome ou caminho do arquivo, ou buffer com atributo name
+        
+    Returns:
+        True para .csv e .csv.gz
+    """
+    return get_file_extension(file_name) in CSV_EXTENSIONS
+
+
+def select_excel_engine(extension: str, preferred: str = EXCEL_ENGINE) -> str:
+    """
+    Escolhe a engine do pandas para ler uma planilha.
+    
+    Args:
+        extension: Extensão do arquivo ('.xlsx' ou '.xls')
+        preferred: Engine configurada ("auto" escolhe a mais rápida instalada)
+        
+    Returns:
+        Nome da engine (ex: 'calamine', 'openpyxl')
+        
+    Raises:
+        ValueError: Se nenhuma engine capaz de ler a extensão estiver instalada
+    """
+    candidates = EXCEL_ENGINE_PREFERENCE[extension]
+    
+    if preferred != 'auto':
+        if preferred not in candidates:
+            raise ValueError(f"Engine '{preferred}' não suporta arquivos {extension}")
+        candidates = [preferred]
+    
+    for engine in candidates:
+        if importlib.util.find_spec(_ENGINE_MODULES[engine]) is not None:
+            return engine
+    
+    packages = ' ou '.join(_ENGINE_MODULES[engine].replace('_', '-') for engine in candidates)
+    raise ValueError(f"Leitura de arquivos {extension} requer o pacote {packages}")
+
+
+def read_spreadsheet(
+    source: FileSource,
+    columns: Optional[List[str]] = None
+) -> Tuple[pd.DataFrame, str]:
+    """
+    Lê a exportação do Lansweeper com o leitor mais rápido disponível.
+    
+    CSV usa read_csv_columns; planilhas usam a engine de select_excel_engine.
+    Com openpyxl e projeção de colunas, usa a leitura em streaming
+    (read_excel_columns), que evita montar o workbook completo em memória.
+    
+    Args:
+        source: Caminho ou buffer do arquivo (buffers com atributo name)
+        columns: Colunas desejadas (as ausentes no arquivo são ignoradas);
+            None lê todas
+        
+    Returns:
+        Tupla (DataFrame, nome do leitor usado); com projeção, o total de
+        colunas do arquivo fica em df.attrs[SOURCE_COLUMNS_ATTR]
+        
+    Raises:
+        ValueError: Se a extensão não for suportada
+    """
+    if is_csv_file(source):
+        return read_csv_columns(source, columns), f"csv ({_CSV_ENGINE})"
+    
+    extension = get_file_extension(source)
+    if not extension:
+        raise ValueError(f"Formato de arquivo não suportado. Use: {', '.join(ALLOWED_EXTENSIONS)}")
+    
+    engine = select_excel_engine(extension)
+    _rewind(source)
+    
+    if engine == 'openpyxl' and columns is not None:
+        return read_excel_columns(source, columns), "openpyxl (streaming)"
+    
+    if columns is None:
+        return pd.read_excel(source, engine=engine), engine
+    
+    wanted = set(columns)
+    source_columns = []
+    
+    def use_column(name) -> bool:
+        source_columns.append(name)
+        return str(name).strip() in wanted
+    
+    df = pd.read_excel(source, engine=engine, usecols=use_column)
+    df.columns = [str(name).strip() for name in df.columns]
+    df = df.loc[:, ~df.columns.duplicated()]
+    df = df.dropna(how='all').reset_index(drop=True)
+    df.attrs[SOURCE_COLUMNS_ATTR] = len(source_columns)
+    return df, engine
+
+
+def read_csv_columns(source: FileSource, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Lê exportação CSV do Lansweeper, materializando apenas as colunas pedidas.
+    
+    O delimitador (',', ';' ou tab) é detectado pelo cabeçalho e arquivos
+    .csv.gz são descompactados em streaming. Todas as colunas são lidas como
+    texto (como o Serialnumber deve ser); Ativo é convertido depois por
+    normalize_ativo_series, igual à importação Excel.
+    
+    Args:
+        source: Caminho ou buffer do arquivo .csv ou .csv.gz
+        columns: Colunas desejadas (as ausentes no arquivo são ignoradas);
+            None lê todas
+        
+    Returns:
+        DataFrame com as colunas encontradas, na ordem do arquivo
+    """
+    compression = 'gzip' if get_file_extension(source).endswith('.gz') else None
+    delimiter = _detect_csv_delimiter(source, compression)
+    
+    _rewind(source)
+    header = pd.read_csv(
+        source, nrows=0, sep=delimiter, compression=compression, encoding='utf-8-sig'
+    )
+    names = {raw: str(raw).strip() for raw in header.columns}
+    
+    if columns is None:
+        usecols = list(names)
+    else:
+        wanted = set(columns)
+        usecols = []
+        seen = set()
+        for raw, name in names.items():
+            if name in wanted and name not in seen:
+                usecols.append(raw)
+                seen.add(name)
+    
+    if not usecols:
+        return pd.DataFrame()
+    
+    _rewind(source)
+    df = pd.read_csv(
+        source,
+        sep=delimiter,
+        usecols=usecols,
+        dtype=str,
+        compression=compression,
+        encoding='utf-8-sig',
+        skip_blank_lines=True,
+        engine=_CSV_ENGINE
+    )
+    
+    df = df.rename(columns=names).dropna(how='all').reset_index(drop=True)
+    df.attrs[SOURCE_COLUMNS_ATTR] = len(names)
+    return df
+
+
+def _detect_csv_delimiter(source: FileSource, compression: Optional[str]) -> str:
+    """Escolhe o delimitador mais frequente na linha de cabeçalho."""
+    _rewind(source)
+    stream = open(source, 'rb') if isinstance(source, str) else source
+    
+    try:
+        if compression == 'gzip':
+            # GzipFile não fecha o stream recebido em fileobj
+            with gzip.GzipFile(fileobj=stream) as gz:
+                raw_header = gz.readline()
+        else:
+            raw_header = stream.readline()
+    finally:
+        if stream is not source:
+            stream.close()
+    
+    header_line = raw_header.decode('utf-8-sig', errors='replace')
+    counts = {delimiter: header_line.count(delimiter) for delimiter in CSV_DELIMITERS}
+    best = max(counts, key=counts.get)
+    return best if counts[best] > 0 else ','
+
+
+def _rewind(source: FileSource) -> None:
+    """Volta buffers ao início antes de cada leitura (caminhos são ignorados)."""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def read_excel_columns(source: FileSource, columns: List[str]) -> pd.DataFrame:
+    """
+    Lê planilha .xlsx em modo streaming, materializando apenas as colunas pedidas.
+    
+    Usa openpyxl em modo read-only (sem montar o workbook completo em memória)
+    e ignora as demais colunas da exportação (que costuma ter 80+ colunas).
+    
+    Args:
+        source: Caminho ou buffer do arquivo .xlsx
+        columns: Colunas desejadas (as ausentes no arquivo são ignoradas)
+        
+    Returns:
+        DataFrame apenas com as colunas encontradas, na ordem do arquivo
+    """
+    from openpyxl import load_workbook
+    
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        
+        if header is None:
+            return pd.DataFrame()
+        
+        wanted = set(columns)
+        selected = {}
+        for position, name in enumerate(header):
+            name = str(name).strip() if name is not None else None
+            if name in wanted and name not in selected:
+                selected[name] = position
+        
+        if not selected:
+            return pd.DataFrame()
+        
+        # Stop parsing each row after the last wanted column
+        max_col = max(selected.values()) + 1
+        data = {name: [] for name in selected}
+        items = list(selected.items())
+        
+        for row in ws.iter_rows(min_row=2, max_col=max_col, values_only=True):
+            if row is None or all(value is None for value in row):
+                continue
+            for name, position in items:
+                data[name].append(row[position] if position < len(row) else None)
+        
+        df = pd.DataFrame(data)
+        df.attrs[SOURCE_COLUMNS_ATTR] = len(header)
+        return df
+    finally:
+        wb.close()
+
+
+def compact_dataframe(df: pd.DataFrame, max_category_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    Reduz o DataFrame às colunas usadas pela aplicação, em formato compacto.
+    
+    Mantém apenas colunas obrigatórias, opcionais, de filtro, o estado
+    normalizado e o motivo do filtro (nos removidos). Colunas de texto repetitivo (State, Model, OS, Type,
+    lastuser...) viram Categorical; Ativo permanece como Int64.
+    
+    Args:
+        df: DataFrame importado (já filtrado)
+        max_category_ratio: Proporção máxima de valores distintos para virar Categorical
+        
+    Returns:
+        Novo DataFrame compacto
+    """
+    if df is None or df.empty:
+        return df
+    
+    wanted = get_import_columns() + [STATE_NORMALIZED_COLUMN, FILTER_REASON_COLUMN]
+    compact = df[[col for col in wanted if col in df.columns]].copy()
+    
+    for col in compact.columns:
+        if col == 'Serialnumber' or isinstance(compact[col].dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_object_dtype(compact[col]) or pd.api.types.is_string_dtype(compact[col]):
+            if compact[col].nunique(dropna=True) <= max_category_ratio * len(compact):
+                compact[col] = compact[col].astype('category')
+    
+    return compact
 
 
 def filter_notebooks_only(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
@@ -68,12 +605,15 @@ def filter_notebooks_only(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]
     Inclui:
     - Dell Latitude, Dell Pro
     - MacBook (todos os modelos)
+    - Modelos desconhecidos ou vazios com OS/Type de notebook
     
     Exclui:
-    - Optiplex (desktops)
     - Máquinas virtuais
     - Fortinet
-    - Sistemas operacionais não-notebook
+    - Modelos não reconhecidos sem OS/Type de notebook
+    
+    O DataFrame de removidos recebe a coluna FILTER_REASON_COLUMN com o
+    código do motivo (ver FILTER_REASONS).
     
     Args:
         df: DataFrame completo do Lansweeper
@@ -81,113 +621,112 @@ def filter_notebooks_only(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]
     Returns:
         Tupla (DataFrame filtrado apenas com notebooks, DataFrame com registros removidos)
     """
-    from app.utils.constants import NOTEBOOK_MODEL_PATTERNS, EXCLUDE_MODEL_PATTERNS, VALID_OS_PATTERNS
-    
     # Se não tem coluna Model, retornar tudo sem filtrar
     if 'Model' not in df.columns:
-        print("⚠️ Coluna 'Model' não encontrada. Retornando todos os registros.")
+        logger.warning("Coluna 'Model' não encontrada. Retornando todos os registros.")
         return df, pd.DataFrame()
     
     try:
         total_original = len(df)
-        
-        # Filtro 1: Model contém padrão de notebook OU é vazio/null
-        # Mudança: Se Model estiver vazio, INCLUIR no resultado
-        model_has_value = df['Model'].notna() & (df['Model'] != '')
-        model_include = df['Model'].fillna('').str.lower().str.contains(
-            '|'.join(NOTEBOOK_MODEL_PATTERNS),
-            case=False,
-            na=False,
-            regex=True
-        )
-        # Incluir se: tem padrão de notebook OU Model está vazio
-        filter_include = model_include | ~model_has_value
-        
-        after_include = filter_include.sum()
-        print(f"📊 Filtro INCLUDE: {total_original} → {after_include} registros (incluiu modelos de notebook ou vazios)")
-        
-        # Filtro 2: Model NÃO contém padrão de exclusão (Optiplex, VMs, etc)
-        # Apenas aplicar se Model tem valor
-        model_exclude = ~df['Model'].fillna('').str.lower().str.contains(
-            '|'.join(EXCLUDE_MODEL_PATTERNS),
-            case=False,
-            na=False,
-            regex=True
-        )
-        
-        after_exclude = (filter_include & model_exclude).sum()
-        print(f"📊 Filtro EXCLUDE: {after_include} → {after_exclude} registros (excluiu Optiplex, VMs, Fortinet)")
-        
-        
-        # Filtro 3: OS é Windows ou macOS (se coluna existe)
-        # OU Type é Notebook/Laptop (filtro alternativo)
-        has_valid_os = True  # Default: passar se não tiver coluna OS
-        
-        if 'OS' in df.columns:
-            os_valid = df['OS'].fillna('').str.lower().str.contains(
-                '|'.join(VALID_OS_PATTERNS),
-                case=False,
-                na=False,
-                regex=True
-            )
-            has_valid_os = os_valid
-            after_os = (filter_include & model_exclude & os_valid).sum()
-            print(f"📊 Filtro OS: {after_exclude} → {after_os} registros (apenas Windows/macOS)")
-        else:
-            print(f"⚠️ Coluna 'OS' não encontrada. Pulando filtro de OS.")
-        
-        # Filtro 4: Type é Notebook/Laptop (filtro adicional/alternativo)
-        has_valid_type = True  # Default: passar se não tiver coluna Type
-        
-        if 'Type' in df.columns:
-            type_valid = df['Type'].fillna('').str.lower().str.contains(
-                'notebook|laptop|portable|linux',
-                case=False,
-                na=False,
-                regex=True
-            )
-            has_valid_type = type_valid
-            after_type = (filter_include & model_exclude & type_valid).sum()
-            print(f"📊 Filtro TYPE: {after_exclude} → {after_type} registros (apenas Notebook/Laptop/Linux)")
-        else:
-            print(f"⚠️ Coluna 'Type' não encontrada. Pulando filtro de Type.")
-        
-        # Combinar filtros: (Model correto) E (OS válido OU Type válido)
-        # Isso significa: se tiver OS válido OU Type válido, passa
-        # Combinar filtros: ((Model correto) OU (OS válido OU Type válido)) E (Não é excluído)
-        # Isso permite que modelos desconhecidos (ex: Lenovo) passem se tiverem OS ou Type válido
-        if 'OS' in df.columns or 'Type' in df.columns:
-            os_or_type = has_valid_os | has_valid_type
-            final_filter = (filter_include | os_or_type) & model_exclude
-        else:
-            # Se não tem nem OS nem Type, usar apenas filtros de modelo
-            final_filter = filter_include & model_exclude
-
+        reasons = get_filter_reasons(df)
+        final_filter = reasons.isna()
         
         df_filtered = df[final_filter].copy()
         df_removed = df[~final_filter].copy()
+        df_removed[FILTER_REASON_COLUMN] = reasons[~final_filter]
         
-        print(f"✅ Resultado final: {len(df_filtered)} notebooks de {total_original} registros totais")
-        print(f"❌ Removidos: {len(df_removed)} registros")
-        
-        # Debug: Mostrar alguns exemplos de modelos que PASSARAM no filtro
-        if len(df_filtered) > 0 and 'Model' in df_filtered.columns:
-            unique_models = df_filtered['Model'].dropna().unique()[:10]
-            print(f"📝 Exemplos de modelos incluídos: {', '.join(str(m) for m in unique_models)}")
+        logger.info(
+            "Filtro de notebooks: %d de %d registros mantidos, %d removidos",
+            len(df_filtered), total_original, len(df_removed)
+        )
         
-        # Debug: Mostrar alguns seriais que foram REMOVIDOS
-        if len(df_removed) > 0 and 'Serialnumber' in df_removed.columns:
-            sample_removed = df_removed['Serialnumber'].head(5).tolist()
-            print(f"🗑️ Exemplos de seriais removidos: {sample_removed}")
+        # Contagens e amostras só são calculadas quando o debug está ligado
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Motivos de exclusão: %s",
+                df_removed[FILTER_REASON_COLUMN].value_counts().to_dict()
+            )
+            
+            # Exemplos de modelos que PASSARAM no filtro
+            if len(df_filtered) > 0:
+                unique_models = df_filtered['Model'].dropna().unique()[:10]
+                logger.debug("Exemplos de modelos incluídos: %s", ', '.join(str(m) for m in unique_models))
+            
+            # Exemplos de seriais que foram REMOVIDOS
+            if len(df_removed) > 0 and 'Serialnumber' in df_removed.columns:
+                logger.debug("Exemplos de seriais removidos: %s", df_removed['Serialnumber'].head(5).tolist())
         
         return df_filtered, df_removed
         
     except Exception as e:
-        print(f"⚠️ Erro ao filtrar notebooks: {str(e)}")
-        print(f"⚠️ Retornando todos os registros sem filtro.")
+        logger.warning("Erro ao filtrar notebooks: %s. Retornando todos os registros sem filtro.", e)
         return df, pd.DataFrame()
 
 
+def get_filter_reasons(df: pd.DataFrame) -> pd.Series:
+    """
+    Calcula, em uma única passada, o motivo de exclusão de cada registro.
+    
+    Regra: o registro é mantido se o Model não contém padrão de exclusão E
+    (Model é de notebook OU está vazio OU OS é válido OU Type é válido).
+    Se só uma das colunas OS/Type existe, a ausente conta como válida (todo
+    registro não excluído é mantido); sem nenhuma das duas, valem apenas os
+    critérios de Model.
+    
+    Os padrões são compilados em uma expressão por coluna e avaliados apenas
+    sobre os valores distintos (Model/OS/Type se repetem muito na base); o
+    resultado é espalhado para as linhas pelos códigos do factorize.
+    
+    Args:
+        df: DataFrame com coluna Model (OS e Type opcionais)
+        
+    Returns:
+        Series categórica alinhada a df: NaN para registros mantidos, senão
+        o código do motivo (chave de FILTER_REASONS)
+    """
+    model_groups = _match_column_groups(df['Model'], _MODEL_MATCHER)
+    keep = model_groups['notebook'] | model_groups['empty']
+    
+    # Coluna OS/Type ausente conta como válida para todos os registros; só
+    # sem nenhuma das duas valem apenas os critérios de Model
+    if 'OS' in df.columns or 'Type' in df.columns:
+        os_or_type = np.zeros(len(df), dtype=bool)
+        for column, matcher in (('OS', _OS_MATCHER), ('Type', _TYPE_MATCHER)):
+            if column in df.columns:
+                os_or_type |= _match_column_groups(df[column], matcher)['valid']
+            else:
+                logger.debug("Coluna '%s' não encontrada. Pulando filtro de %s.", column, column)
+                os_or_type[:] = True
+        keep |= os_or_type
+    
+    keep &= ~model_groups['exclude']
+    
+    codes = np.where(keep, -1, np.where(model_groups['exclude'], 0, 1))
+    reasons = pd.Categorical.from_codes(codes, categories=list(FILTER_REASONS))
+    return pd.Series(reasons, index=df.index, name=FILTER_REASON_COLUMN)
+
+
+def _match_column_groups(values: pd.Series, matcher: re.Pattern) -> Dict[str, np.ndarray]:
+    """
+    Avalia a regex sobre os valores distintos da coluna.
+    
+    Returns:
+        Máscara booleana por linha para cada grupo nomeado, mais 'empty'
+        (valor nulo ou string vazia)
+    """
+    codes, uniques = pd.factorize(values.fillna('').astype(str))
+    
+    found = {name: np.zeros(len(uniques), dtype=bool) for name in matcher.groupindex}
+    for position, value in enumerate(uniques):
+        match = matcher.match(value)
+        for name, text in match.groupdict().items():
+            found[name][position] = text is not None
+    
+    masks = {name: flags[codes] for name, flags in found.items()}
+    masks['empty'] = (uniques == '')[codes]
+    return masks
+
+
 def validate_excel_structure(df: pd.DataFrame) -> Tuple[bool, str]:
     """
     Valida se o DataFrame possui as colunas obrigatórias.
@@ -237,16 +776,14 @@ def export_excel(df: pd.DataFrame, output_path: str) -> bool:
         # Sanitize all values to prevent formula injection
         sanitized_df = df.copy()
         for col in sanitized_df.columns:
-            sanitized_df[col] = sanitized_df[col].apply(
-                lambda x: sanitize_excel_value(str(x)) if pd.notna(x) else ''
-            )
+            sanitized_df[col] = sanitize_excel_series(sanitized_df[col])
         
         # Export to Excel
         sanitized_df.to_excel(output_path, index=False, engine='openpyxl')
         return True
     
     except Exception as e:
-        print(f"Erro ao exportar Excel: {str(e)}")
+        logger.error("Erro ao exportar Excel: %s", e)
         return False
 
 
@@ -280,9 +817,7 @@ def export_adjustment_list(equipment_list: pd.DataFrame) -> bytes:
         
         # Sanitize all values
         for col in equipment_list.columns:
-            equipment_list[col] = equipment_list[col].apply(
-                lambda x: sanitize_excel_value(str(x)) if pd.notna(x) else ''
-            )
+            equipment_list[col] = sanitize_excel_series(equipment_list[col])
         
         # Export to bytes
         from io import BytesIO
@@ -293,7 +828,7 @@ def export_adjustment_list(equipment_list: pd.DataFrame) -> bytes:
         return output.getvalue()
     
     except Exception as e:
-        print(f"Erro ao exportar lista de ajustes: {str(e)}")
+        logger.error("Erro ao exportar lista de ajustes: %s", e)
         return b''
 
 
@@ -301,6 +836,10 @@ def export_scanned_history(history_data: list) -> bytes:
     """
     Exporta histórico de verificação para bytes.
     
+    Escreve em modo streaming (openpyxl write-only): cada item vira uma linha
+    já com o formato da coluna (timestamp como data/hora, ativo como inteiro),
+    sem montar DataFrame nem reabrir o arquivo para formatar.
+    
     Args:
         history_data: Lista de dicionários com resultados da verificação
         
@@ -310,65 +849,79 @@ def export_scanned_history(history_data: list) -> bytes:
     try:
         if not history_data:
             return b''
-            
-        df = pd.DataFrame(history_data)
         
-        # Select and rename columns for better readability if needed
-        # Ensure timestamp is formatted
-        if 'timestamp' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
-            
-        # Reorder columns to put timestamp first if present
-        cols = df.columns.tolist()
-        if 'timestamp' in cols:
-            cols.remove('timestamp')
-            cols = ['timestamp'] + cols
-            df = df[cols]
-        
-        # Format ativo column as integer if present
-        if 'ativo' in df.columns:
-            # Convert to int first (numeric)
-            df['ativo'] = df['ativo'].apply(
-                lambda x: int(float(x)) if pd.notna(x) and x != '' and x != '-' else ''
-            )
-            
-        # Export to bytes
-        from io import BytesIO
-        from openpyxl import load_workbook
-        from openpyxl.styles import numbers
-        
-        output = BytesIO()
-        
-        # First export to Excel normally
-        df.to_excel(output, index=False, engine='openpyxl')
+        # Colunas na ordem em que aparecem, com timestamp primeiro; candidatos
+        # de serial duplicado são aninhados (não tabulares)
+        columns = list(dict.fromkeys(key for item in history_data for key in item))
+        if 'candidates' in columns:
+            columns.remove('candidates')
+        if 'timestamp' in columns:
+            columns.remove('timestamp')
+            columns.insert(0, 'timestamp')
+        
+        converters = {
+            'timestamp': _history_timestamp,
+            'ativo': _history_ativo,
+        }
+        number_formats = {
+            'timestamp': HISTORY_TIMESTAMP_FORMAT,
+            'ativo': '0',
+        }
         
-        # Now open with openpyxl to format Ativo column as integer
-        output.seek(0)
-        wb = load_workbook(output)
-        ws = wb.active
+        from io import BytesIO
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(columns)
+        
+        for item in history_data:
+            row = []
+            for column in columns:
+                value = converters.get(column, _history_value)(item.get(column))
+                cell = WriteOnlyCell(ws, value=value)
+                if column in number_formats and value is not None:
+                    cell.number_format = number_formats[column]
+                row.append(cell)
+            ws.append(row)
         
-        # Find Ativo column index
-        ativo_col_idx = None
-        for idx, cell in enumerate(ws[1], 1):  # Header row
-            if cell.value and 'ativo' in str(cell.value).lower():
-                ativo_col_idx = idx
-                break
-        
-        # Format Ativo column cells as integer (no decimals)
-        if ativo_col_idx:
-            for row in range(2, ws.max_row + 1):  # Skip header
-                cell = ws.cell(row=row, column=ativo_col_idx)
-                if cell.value and cell.value != '':
-                    # Set number format to integer (0 = no decimals)
-                    cell.number_format = '0'
-        
-        # Save back to BytesIO
         output = BytesIO()
         wb.save(output)
-        output.seek(0)
         
         return output.getvalue()
         
     except Exception as e:
-        print(f"Erro ao exportar histórico: {str(e)}")
+        logger.error("Erro ao exportar histórico: %s", e)
         return b''
+
+
+def _history_timestamp(value: Any) -> Optional[datetime]:
+    """Timestamp (datetime ou ISO) como datetime sem fuso (horário local da leitura)."""
+    if value is None or value == '':
+        return None
+    
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value))
+    
+    # Excel não guarda fuso: mantém o horário de parede (Brasília)
+    return value.replace(tzinfo=None, microsecond=0)
+
+
+def _history_ativo(value: Any) -> Optional[int]:
+    """Patrimônio como inteiro (vazio quando ausente ou não numérico)."""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _history_value(value: Any) -> Any:
+    """Demais colunas: valores simples como estão, ausentes vazios, o resto como texto."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (str, bool, int)):
+        return value
+    if isinstance(value, float):
+        return None if np.isnan(value) else value
+    return str(value)
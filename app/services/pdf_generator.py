@@ -9,20 +9,313 @@ Responsabilidades:
 """
 
 import io
+import bisect
 import hashlib
+from itertools import accumulate
 from datetime import datetime
-from typing import Optional, Dict, List
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
 import pandas as pd
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.platypus import Image as RLImage
+from reportlab.platypus.flowables import Flowable
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 from zoneinfo import ZoneInfo
 
 
+CORPORATE_BLUE = colors.HexColor('#003366')
+ALERT_RED = colors.HexColor('#d32f2f')
+
+# Estilos de tabela (imutáveis, compartilhados entre relatórios)
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), CORPORATE_BLUE),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+ITEMS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), CORPORATE_BLUE),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+])
+
+CONCILIATION_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), ALERT_RED),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+])
+
+# Colunas da conciliação: (rótulo, coluna da base, limite de caracteres)
+CONCILIATION_COLUMNS = [
+    ('Serial', 'Serialnumber', 20),
+    ('Modelo', 'Model', 25),
+    ('Hostname', 'Name', 20),
+    ('Último Usuário', 'lastuser', 15),
+]
+
+
+@lru_cache(maxsize=1)
+def _get_styles() -> Dict[str, ParagraphStyle]:
+    """
+    Estilos de parágrafo dos relatórios, criados uma única vez.
+    
+    Returns:
+        Dicionário nome -> ParagraphStyle (inclui 'normal')
+    """
+    styles = getSampleStyleSheet()
+    
+    return {
+        'normal': styles['Normal'],
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            textColor=CORPORATE_BLUE,  # Azul corporativo
+            spaceAfter=12,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=CORPORATE_BLUE,
+            spaceBefore=12,
+            spaceAfter=6,
+            fontName='Helvetica-Bold'
+        ),
+        'footer': ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=8,
+            textColor=colors.grey,
+            alignment=TA_CENTER
+        ),
+        'empty_title': ParagraphStyle(
+            'Title',
+            parent=styles['Heading1'],
+            fontSize=16,
+            textColor=colors.green,
+            alignment=TA_CENTER
+        ),
+        'alert_title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            textColor=ALERT_RED,  # Vermelho alerta
+            spaceAfter=12,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        'alert_heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=ALERT_RED,
+            spaceBefore=12,
+            spaceAfter=6,
+            fontName='Helvetica-Bold'
+        ),
+        'subheading': ParagraphStyle(
+            'SubHeading',
+            parent=styles['Heading3'],
+            fontSize=12,
+            textColor=CORPORATE_BLUE,
+            spaceBefore=10,
+            spaceAfter=5
+        ),
+    }
+
+
+class PagedTable(Flowable):
+    """
+    Tabela longa dividida em LongTables do tamanho de cada página.
+    
+    Uma única Table com milhares de linhas é remedida e recriada a cada
+    quebra de página (custo quadrático). Aqui, a cada quebra, só as linhas
+    que cabem no espaço disponível viram uma LongTable com o cabeçalho; o
+    restante segue para a próxima página. O custo fica linear e o cabeçalho
+    aparece apenas no topo de cada página.
+    
+    As linhas podem ter alturas diferentes (texto com quebra de linha): a
+    divisão usa a altura acumulada de cada linha, medida uma única vez.
+    """
+    
+    def __init__(
+        self,
+        header: List[str],
+        rows: List[List[str]],
+        col_widths: List[float],
+        style: TableStyle,
+        start: int = 0,
+        row_heights: Optional[Tuple[float, List[float]]] = None
+    ):
+        """
+        Args:
+            header: Cabeçalho das colunas
+            rows: Linhas já formatadas
+            col_widths: Largura de cada coluna
+            style: Estilo aplicado a cada LongTable
+            start: Primeira linha ainda não desenhada
+            row_heights: Já medidas: (altura do cabeçalho, altura acumulada
+                das linhas, com offsets[i] = soma das linhas antes de i)
+        """
+        super().__init__()
+        self.header = header
+        self.rows = rows
+        self.col_widths = col_widths
+        self.style = style
+        self.start = start
+        self.row_heights = row_heights
+        self.hAlign = 'CENTER'
+    
+    def _table(self, end: int) -> LongTable:
+        """LongTable com o cabeçalho e as linhas de start até end."""
+        table = LongTable(
+            [self.header] + self.rows[self.start:end],
+            colWidths=self.col_widths,
+            repeatRows=1
+        )
+        table.setStyle(self.style)
+        return table
+    
+    def _measure(self, avail_width: float) -> Tuple[float, List[float]]:
+        """
+        Mede (uma vez) a altura do cabeçalho e a altura acumulada das linhas.
+        
+        A altura de uma linha depende só do seu número de linhas de texto:
+        mede-se uma linha de exemplo por contagem distinta, não a tabela toda.
+        """
+        if self.row_heights is None:
+            line_counts = [
+                max((str(cell).count('\n') + 1 for cell in row), default=1)
+                for row in self.rows
+            ]
+            heights_by_count = {}
+            header_height = None
+            
+            for row, count in zip(self.rows, line_counts):
+                if count not in heights_by_count:
+                    probe = LongTable([self.header, row], colWidths=self.col_widths, repeatRows=1)
+                    probe.setStyle(self.style)
+                    probe.wrap(avail_width, 1e9)
+                    header_height, heights_by_count[count] = probe._rowHeights
+            
+            if header_height is None:
+                probe = self._table(self.start)
+                probe.wrap(avail_width, 1e9)
+                header_height = probe._rowHeights[0]
+            
+            offsets = [0.0] + list(accumulate(heights_by_count[count] for count in line_counts))
+            self.row_heights = (header_height, offsets)
+        return self.row_heights
+    
+    def wrap(self, availWidth, availHeight):
+        header_height, offsets = self._measure(availWidth)
+        self.width = sum(self.col_widths)
+        self.height = header_height + offsets[-1] - offsets[self.start]
+        return self.width, self.height
+    
+    def split(self, availWidth, availHeight):
+        header_height, offsets = self._measure(availWidth)
+        # Última linha cuja altura acumulada (a partir de start) cabe na página
+        limit = offsets[self.start] + availHeight - header_height
+        end = min(bisect.bisect_right(offsets, limit) - 1, len(self.rows))
+        
+        if end <= self.start:
+            return []
+        
+        rest = PagedTable(self.header, self.rows, self.col_widths, self.style, end, self.row_heights)
+        return [self._table(end), rest]
+    
+    def draw(self):
+        # Restante cabe no espaço disponível
+        table = self._table(len(self.rows))
+        table.wrap(self.width, self.height)
+        table.drawOn(self.canv, 0, self.height - table._height)
+
+
+def _format_item_time(item_timestamp) -> str:
+    """Hora (HH:MM:SS) do timestamp ISO de um item ('N/A' se inválido)."""
+    if not isinstance(item_timestamp, str):
+        return 'N/A'
+    
+    try:
+        return datetime.fromisoformat(item_timestamp.replace('Z', '+00:00')).strftime('%H:%M:%S')
+    except ValueError:
+        return 'N/A'
+
+
+def _session_item_rows(items: List[dict]) -> List[List[str]]:
+    """
+    Extrai as linhas do detalhamento dos itens verificados.
+    
+    Args:
+        items: Itens verificados
+        
+    Returns:
+        Linhas [Serial, Estado, Hostname, Usuário, Hora]
+    """
+    return [
+        [
+            str(item.get('serialnumber', 'N/A'))[:20],  # Limit length
+            str(item.get('state', 'N/A')).upper(),
+            str(item.get('name', 'N/A'))[:20],
+            str(item.get('lastuser', 'N/A'))[:15],
+            _format_item_time(item.get('timestamp', ''))
+        ]
+        for item in items
+    ]
+
+
+def _frame_rows(df: pd.DataFrame, columns: List[Tuple[str, str, Optional[int]]]) -> List[List[str]]:
+    """
+    Extrai as linhas de uma tabela do DataFrame, coluna a coluna.
+    
+    Args:
+        df: Dados do relatório
+        columns: (rótulo, coluna, limite de caracteres) de cada coluna
+        
+    Returns:
+        Linhas formatadas (valores ausentes como 'N/A')
+    """
+    values = []
+    
+    for _, col, limit in columns:
+        if col not in df.columns:
+            values.append(['N/A'] * len(df))
+            continue
+        
+        series = df[col]
+        text = series.astype(str)
+        if limit is not None:
+            text = text.str[:limit]
+        values.append(text.where(series.notna().to_numpy(), 'N/A').tolist())
+    
+    return [list(row) for row in zip(*values)]
+
+
 def generate_session_report_pdf(
     session_data: dict,
     scanned_items: List[dict],
@@ -56,29 +349,12 @@ def generate_session_report_pdf(
     # Container for PDF elements
     elements = []
     
-    # Styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#003366'),  # Azul corporativo
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#003366'),
-        spaceBefore=12,
-        spaceAfter=6,
-        fontName='Helvetica-Bold'
-    )
+    # Styles (compartilhados entre relatórios)
+    styles = _get_styles()
+    title_style = styles['title']
+    heading_style = styles['heading']
     
-    normal_style = styles['Normal']
+    normal_style = styles['normal']
     
     # Header - Logo (placeholder for now)
     # TODO: Add Anbima logo when provided
@@ -133,17 +409,7 @@ def generate_session_report_pdf(
     ]
     
     summary_table = Table(summary_data, colWidths=[10*cm, 4*cm])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#003366')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
+    summary_table.setStyle(SUMMARY_TABLE_STYLE)
     
     elements.append(summary_table)
     elements.append(Spacer(1, 1*cm))
@@ -161,58 +427,13 @@ def generate_session_report_pdf(
         else:
             elements.append(Paragraph("DETALHAMENTO DOS ITENS VERIFICADOS", heading_style))
         
-        # Table header
-        table_data = [['Serial', 'Estado', 'Hostname', 'Usuário', 'Hora']]
-        
-        for item in filtered_items:
-            serial = item.get('serialnumber', 'N/A')
-            state = item.get('state', 'N/A')
-            name = item.get('name', 'N/A')
-            lastuser = item.get('lastuser', 'N/A')
-            
-            # Format ativo as integer if present
-            ativo_value = item.get('ativo')
-            if ativo_value:
-                try:
-                    ativo_display = str(int(float(ativo_value)))
-                except (ValueError, TypeError):
-                    ativo_display = 'N/A'
-            else:
-                ativo_display = 'N/A'
-            
-            item_timestamp = item.get('timestamp', '')
-            if isinstance(item_timestamp, str):
-                try:
-                    dt = datetime.fromisoformat(item_timestamp.replace('Z', '+00:00'))
-                    time_str = dt.strftime('%H:%M:%S')
-                except:
-                    time_str = 'N/A'
-            else:
-                time_str = 'N/A'
-            
-            table_data.append([
-                str(serial)[:20],  # Limit length
-                str(state).upper(),
-                str(name)[:20],
-                str(lastuser)[:15],
-                time_str
-            ])
-        
-        # Create table with adjusted column widths
-        items_table = Table(table_data, colWidths=[4*cm, 2.5*cm, 3.5*cm, 3*cm, 2*cm])
-        items_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#003366')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-        ]))
-        
-        elements.append(items_table)
+        # Dividida em LongTables por página, com cabeçalho em cada uma
+        elements.append(PagedTable(
+            ['Serial', 'Estado', 'Hostname', 'Usuário', 'Hora'],
+            _session_item_rows(filtered_items),
+            col_widths=[4*cm, 2.5*cm, 3.5*cm, 3*cm, 2*cm],
+            style=ITEMS_TABLE_STYLE
+        ))
     
     # Compliance footer with hash
     elements.append(Spacer(1, 1*cm))
@@ -229,13 +450,7 @@ def generate_session_report_pdf(
     Este documento é imutável e destina-se a fins de auditoria e compliance.
     """
     
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.grey,
-        alignment=TA_CENTER
-    )
+    footer_style = styles['footer']
     
     elements.append(Paragraph(footer_text, footer_style))
     
@@ -286,21 +501,15 @@ def generate_empty_adjustment_pdf() -> bytes:
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4)
     
-    styles = getSampleStyleSheet()
+    styles = _get_styles()
     elements = []
     
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Heading1'],
-        fontSize=16,
-        textColor=colors.green,
-        alignment=TA_CENTER
-    )
+    title_style = styles['empty_title']
     
     elements.append(Spacer(1, 5*cm))
     elements.append(Paragraph("✅ NENHUM AJUSTE NECESSÁRIO", title_style))
     elements.append(Spacer(1, 1*cm))
-    elements.append(Paragraph("Todos os itens verificados estão com status correto no Lansweeper.", styles['Normal']))
+    elements.append(Paragraph("Todos os itens verificados estão com status correto no Lansweeper.", styles['normal']))
     
     doc.build(elements)
     
@@ -361,37 +570,12 @@ def generate_conciliation_pdf(
     )
     
     elements = []
-    styles = getSampleStyleSheet()
     
-    # Styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#d32f2f'),  # Vermelho alerta
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#d32f2f'),
-        spaceBefore=12,
-        spaceAfter=6,
-        fontName='Helvetica-Bold'
-    )
-    
-    subheading_style = ParagraphStyle(
-        'SubHeading',
-        parent=styles['Heading3'],
-        fontSize=12,
-        textColor=colors.HexColor('#003366'),
-        spaceBefore=10,
-        spaceAfter=5
-    )
+    # Styles (compartilhados entre relatórios)
+    styles = _get_styles()
+    title_style = styles['alert_title']
+    heading_style = styles['alert_heading']
+    subheading_style = styles['subheading']
     
     # Title
     elements.append(Paragraph("RELATÓRIO DE CONCILIAÇÃO DE ESTOQUE", title_style))
@@ -406,7 +590,7 @@ def generate_conciliation_pdf(
     <b>Data da Análise:</b> {timestamp_str}<br/>
     <b>Session ID:</b> {session_id}
     """
-    elements.append(Paragraph(metadata_text, styles['Normal']))
+    elements.append(Paragraph(metadata_text, styles['normal']))
     elements.append(Spacer(1, 0.5*cm))
     
     # Summary of Missing Items
@@ -415,43 +599,25 @@ def generate_conciliation_pdf(
     elements.append(Paragraph("RESUMO DE DIVERGÊNCIAS", heading_style))
     
     summary_text = f"Foram identificados <b>{total_missing}</b> equipamentos marcados como 'Stock' que NÃO foram localizados durante a verificação."
-    elements.append(Paragraph(summary_text, styles['Normal']))
+    elements.append(Paragraph(summary_text, styles['normal']))
         
     elements.append(Spacer(1, 0.5*cm))
     
     # Table Function
     def add_items_table(df, title):
         if df.empty:
-            elements.append(Paragraph(f"{title}: Nenhum item.", styles['Normal']))
+            elements.append(Paragraph(f"{title}: Nenhum item.", styles['normal']))
             return
 
         elements.append(Paragraph(title, subheading_style))
         
-        # Table Header
-        data = [['Serial', 'Modelo', 'Hostname', 'Último Usuário']]
-        
-        for _, row in df.iterrows():
-            data.append([
-                str(row.get('Serialnumber', 'N/A'))[:20],
-                str(row.get('Model', 'N/A'))[:25],
-                str(row.get('Name', 'N/A'))[:20],
-                str(row.get('lastuser', 'N/A'))[:15]
-            ])
-            
-        # Create Table
-        table = Table(data, colWidths=[4.5*cm, 5*cm, 3.5*cm, 4*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#d32f2f')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
-        
-        elements.append(table)
+        # Dividida em LongTables por página, com cabeçalho em cada uma
+        elements.append(PagedTable(
+            [label for label, _, _ in CONCILIATION_COLUMNS],
+            _frame_rows(df, CONCILIATION_COLUMNS),
+            col_widths=[4.5*cm, 5*cm, 3.5*cm, 4*cm],
+            style=CONCILIATION_TABLE_STYLE
+        ))
         elements.append(Spacer(1, 0.5*cm))
 
     # Add Tables
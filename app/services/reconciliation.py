@@ -8,6 +8,7 @@ Responsabilidades:
 
 import pandas as pd
 from typing import Dict, List
+from app.services.comparator import get_normalized_states
 
 
 def get_missing_items(database: pd.DataFrame, scanned_serials: List[str]) -> pd.DataFrame:
@@ -29,7 +30,7 @@ def get_missing_items(database: pd.DataFrame, scanned_serials: List[str]) -> pd.
     
     # Filter items marked as 'stock'
     stock_items = database[
-        database['State'].str.lower() == 'stock'
+        get_normalized_states(database) == 'stock'
     ].copy()
     
     # Find missing items (not scanned)
@@ -70,7 +71,7 @@ def get_stock_metrics(database: pd.DataFrame, scanned_items: List[Dict]) -> Dict
         }
     
     # Count expected items (only stock)
-    total_expected = len(database[database['State'].str.lower() == 'stock'])
+    total_expected = int((get_normalized_states(database) == 'stock').sum())
     
     # Count scanned stock items
     scanned_stock_count = sum(
@@ -110,10 +111,13 @@ def calculate_full_reconciliation(database: pd.DataFrame, scanned_items: List[Di
         return pd.DataFrame()
 
     # 1. Contagem Esperada (Base)
-    # Agrupa por State e conta
-    expected_counts = database['State'].value_counts().reset_index()
-    expected_counts.columns = ['state', 'expected']
-    expected_counts['state'] = expected_counts['state'].str.lower()
+    # Agrupa pelo estado normalizado (mesmo critério usado no scan) e conta
+    state_counts = get_normalized_states(database).value_counts()
+    state_counts = state_counts[state_counts > 0]  # Categorical inclui categorias vazias
+    expected_counts = pd.DataFrame({
+        'state': state_counts.index.astype(str),
+        'expected': state_counts.to_numpy()
+    })
     
     # 2. Contagem Encontrada (Scan)
     # Filtra apenas encontrados e conta por state
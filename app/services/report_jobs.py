@@ -0,0 +1,229 @@
+"""
+Geração de relatórios em segundo plano.
+
+Responsabilidades:
+- Gerar xlsx/PDF fora da thread do script do Streamlit (a leitura continua)
+- Manter um job por relatório na sessão, com status consultável
+- Entregar os bytes prontos ao cache de relatórios (artifact_cache)
+
+As funções de geração rodam em um pool de threads compartilhado pelo
+processo: recebem cópias dos dados da sessão e não acessam st.session_state.
+"""
+
+import time
+import threading
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, Executor
+from typing import Callable, Dict, Any, Hashable, Optional, Tuple
+from app.config import REPORT_JOB_WORKERS
+from app.services.artifact_cache import get_artifact_key, get_cached_artifact, get_or_build_artifact
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Status de um job
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Pool de geração de relatórios (criado na primeira chamada)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, REPORT_JOB_WORKERS),
+                thread_name_prefix='report-job'
+            )
+        return _executor
+
+
+def _get_jobs(jobs: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Jobs informados ou os da sessão (criados na primeira chamada)."""
+    if jobs is not None:
+        return jobs
+    if 'report_jobs' not in st.session_state:
+        st.session_state.report_jobs = {}
+    return st.session_state.report_jobs
+
+
+def _run_job(name: str, build: Callable[[], bytes]) -> bytes:
+    """Executa a geração na thread do pool, registrando o tempo."""
+    start = time.perf_counter()
+    data = build()
+    logger.info(
+        "Relatório %s gerado em segundo plano em %.2fs (%d bytes)",
+        name, time.perf_counter() - start, len(data or b'')
+    )
+    return data
+
+
+def submit_report_job(
+    name: str,
+    key: Tuple[Hashable, ...],
+    build: Callable[[], bytes],
+    jobs: Optional[Dict[str, Dict[str, Any]]] = None,
+    executor: Optional[Executor] = None,
+    retry: bool = False
+) -> Dict[str, Any]:
+    """
+    Agenda a geração de um relatório.
+
+    Cada relatório (name) tem um único job na sessão. Se o job atual tem a
+    mesma chave, ele é reaproveitado (inclusive uma falha, para não repetir
+    o erro a cada rerun); senão, é substituído (e cancelado, se ainda
+    estiver na fila).
+
+    Args:
+        name: Nome do relatório (ex: 'session_pdf')
+        key: Chave do conteúdo (ver get_artifact_key)
+        build: Função que gera os bytes (sem acesso a st.session_state)
+        jobs: Jobs a usar (padrão: st.session_state.report_jobs)
+        executor: Pool a usar (padrão: pool compartilhado do processo)
+        retry: Agenda novamente o job atual, se tiver a mesma chave e tiver falhado
+
+    Returns:
+        Job com 'name', 'key', 'build', 'future' e 'submitted_at'
+    """
+    jobs = _get_jobs(jobs)
+    current = jobs.get(name)
+
+    if current is not None and current['key'] == key:
+        if not (retry and get_job_status(current) == JOB_FAILED):
+            return current
+
+    if current is not None:
+        current['future'].cancel()
+
+    job = {
+        'name': name,
+        'key': key,
+        'build': build,
+        'future': (executor or _get_executor()).submit(_run_job, name, build),
+        'submitted_at': time.time()
+    }
+    jobs[name] = job
+
+    return job
+
+
+def get_report_job(
+    name: str,
+    jobs: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Retorna o job atual de um relatório.
+
+    Args:
+        name: Nome do relatório
+        jobs: Jobs a usar (padrão: st.session_state.report_jobs)
+
+    Returns:
+        Job (None se nunca foi agendado)
+    """
+    return _get_jobs(jobs).get(name)
+
+
+def get_job_status(job: Dict[str, Any]) -> str:
+    """
+    Retorna o status de um job.
+
+    Geração que terminou com erro, foi cancelada ou devolveu bytes vazios
+    (falha tratada pelos geradores) é considerada falha.
+
+    Args:
+        job: Job de submit_report_job
+
+    Returns:
+        JOB_QUEUED, JOB_RUNNING, JOB_DONE ou JOB_FAILED
+    """
+    future = job['future']
+
+    if not future.done():
+        return JOB_RUNNING if future.running() else JOB_QUEUED
+
+    if future.cancelled() or future.exception() is not None or not future.result():
+        return JOB_FAILED
+
+    return JOB_DONE
+
+
+def get_job_error(job: Dict[str, Any]) -> Optional[str]:
+    """
+    Retorna a mensagem de erro de um job que falhou.
+
+    Args:
+        job: Job de submit_report_job
+
+    Returns:
+        Mensagem de erro (None se o job não falhou)
+    """
+    if get_job_status(job) != JOB_FAILED:
+        return None
+
+    future = job['future']
+    if future.cancelled():
+        return "Geração cancelada"
+    if future.exception() is not None:
+        return str(future.exception())
+    return "Relatório vazio (verifique os logs)"
+
+
+def collect_report_job(
+    job: Dict[str, Any],
+    cache: Optional[Any] = None
+) -> Optional[bytes]:
+    """
+    Retorna os bytes de um job concluído, guardando-os no cache de relatórios.
+
+    Args:
+        job: Job de submit_report_job
+        cache: Cache a usar (padrão: st.session_state.artifact_cache)
+
+    Returns:
+        Bytes do relatório (None se ainda não concluiu ou falhou)
+    """
+    if get_job_status(job) != JOB_DONE:
+        return None
+
+    return get_or_build_artifact(job['key'], job['future'].result, cache)
+
+
+def request_report(
+    name: str,
+    build: Callable[[], bytes],
+    *parts: Hashable,
+    jobs: Optional[Dict[str, Dict[str, Any]]] = None,
+    cache: Optional[Any] = None
+) -> Tuple[str, Optional[bytes]]:
+    """
+    Retorna o relatório para o estado atual da sessão, gerando-o em segundo plano.
+
+    Se já está em cache, retorna os bytes; senão agenda (ou acompanha) o job
+    e retorna o status para a tela exibir o andamento.
+
+    Args:
+        name: Nome do relatório
+        build: Função que gera os bytes (sem acesso a st.session_state)
+        *parts: Entradas adicionais da chave (ver get_artifact_key)
+        jobs: Jobs a usar (padrão: st.session_state.report_jobs)
+        cache: Cache a usar (padrão: st.session_state.artifact_cache)
+
+    Returns:
+        Tupla (status, bytes do relatório ou None)
+    """
+    key = get_artifact_key(name, *parts)
+
+    cached = get_cached_artifact(key, cache)
+    if cached is not None:
+        return JOB_DONE, cached
+
+    job = submit_report_job(name, key, build, jobs)
+    status = get_job_status(job)
+
+    return status, collect_report_job(job, cache)
@@ -0,0 +1,318 @@
+"""
+Módulo de sugestões para seriais não encontrados.
+
+Responsabilidades:
+- Construir, no upload, índice aproximado dos seriais da base
+- Sugerir seriais próximos (erro de leitura ou digitação) em poucos milissegundos
+- Autocompletar por prefixo (serial, hostname, patrimônio) para digitação manual
+
+O índice é uma vizinhança de deleções (estilo SymSpell) sobre os seriais
+com caracteres confundíveis unificados (O/0, I/1, ...). Cada chave é
+guardada como hash de 64 bits em um array ordenado, consultado com
+busca binária, o que mantém a memória baixa mesmo para 100k seriais.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Dict, Any, List, Tuple
+from app.services.comparator import get_row_state
+from app.utils.constants import CONFUSABLE_SERIAL_CHARS
+from app.utils.helpers import normalize_serial, normalize_ativo_series
+
+# Seriais maiores que isso não entram no índice (lixo de importação)
+MAX_INDEXED_SERIAL_LENGTH = 40
+
+# Limite de candidatos avaliados por consulta (protege seriais muito curtos)
+MAX_CANDIDATES = 500
+
+# Campos cobertos pelo autocompletar: nome do campo → coluna da base
+PREFIX_FIELDS = {
+    'serial': 'Serialnumber',
+    'name': 'Name',
+    'ativo': 'Ativo'
+}
+
+_CONFUSABLE_TABLE = str.maketrans(CONFUSABLE_SERIAL_CHARS)
+_FNV_OFFSET = np.uint64(14695981039346656037)
+_FNV_PRIME = np.uint64(1099511628211)
+
+
+def build_suggestion_index(database: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """
+    Constrói índice de sugestões aproximadas sobre os seriais da base.
+    
+    Deve ser construído uma única vez no upload e guardado em
+    st.session_state.suggestion_index.
+    
+    Args:
+        database: DataFrame com base de dados do Lansweeper
+        
+    Returns:
+        Dicionário com 'keys' (hashes ordenados), 'positions' (linha de cada
+        chave) e 'width' (largura fixa das chaves), ou None se não houver seriais
+    """
+    if database is None or database.empty or 'Serialnumber' not in database.columns:
+        return None
+    
+    folded = _fold(database['Serialnumber'].fillna('').astype(str).str.strip().str.upper())
+    lengths = folded.str.len().to_numpy()
+    valid = (lengths > 0) & (lengths <= MAX_INDEXED_SERIAL_LENGTH)
+    
+    if not valid.any():
+        return None
+    
+    rows = np.flatnonzero(valid)
+    width = int(lengths[valid].max())
+    keys, owners = _deletion_keys(folded.to_numpy()[valid].tolist(), width)
+    
+    order = np.argsort(keys, kind='stable')
+    return {
+        'keys': keys[order],
+        'positions': rows[owners[order]].astype(np.int32),
+        'width': width
+    }
+
+
+def suggest_similar_serials(
+    serial: str,
+    database: pd.DataFrame,
+    suggestion_index: Optional[Dict[str, Any]],
+    limit: int = 5
+) -> List[Dict[str, Any]]:
+    """
+    Sugere seriais da base próximos ao serial lido.
+    
+    Cobre um caractere trocado, sobrando ou faltando, além de qualquer
+    quantidade de confusões O/0, I/1, S/5, B/8, Z/2.
+    
+    Args:
+        serial: Serial não encontrado
+        database: DataFrame com base de dados (mesmo usado no índice)
+        suggestion_index: Índice gerado por build_suggestion_index
+        limit: Quantidade máxima de sugestões
+        
+    Returns:
+        Lista de dicionários (serialnumber, state, name, distance), do mais
+        provável para o menos provável
+    """
+    if not suggestion_index or database is None or database.empty:
+        return []
+    
+    normalized = normalize_serial(serial)
+    folded = normalized.translate(_CONFUSABLE_TABLE)
+    width = suggestion_index['width']
+    
+    if not folded or len(folded) > width + 1:
+        return []
+    
+    query_keys, _ = _deletion_keys([folded], width, include_self=len(folded) <= width)
+    index_keys = suggestion_index['keys']
+    starts = np.searchsorted(index_keys, query_keys, side='left')
+    ends = np.searchsorted(index_keys, query_keys, side='right')
+    
+    candidates = []
+    for start, end in zip(starts, ends):
+        candidates.extend(suggestion_index['positions'][start:end].tolist())
+    candidates = list(dict.fromkeys(candidates))[:MAX_CANDIDATES]
+    
+    scored = []
+    for position in candidates:
+        row = database.iloc[position]
+        candidate_serial = normalize_serial(str(row['Serialnumber']))
+        if candidate_serial == normalized:
+            continue
+        distance = _serial_distance(normalized, candidate_serial)
+        scored.append((distance, candidate_serial, row))
+    
+    scored.sort(key=lambda item: (item[0], item[1]))
+    
+    return [
+        {
+            'serialnumber': row['Serialnumber'],
+            'state': get_row_state(row),
+            'name': row['Name'] if pd.notna(row.get('Name')) else 'N/A',
+            'distance': distance
+        }
+        for distance, _, row in scored[:limit]
+    ]
+
+
+def build_prefix_index(
+    df_included: pd.DataFrame,
+    df_removed: Optional[pd.DataFrame] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Constrói índice ordenado para busca por prefixo (autocompletar).
+    
+    Cobre serial, hostname (Name) e patrimônio (Ativo) tanto da base aceita
+    quanto dos registros removidos pelo filtro de notebooks.
+    
+    Args:
+        df_included: DataFrame com registros aceitos
+        df_removed: DataFrame com registros removidos pelo filtro (opcional)
+        
+    Returns:
+        Dicionário de arrays alinhados e ordenados por 'keys':
+        - 'keys': valor normalizado (minúsculo) usado na busca
+        - 'values': valor original para exibição
+        - 'fields': campo de origem ('serial', 'name', 'ativo')
+        - 'removed': True se o registro foi removido pelo filtro
+        - 'positions': posição da linha no DataFrame de origem
+    """
+    parts = []
+    sources = [(df_included, False), (df_removed, True)]
+    
+    for df, removed in sources:
+        if df is None or df.empty:
+            continue
+        for field, column in PREFIX_FIELDS.items():
+            if column not in df.columns:
+                continue
+            values = df[column]
+            if field == 'ativo':
+                values = normalize_ativo_series(values)
+            present = values.notna().to_numpy()
+            text = values[present].astype(str).str.strip()
+            keys = text.str.lower()
+            non_empty = (keys != '').to_numpy()
+            parts.append(pd.DataFrame({
+                'keys': keys.to_numpy()[non_empty],
+                'values': text.to_numpy()[non_empty],
+                'fields': field,
+                'removed': removed,
+                'positions': np.flatnonzero(present)[non_empty]
+            }))
+    
+    if not parts:
+        return {name: np.array([], dtype=object) for name in ('keys', 'values', 'fields', 'removed', 'positions')}
+    
+    index = pd.concat(parts, ignore_index=True).sort_values('keys', kind='stable')
+    return {column: index[column].to_numpy() for column in index.columns}
+
+
+def search_prefix(
+    prefix: str,
+    prefix_index: Optional[Dict[str, np.ndarray]],
+    fields: Optional[Tuple[str, ...]] = None,
+    limit: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Busca valores que começam com o prefixo informado (case insensitive).
+    
+    Args:
+        prefix: Texto digitado pelo operador
+        prefix_index: Índice gerado por build_prefix_index
+        fields: Restringe a busca a alguns campos (ex: ('serial',))
+        limit: Quantidade máxima de resultados
+        
+    Returns:
+        Lista de dicionários (value, field, removed, position) em ordem alfabética
+    """
+    term = (prefix or '').strip().lower()
+    
+    if not term or not prefix_index or len(prefix_index['keys']) == 0:
+        return []
+    
+    keys = prefix_index['keys']
+    start = np.searchsorted(keys, term, side='left')
+    end = np.searchsorted(keys, term + '\uffff', side='right')
+    
+    matches = []
+    for i in range(start, end):
+        field = prefix_index['fields'][i]
+        if fields is not None and field not in fields:
+            continue
+        matches.append({
+            'value': prefix_index['values'][i],
+            'field': field,
+            'removed': bool(prefix_index['removed'][i]),
+            'position': int(prefix_index['positions'][i])
+        })
+        if len(matches) >= limit:
+            break
+    
+    return matches
+
+
+def _fold(serials: pd.Series) -> pd.Series:
+    """Unifica caracteres confundíveis (O→0, I→1, ...)."""
+    return serials.str.translate(_CONFUSABLE_TABLE)
+
+
+def _deletion_keys(
+    serials: List[str],
+    width: int,
+    include_self: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gera hashes do serial e de todas as suas deleções de um caractere.
+    
+    Args:
+        serials: Seriais já normalizados e com confundíveis unificados
+        width: Largura fixa (bytes) usada para todas as chaves
+        include_self: Se inclui o próprio serial, além das deleções
+        
+    Returns:
+        Tupla (hashes uint64, índice do serial de origem de cada hash)
+    """
+    encoded = [s.encode('ascii', 'replace')[:width + 1] for s in serials]
+    lengths = np.fromiter((len(s) for s in encoded), dtype=np.int64, count=len(encoded))
+    matrix = np.zeros((len(encoded), width + 1), dtype=np.uint8)
+    buffer = np.array(encoded, dtype=f'S{width + 1}')
+    matrix[:, :] = buffer.view(np.uint8).reshape(len(encoded), width + 1)
+    
+    keys = []
+    owners = []
+    
+    if include_self:
+        rows = np.flatnonzero(lengths <= width)
+        keys.append(_hash_rows(matrix[rows, :width]))
+        owners.append(rows)
+    
+    for i in range(width + 1):
+        rows = np.flatnonzero(lengths > i)
+        if len(rows) == 0:
+            break
+        deleted = np.zeros((len(rows), width), dtype=np.uint8)
+        deleted[:, :i] = matrix[rows, :i]
+        deleted[:, i:] = matrix[rows, i + 1:]
+        keys.append(_hash_rows(deleted))
+        owners.append(rows)
+    
+    return np.concatenate(keys), np.concatenate(owners)
+
+
+def _hash_rows(matrix: np.ndarray) -> np.ndarray:
+    """Hash FNV-1a de 64 bits de cada linha de uma matriz de bytes."""
+    hashes = np.full(matrix.shape[0], _FNV_OFFSET, dtype=np.uint64)
+    for column in range(matrix.shape[1]):
+        hashes ^= matrix[:, column].astype(np.uint64)
+        hashes *= _FNV_PRIME
+    return hashes
+
+
+def _serial_distance(a: str, b: str) -> float:
+    """
+    Distância de edição (com transposição) entre dois seriais.
+    
+    Troca entre caracteres confundíveis (ex: O↔0) custa 0.5.
+    """
+    previous_previous = None
+    previous = [float(j) for j in range(len(b) + 1)]
+    
+    for i in range(1, len(a) + 1):
+        current = [float(i)] + [0.0] * len(b)
+        for j in range(1, len(b) + 1):
+            if a[i - 1] == b[j - 1]:
+                cost = 0.0
+            elif a[i - 1].translate(_CONFUSABLE_TABLE) == b[j - 1].translate(_CONFUSABLE_TABLE):
+                cost = 0.5
+            else:
+                cost = 1.0
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        previous_previous, previous = previous, current
+    
+    return previous[-1]
@@ -32,17 +32,28 @@ OK_STATES = ['stock', 'broken', 'stolen', 'in repair', 'old', 'reservado']
 REQUIRES_ADJUSTMENT_STATE = 'active'
     
 # Extensões de arquivo permitidas
-ALLOWED_EXTENSIONS = ['.xlsx', '.xls']
+ALLOWED_EXTENSIONS = ['.xlsx', '.xls', '.csv', '.csv.gz']
+
+# Extensões lidas pelo leitor de CSV (texto delimitado, opcionalmente gzip)
+CSV_EXTENSIONS = ['.csv', '.csv.gz']
+
+# Delimitadores aceitos em exportações CSV (o Lansweeper usa ',' ou ';' conforme o locale)
+CSV_DELIMITERS = [',', ';', '\t']
 
 # MIME types válidos para validação
 VALID_MIME_TYPES = [
     'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',  # .xlsx
-    'application/vnd.ms-excel'  # .xls
+    'application/vnd.ms-excel',  # .xls
+    'text/csv',  # .csv
+    'application/gzip'  # .csv.gz
 ]
 
 # Formato de nomenclatura para arquivos exportados
 EXPORT_FILENAME_PATTERN = "ajustes_lansweeper_{date}.xlsx"
 
+# Formato de data/hora da coluna timestamp no histórico exportado
+HISTORY_TIMESTAMP_FORMAT = 'yyyy-mm-dd hh:mm:ss'
+
 # Mapeamento de normalização PT-BR → EN
 # Permite que o Excel tenha estados em português
 STATE_NORMALIZATION = {
@@ -54,6 +65,7 @@ STATE_NORMALIZATION = {
     'antigo': 'old',
     'reservado': 'reservado',
     'ativo': 'active',
+    'vendido': 'sold',
     # Inglês → Inglês (idempotência)
     'stock': 'stock',
     'broken': 'broken',
@@ -61,7 +73,23 @@ STATE_NORMALIZATION = {
     'in repair': 'in repair',
     'old': 'old',
     'reservado': 'reservado',
-    'active': 'active'
+    'active': 'active',
+    'sold': 'sold'
+}
+
+# Coluna adicionada na importação com o estado já normalizado (Categorical)
+STATE_NORMALIZED_COLUMN = 'State_normalized'
+
+# Caracteres que o leitor/operador costuma confundir em seriais (misread/typo)
+# Usado pelo índice de sugestões para aproximar "O"↔"0", "I"↔"1", etc.
+CONFUSABLE_SERIAL_CHARS = {
+    'O': '0',
+    'Q': '0',
+    'I': '1',
+    'L': '1',
+    'S': '5',
+    'B': '8',
+    'Z': '2'
 }
 
 # Padrões de modelos de notebooks para filtro automático
@@ -100,3 +128,23 @@ VALID_OS_PATTERNS = [
     'not scanned',      # Equipamentos não escaneados pelo Lansweeper
 ]
 
+# Tipos de equipamento (coluna Type) válidos para notebooks
+VALID_TYPE_PATTERNS = [
+    'notebook',
+    'laptop',
+    'portable',
+    'linux'
+]
+
+# Coluna com o motivo da exclusão no DataFrame de registros removidos pelo filtro
+FILTER_REASON_COLUMN = 'Filter_reason'
+
+# Códigos de motivo de exclusão → explicação exibida no debug de importação
+FILTER_REASONS = {
+    'excluded_model': "Modelo '{model}' contém padrão de exclusão (ex: 'virtual', 'vm', 'fortinet').",
+    'unrecognized_model': (
+        "Modelo '{model}' não foi reconhecido como notebook (Dell Latitude/Pro, MacBook, OptiPlex) "
+        "e o registro não possui OS ou Type válidos para notebook."
+    ),
+}
+
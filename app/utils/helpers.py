@@ -2,10 +2,17 @@
 Funções auxiliares gerais da aplicação.
 """
 
-from typing import Any
+import re
+import numpy as np
+import pandas as pd
+from typing import Any, List
 from datetime import datetime
 
 
+# Prefixos que o Excel interpreta como fórmula
+EXCEL_FORMULA_PREFIXES = ('=', '+', '-', '@')
+
+
 def sanitize_excel_value(value: Any) -> Any:
     """
     Remove caracteres perigosos para prevenir formula injection.
@@ -19,11 +26,37 @@ def sanitize_excel_value(value: Any) -> Any:
     Returns:
         Valor sanitizado (string com aspas simples se perigoso)
     """
-    if isinstance(value, str) and value.startswith(('=', '+', '-', '@')):
+    if isinstance(value, str) and value.startswith(EXCEL_FORMULA_PREFIXES):
         return "'" + value  # Força tratamento como texto
     return value
 
 
+def sanitize_excel_series(values: pd.Series) -> pd.Series:
+    """
+    Versão vetorizada de sanitize_excel_value(str(x)) para uma coluna inteira.
+    
+    Cada valor é convertido para texto (vazios viram '') e os que começam
+    com =, +, -, @ recebem aspas simples, com a checagem de prefixo feita
+    sobre a coluna toda em vez de uma chamada Python por célula.
+    
+    Args:
+        values: Coluna a ser exportada
+        
+    Returns:
+        Série de strings sanitizadas, com o mesmo índice
+    """
+    missing = values.isna().to_numpy()
+    
+    # Datas viram objetos Timestamp para manter o formato de str() (com horário)
+    if pd.api.types.is_datetime64_any_dtype(values) or pd.api.types.is_timedelta64_dtype(values):
+        values = values.astype(object)
+    
+    text = values.astype(str)
+    dangerous = text.str.startswith(EXCEL_FORMULA_PREFIXES).to_numpy(dtype=bool, na_value=False)
+    text = text.where(~dangerous, "'" + text)
+    return text.where(~missing, '')
+
+
 def format_file_size(size_bytes: int) -> str:
     """
     Formata tamanho de arquivo em formato legível.
@@ -74,3 +107,42 @@ def normalize_serial(serial: str) -> str:
         return ""
     
     return serial.strip().upper()
+
+
+def normalize_ativo_series(values: pd.Series) -> pd.Series:
+    """
+    Converte coluna de patrimônio (Ativo) para inteiro anulável (Int64).
+    
+    Floats vindos do Excel (ex: 9856.0) são truncados para inteiro;
+    valores vazios, não numéricos, infinitos ou fora da faixa do int64
+    (ex: 'INF', '1E400', seriais numéricos longos) viram <NA>.
+    
+    Args:
+        values: Série com os valores brutos da coluna Ativo
+        
+    Returns:
+        Série com dtype Int64
+    """
+    numeric = np.trunc(pd.to_numeric(values, errors='coerce').astype('float64'))
+    out_of_range = ~np.isfinite(numeric) | (numeric.abs() >= 2**63)
+    return numeric.mask(out_of_range).astype('Int64')
+
+
+def compile_pattern_groups(**groups: List[str]) -> re.Pattern:
+    """
+    Compila listas de padrões em uma única regex com um grupo nomeado por lista.
+    
+    Cada grupo fica em um lookahead opcional ancorado no início, então um
+    único match informa todas as listas encontradas no valor (mesmo quando
+    os trechos se sobrepõem).
+    
+    Args:
+        **groups: Nome do grupo → lista de padrões (regex)
+        
+    Returns:
+        Regex compilada (sem diferenciar maiúsculas/minúsculas)
+    """
+    return re.compile(
+        ''.join(f"(?:(?=.*?(?P<{name}>{'|'.join(patterns)})))?" for name, patterns in groups.items()),
+        re.IGNORECASE | re.DOTALL
+    )
@@ -0,0 +1,48 @@
+"""
+Configuração de logging da aplicação.
+
+O nível é definido por LOG_LEVEL em app/config.py (DEBUG=true força nível DEBUG).
+Mensagens devem usar formatação lazy (logger.debug("... %s", valor)) e
+amostragens de DataFrame devem ser protegidas por logger.isEnabledFor(),
+para que não tenham custo quando o debug estiver desligado.
+"""
+
+import logging
+from app.config import DEBUG, LOG_LEVEL
+
+APP_LOGGER_NAME = "app"
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+
+def _configure_app_logger() -> logging.Logger:
+    """Configura (uma única vez) o logger raiz da aplicação."""
+    app_logger = logging.getLogger(APP_LOGGER_NAME)
+    
+    if not app_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        app_logger.addHandler(handler)
+        app_logger.propagate = False
+        
+        level = logging.DEBUG if DEBUG else logging.getLevelName(LOG_LEVEL.upper())
+        app_logger.setLevel(level if isinstance(level, int) else logging.INFO)
+    
+    return app_logger
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Retorna logger da aplicação para o módulo informado.
+    
+    Args:
+        name: Nome do módulo (normalmente __name__)
+        
+    Returns:
+        Logger filho de "app", já configurado
+    """
+    _configure_app_logger()
+    
+    if name != APP_LOGGER_NAME and not name.startswith(APP_LOGGER_NAME + "."):
+        name = f"{APP_LOGGER_NAME}.{name}"
+    
+    return logging.getLogger(name)
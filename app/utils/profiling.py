@@ -0,0 +1,158 @@
+"""
+Medição por etapa (tempo, linhas e memória) do pipeline de importação.
+
+Cada etapa registra tempo de parede, linhas de entrada/saída e a memória
+residente atual do processo (RSS) antes e depois da etapa. O pico de RSS
+(ru_maxrss) cobre a vida toda do processo e só cresce: é reportado uma vez
+por importação, não por etapa. Com PROFILE_IMPORT_MEMORY=true, registra
+também o pico de alocações da própria etapa via tracemalloc (mais preciso,
+porém deixa a importação ~2x mais lenta; usar apenas para diagnóstico).
+"""
+
+import os
+import sys
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Iterator
+from app.config import PROFILE_IMPORT_MEMORY
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Prefixo da linha de log estruturada (facilita grep/ingestão)
+STAGE_REPORT_LOG_PREFIX = "import_profile"
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Memória residente atual (páginas); disponível apenas no Linux
+_STATM_PATH = "/proc/self/statm"
+
+
+def get_current_rss_bytes() -> Optional[int]:
+    """
+    Retorna a memória residente atual do processo.
+
+    Returns:
+        Bytes (None se a plataforma não expõe /proc/self/statm)
+    """
+    try:
+        with open(_STATM_PATH) as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def get_peak_rss_bytes() -> Optional[int]:
+    """
+    Retorna o pico de memória residente do processo desde o seu início.
+
+    O valor nunca diminui: não serve para medir uma etapa isolada.
+
+    Returns:
+        Bytes (None se a plataforma não expõe a informação)
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta em KB; macOS em bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+@contextmanager
+def measure_stage(
+    stages: Optional[List[Dict[str, Any]]],
+    name: str,
+    rows_in: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Mede uma etapa e adiciona o resultado em stages.
+
+    Uso:
+        with measure_stage(stages, 'filter', rows_in=len(df)) as stage:
+            df_out = ...
+            stage['rows_out'] = len(df_out)
+
+    Args:
+        stages: Lista que recebe a medição (None desliga o registro)
+        name: Nome da etapa
+        rows_in: Linhas de entrada da etapa
+
+    Yields:
+        Dicionário da etapa (o chamador preenche 'rows_out')
+    """
+    stage = {'stage': name, 'rows_in': rows_in, 'rows_out': None}
+    rss_before = get_current_rss_bytes()
+    tracing = tracemalloc.is_tracing()
+
+    if tracing:
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    try:
+        yield stage
+    finally:
+        stage['seconds'] = round(time.perf_counter() - start, 4)
+        rss_after = get_current_rss_bytes()
+        stage['rss_before_bytes'] = rss_before
+        stage['rss_after_bytes'] = rss_after
+        stage['rss_delta_bytes'] = (
+            rss_after - rss_before if rss_before is not None and rss_after is not None else None
+        )
+        if tracing:
+            stage['peak_traced_bytes'] = tracemalloc.get_traced_memory()[1]
+        if stages is not None:
+            stages.append(stage)
+
+
+@contextmanager
+def trace_memory(enabled: bool = PROFILE_IMPORT_MEMORY) -> Iterator[None]:
+    """
+    Liga o tracemalloc durante o bloco (se habilitado e ainda não ligado).
+
+    Args:
+        enabled: Liga o rastreamento de alocações por etapa
+    """
+    started = enabled and not tracemalloc.is_tracing()
+
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def log_stage_report(stages: List[Dict[str, Any]], **context: Any) -> str:
+    """
+    Escreve o relatório de etapas como uma linha JSON no log.
+
+    Inclui uma única vez o pico de RSS do processo (process_peak_rss_bytes).
+
+    Args:
+        stages: Medições de measure_stage
+        **context: Campos adicionais (ex: arquivo, engine, cache)
+
+    Returns:
+        JSON registrado (sem o prefixo)
+    """
+    payload = json.dumps(
+        {
+            **context,
+            'total_seconds': round(sum(stage['seconds'] for stage in stages), 4),
+            'process_peak_rss_bytes': get_peak_rss_bytes(),
+            'stages': stages
+        },
+        ensure_ascii=False,
+        default=str
+    )
+    logger.info("%s %s", STAGE_REPORT_LOG_PREFIX, payload)
+    return payload
@@ -64,3 +64,18 @@ def valid_states():
     """
     from app.utils.constants import VALID_STATES
     return list(VALID_STATES.keys())
+
+
+@pytest.fixture(autouse=True)
+def isolated_base_cache(tmp_path, monkeypatch):
+    """
+    Fixture: Direciona o cache Parquet das bases para um diretório temporário.
+    
+    Evita que testes de importação gravem em data/cache ou reaproveitem
+    resultados de outros testes.
+    """
+    from app.services import base_cache
+    
+    cache_dir = str(tmp_path / 'base_cache')
+    monkeypatch.setattr(base_cache, 'BASE_CACHE_DIR', cache_dir)
+    return cache_dir
@@ -0,0 +1,90 @@
+import pytest
+from collections import OrderedDict
+from app.services.artifact_cache import get_artifact_key, get_or_build_artifact
+from app.services.barcode_handler import add_scanned_item, clear_scanned_items
+
+
+@pytest.fixture(autouse=True)
+def empty_session():
+    """Garante histórico vazio antes de cada teste"""
+    clear_scanned_items()
+    yield
+    clear_scanned_items()
+
+
+class TestArtifactKey:
+    """Testes da chave dos relatórios"""
+
+    def test_key_changes_when_history_changes(self):
+        """Testa que nova leitura muda a chave"""
+        before = get_artifact_key('history_xlsx')
+        add_scanned_item({'serialnumber': 'AAA111', 'found': True})
+
+        assert get_artifact_key('history_xlsx') != before
+
+    def test_key_changes_after_clear(self):
+        """Testa que limpar e ler de novo não reaproveita a chave antiga"""
+        add_scanned_item({'serialnumber': 'AAA111', 'found': True})
+        before = get_artifact_key('history_xlsx')
+
+        clear_scanned_items()
+        add_scanned_item({'serialnumber': 'BBB222', 'found': True})
+
+        assert get_artifact_key('history_xlsx') != before
+
+    def test_key_stable_without_changes(self):
+        """Testa que a chave se mantém entre reruns"""
+        assert get_artifact_key('history_xlsx', 'x') == get_artifact_key('history_xlsx', 'x')
+
+
+class TestGetOrBuildArtifact:
+    """Testes do cache de relatórios"""
+
+    def test_hit_does_not_rebuild(self):
+        """Testa que a segunda chamada reaproveita os bytes"""
+        cache = OrderedDict()
+        calls = []
+
+        def build():
+            calls.append(1)
+            return b'data'
+
+        assert get_or_build_artifact(('a', 1), build, cache=cache) == b'data'
+        assert get_or_build_artifact(('a', 1), build, cache=cache) == b'data'
+        assert len(calls) == 1
+
+    def test_new_key_rebuilds(self):
+        """Testa que chave diferente gera novamente"""
+        cache = OrderedDict()
+
+        get_or_build_artifact(('a', 1), lambda: b'v1', cache=cache)
+
+        assert get_or_build_artifact(('a', 2), lambda: b'v2', cache=cache) == b'v2'
+
+    def test_evicts_least_recently_used_by_entries(self):
+        """Testa descarte do relatório usado há mais tempo"""
+        cache = OrderedDict()
+
+        get_or_build_artifact(('a',), lambda: b'a', cache=cache, max_entries=2)
+        get_or_build_artifact(('b',), lambda: b'b', cache=cache, max_entries=2)
+        get_or_build_artifact(('a',), lambda: b'a', cache=cache, max_entries=2)
+        get_or_build_artifact(('c',), lambda: b'c', cache=cache, max_entries=2)
+
+        assert list(cache) == [('a',), ('c',)]
+
+    def test_evicts_by_size_but_keeps_latest(self):
+        """Testa limite de tamanho mantendo sempre o último relatório"""
+        cache = OrderedDict()
+
+        get_or_build_artifact(('a',), lambda: b'x' * 10, cache=cache, max_bytes=15)
+        get_or_build_artifact(('b',), lambda: b'y' * 10, cache=cache, max_bytes=15)
+        get_or_build_artifact(('c',), lambda: b'z' * 20, cache=cache, max_bytes=15)
+
+        assert list(cache) == [('c',)]
+
+    def test_empty_result_not_cached(self):
+        """Testa que falha na geração (bytes vazios) não fica em cache"""
+        cache = OrderedDict()
+
+        assert get_or_build_artifact(('a',), lambda: b'', cache=cache) == b''
+        assert ('a',) not in cache
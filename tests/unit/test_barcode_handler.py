@@ -0,0 +1,56 @@
+import pytest
+import streamlit as st
+from app.services.barcode_handler import (
+    process_serial,
+    is_already_scanned,
+    add_scanned_item,
+    pop_scanned_item,
+    clear_scanned_items
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_session():
+    """Garante histórico vazio antes de cada teste"""
+    clear_scanned_items()
+    yield
+    clear_scanned_items()
+
+
+def test_duplicate_detected_by_serial_case_insensitive():
+    """Testa duplicidade pelo serial, ignorando capitalização e espaços"""
+    add_scanned_item({'serialnumber': 'JQHP813', 'found': True})
+    
+    assert is_already_scanned(' jqhp813 ') is True
+    assert is_already_scanned('OTHER') is False
+
+
+def test_duplicate_detected_by_patrimonio():
+    """Testa duplicidade pelo patrimônio do item lido"""
+    add_scanned_item({'serialnumber': 'JQHP813', 'found': True, 'ativo': 9856})
+    
+    valid, serial, message = process_serial('9856')
+    
+    assert valid is False
+    assert 'já foi verificado' in message
+
+
+def test_pop_removes_keys():
+    """Testa que remover o item libera nova leitura"""
+    add_scanned_item({'serialnumber': 'AAA111', 'ativo': 1.0})
+    add_scanned_item({'serialnumber': 'BBB222'})
+    
+    removed = pop_scanned_item(0)
+    
+    assert removed['serialnumber'] == 'BBB222'
+    assert is_already_scanned('BBB222') is False
+    assert is_already_scanned('AAA111') is True
+    assert st.session_state.scanned_items[0]['serialnumber'] == 'AAA111'
+
+
+def test_keys_rebuilt_from_existing_items():
+    """Testa reconstrução do conjunto a partir de histórico existente"""
+    st.session_state.scanned_items = [{'serialnumber': 'CCC333'}]
+    del st.session_state['scanned_keys']
+    
+    assert is_already_scanned('ccc333') is True
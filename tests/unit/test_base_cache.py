@@ -0,0 +1,104 @@
+"""
+Testes unitários para o cache Parquet das bases importadas.
+"""
+
+import os
+import pandas as pd
+from app.services import base_cache
+from app.services.base_cache import make_cache_key, load_cached_base, save_cached_base, evict_cache
+from app.services.comparator import normalize_state_series
+from app.utils.helpers import normalize_ativo_series
+
+
+def _sample_frames():
+    df = pd.DataFrame({
+        'serialnumber': ['ABC123', 'DEF456'],
+        'State': ['Ativo', 'Em estoque'],
+        'Ativo': normalize_ativo_series(pd.Series([12345, None])),
+    }, index=[0, 5])
+    df['State_normalized'] = normalize_state_series(df['State'])
+    df_removed = pd.DataFrame({'serialnumber': ['VM001'], 'State': ['Ativo']}, index=[3])
+    return df, df_removed
+
+
+class TestCacheKey:
+    """Testes para a chave do cache."""
+    
+    def test_same_content_same_key(self):
+        assert make_cache_key(b'abc', True) == make_cache_key(b'abc', True)
+    
+    def test_content_and_options_change_key(self):
+        assert make_cache_key(b'abc', True) != make_cache_key(b'abd', True)
+        assert make_cache_key(b'abc', True) != make_cache_key(b'abc', False)
+
+
+class TestCachedBase:
+    """Testes para salvar e carregar bases do cache."""
+    
+    def test_miss_returns_none(self, tmp_path):
+        assert load_cached_base('missing', cache_dir=str(tmp_path)) is None
+    
+    def test_round_trip_preserves_dtypes_and_index(self, tmp_path):
+        df, df_removed = _sample_frames()
+        
+        assert save_cached_base('key1', df, df_removed, cache_dir=str(tmp_path))
+        cached_df, cached_removed = load_cached_base('key1', cache_dir=str(tmp_path))
+        
+        pd.testing.assert_frame_equal(cached_df, df)
+        pd.testing.assert_frame_equal(cached_removed, df_removed)
+        assert isinstance(cached_df['State_normalized'].dtype, pd.CategoricalDtype)
+        assert str(cached_df['Ativo'].dtype) == 'Int64'
+    
+    def test_corrupted_entry_is_discarded(self, tmp_path):
+        df, df_removed = _sample_frames()
+        save_cached_base('key1', df, df_removed, cache_dir=str(tmp_path))
+        
+        with open(tmp_path / 'key1.included.parquet', 'wb') as f:
+            f.write(b'not parquet')
+        
+        assert load_cached_base('key1', cache_dir=str(tmp_path)) is None
+        assert not os.path.exists(tmp_path / 'key1.removed.parquet')
+    
+    def test_evicts_least_recently_used(self, tmp_path):
+        df, df_removed = _sample_frames()
+        save_cached_base('old', df, df_removed, cache_dir=str(tmp_path))
+        save_cached_base('new', df, df_removed, cache_dir=str(tmp_path))
+        
+        for part in ('included', 'removed'):
+            os.utime(tmp_path / f'old.{part}.parquet', (1, 1))
+        
+        entry_size = sum(
+            os.path.getsize(tmp_path / f'new.{part}.parquet') for part in ('included', 'removed')
+        )
+        evicted = evict_cache(str(tmp_path), max_bytes=entry_size)
+        
+        assert evicted == ['old']
+        assert load_cached_base('new', cache_dir=str(tmp_path)) is not None
+    
+    def test_each_save_writes_its_own_temp_file(self, tmp_path, monkeypatch):
+        """Gravações simultâneas da mesma chave não compartilham o temporário"""
+        df, df_removed = _sample_frames()
+        sources = []
+        real_replace = os.replace
+        
+        def recording_replace(src, dst):
+            sources.append(src)
+            real_replace(src, dst)
+        
+        monkeypatch.setattr(base_cache.os, 'replace', recording_replace)
+        save_cached_base('key1', df, df_removed, cache_dir=str(tmp_path))
+        save_cached_base('key1', df, df_removed, cache_dir=str(tmp_path))
+        
+        assert len(set(sources)) == 4
+        assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+    
+    def test_failed_save_leaves_no_temp_files(self, tmp_path, monkeypatch):
+        df, df_removed = _sample_frames()
+        
+        def broken_to_parquet(self, *args, **kwargs):
+            raise OSError("disco cheio")
+        
+        monkeypatch.setattr(pd.DataFrame, 'to_parquet', broken_to_parquet)
+        
+        assert save_cached_base('key1', df, df_removed, cache_dir=str(tmp_path)) is False
+        assert os.listdir(tmp_path) == []
@@ -0,0 +1,165 @@
+"""
+Testes unitários para a atualização incremental da base.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.base_refresh import diff_bases, apply_base_delta, refresh_scanned_items
+from app.services.comparator import build_lookup_index, compare_and_flag, normalize_state_series
+from app.utils.helpers import normalize_ativo_series
+
+
+def _base(rows):
+    df = pd.DataFrame(rows, columns=['Serialnumber', 'State', 'Name', 'lastuser', 'Ativo'])
+    df['Ativo'] = normalize_ativo_series(df['Ativo'])
+    df['State_normalized'] = normalize_state_series(df['State'])
+    return df
+
+
+@pytest.fixture
+def old_base():
+    return _base([
+        ['ABC123', 'stock', 'NB-1', 'u1', 100],
+        ['DEF456', 'active', 'NB-2', 'u2', 200],
+        ['GHI789', 'stock', 'NB-3', 'u3', 300],
+        ['DUP001', 'stock', 'NB-4', 'u4', None],
+        ['DUP001', 'broken', 'NB-5', 'u5', None],
+        ['JKL012', 'stock', 'NB-6', 'u6', 600],
+    ])
+
+
+@pytest.fixture
+def new_base():
+    return _base([
+        ['ABC123', 'stock', 'NB-1', 'u1', 100],       # igual
+        ['DEF456', 'stock', 'NB-2', 'u2', 200],       # estado corrigido
+        ['DUP001', 'stock', 'NB-4', 'u4', None],      # grupo duplicado perdeu uma linha
+        ['JKL012', 'stock', 'NB-6', 'u6', 600],
+        ['NEW001', 'active', 'NB-7', 'u7', 700],      # incluído
+    ])
+
+
+def _index_as_sets(index, database):
+    """Índice em termos de chave → conjunto de seriais (independe das posições)."""
+    serials = database['Serialnumber'].astype(str).str.upper().tolist()
+    result = {}
+    for field in ('serial', 'ativo'):
+        groups = {key: {serials[position]} for key, position in index[field].items()}
+        for key, positions in index[f'{field}_duplicates'].items():
+            groups[key] = {serials[p] for p in positions}
+            assert index[field][key] == min(positions)
+        result[field] = groups
+    return result
+
+
+class TestDiffBases:
+    """Testes para a comparação por serial."""
+    
+    def test_detects_added_removed_and_changed(self, old_base, new_base):
+        delta = diff_bases(old_base, new_base)
+        
+        assert delta['added'] == {'NEW001'}
+        assert delta['removed'] == {'GHI789'}
+        assert delta['changed'] == {'DEF456', 'DUP001'}
+    
+    def test_identical_bases_have_empty_delta(self, old_base):
+        delta = diff_bases(old_base, old_base.copy())
+        
+        assert delta == {'added': set(), 'removed': set(), 'changed': set()}
+
+
+class TestApplyBaseDelta:
+    """Testes para a aplicação do delta e correção do índice."""
+    
+    def test_updated_base_and_index_match_new_export(self, old_base, new_base):
+        index = build_lookup_index(old_base)
+        
+        updated = apply_base_delta(old_base, new_base, index, diff_bases(old_base, new_base))
+        
+        assert sorted(updated['Serialnumber'].str.upper()) == sorted(new_base['Serialnumber'].str.upper())
+        assert index == build_lookup_index(updated)
+        assert compare_and_flag('DEF456', updated, index)['state'] == 'stock'
+        assert compare_and_flag('700', updated, index)['serialnumber'] == 'NEW001'
+        assert compare_and_flag('GHI789', updated, index)['found'] is False
+        assert isinstance(updated['State_normalized'].dtype, pd.CategoricalDtype)
+    
+    def test_added_only_rows_enter_index(self, old_base):
+        new = pd.concat([old_base, _base([
+            ['NEW001', 'stock', 'NB-7', 'u7', 700],
+            ['NEW002', 'active', 'NB-8', 'u8', 800],
+        ])], ignore_index=True)
+        index = build_lookup_index(old_base)
+        
+        updated = apply_base_delta(old_base, new, index, diff_bases(old_base, new))
+        
+        assert index == build_lookup_index(updated)
+        assert compare_and_flag('NEW001', updated, index)['found'] is True
+        assert compare_and_flag('800', updated, index)['serialnumber'] == 'NEW002'
+    
+    def test_added_rows_beyond_holes_enter_index(self, old_base):
+        new = pd.concat([old_base.iloc[1:], _base([
+            ['NEW001', 'stock', 'NB-7', 'u7', 700],
+            ['NEW002', 'active', 'NB-8', 'u8', 800],
+        ])], ignore_index=True)
+        index = build_lookup_index(old_base)
+        
+        updated = apply_base_delta(old_base, new, index, diff_bases(old_base, new))
+        
+        assert _index_as_sets(index, updated) == _index_as_sets(build_lookup_index(updated), updated)
+        assert compare_and_flag('NEW002', updated, index)['found'] is True
+    
+    @pytest.mark.parametrize('seed', range(5))
+    def test_random_deltas_keep_index_consistent(self, seed):
+        rng = np.random.default_rng(seed)
+        
+        def random_base(serials):
+            return _base([
+                [serial, rng.choice(['stock', 'active']), f'NB-{serial}', 'u', rng.integers(0, 40)]
+                for serial in serials
+            ])
+        
+        old = random_base(rng.choice([f'S{i}' for i in range(60)], size=80))
+        new = random_base(rng.choice([f'S{i}' for i in range(30, 100)], size=rng.integers(20, 120)))
+        index = build_lookup_index(old)
+        
+        updated = apply_base_delta(old, new, index, diff_bases(old, new))
+        
+        assert _index_as_sets(index, updated) == _index_as_sets(build_lookup_index(updated), updated)
+        assert diff_bases(updated, new) == {'added': set(), 'removed': set(), 'changed': set()}
+
+
+class TestRefreshScannedItems:
+    """Testes para a reavaliação dos itens bipados."""
+    
+    def test_reevaluates_only_affected_items(self, old_base, new_base):
+        index = build_lookup_index(old_base)
+        scanned = [
+            {**compare_and_flag(serial, old_base, index), 'timestamp': f't{n}'}
+            for n, serial in enumerate(['DEF456', 'ABC123', 'NEW001'])
+        ]
+        delta = diff_bases(old_base, new_base)
+        updated = apply_base_delta(old_base, new_base, index, delta)
+        
+        items, reevaluated = refresh_scanned_items(scanned, updated, index, delta)
+        
+        assert reevaluated == 2
+        assert items[0]['state'] == 'stock'
+        assert items[0]['requires_adjustment'] is False
+        assert 'name' not in items[0]
+        assert items[1] is scanned[1]
+        assert items[2]['found'] is True
+        assert [item['timestamp'] for item in items] == ['t0', 't1', 't2']
+    
+    def test_not_found_scan_found_after_added_only_refresh(self, old_base):
+        new = pd.concat([old_base, _base([['NEW001', 'stock', 'NB-7', 'u7', 700]])], ignore_index=True)
+        index = build_lookup_index(old_base)
+        scanned = [{**compare_and_flag('NEW001', old_base, index), 'timestamp': 't0'}]
+        delta = diff_bases(old_base, new)
+        updated = apply_base_delta(old_base, new, index, delta)
+        
+        items, reevaluated = refresh_scanned_items(scanned, updated, index, delta)
+        
+        assert reevaluated == 1
+        assert items[0]['found'] is True
+        assert items[0]['state'] == 'stock'
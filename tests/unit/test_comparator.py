@@ -1,7 +1,14 @@
 
 import pytest
 import pandas as pd
-from app.services.comparator import find_equipment, compare_and_flag, get_adjustment_list
+from app.services.comparator import (
+    find_equipment,
+    compare_and_flag,
+    get_adjustment_list,
+    build_lookup_index,
+    compare_many,
+    get_duplicate_serials
+)
 from app.utils.constants import VALID_STATES, REQUIRES_ADJUSTMENT_STATE
 
 # Fixture local para testes do comparador
@@ -134,3 +141,139 @@ def test_compare_and_flag_by_patrimonio(database_with_patrimonio):
     assert result['state'] == 'active'
     assert result.get('ativo') == 1234
 
+
+
+# Testes para o índice de busca por serial
+def test_build_lookup_index_maps_normalized_serial_to_position(mock_database):
+    """Testa que o índice mapeia serial normalizado para a posição da linha"""
+    index = build_lookup_index(mock_database)
+    
+    assert index['serial']['ABC12345'] == 0
+    assert index['serial']['OLD11111'] == 3
+
+
+def test_build_lookup_index_keeps_first_duplicate():
+    """Testa que seriais repetidos mantêm a primeira ocorrência (como a busca antiga)"""
+    df = pd.DataFrame({
+        'Serialnumber': [' dup1 ', 'DUP1', None],
+        'State': ['stock', 'active', 'stock'],
+        'Name': ['A', 'B', 'C'],
+        'lastuser': ['u1', 'u2', 'u3']
+    })
+    index = build_lookup_index(df)
+    
+    assert index['serial'] == {'DUP1': 0}
+
+
+def test_compare_and_flag_with_prebuilt_index(mock_database):
+    """Testa comparação usando índice pré-construído"""
+    index = build_lookup_index(mock_database)
+    result = compare_and_flag('  xyz98765 ', mock_database, index)
+    
+    assert result['found'] is True
+    assert result['serialnumber'] == 'XYZ98765'
+    assert result['requires_adjustment'] is True
+
+
+def test_build_lookup_index_ativo_as_int(database_with_patrimonio):
+    """Testa que o índice de patrimônio usa chaves inteiras"""
+    index = build_lookup_index(database_with_patrimonio)
+    
+    assert index['ativo'] == {9856: 0, 1234: 1, 5678: 2}
+
+
+def test_find_equipment_by_patrimonio_with_nullable_ativo():
+    """Testa busca por patrimônio com coluna Ativo já convertida para Int64"""
+    df = pd.DataFrame({
+        'Serialnumber': ['AAA111', 'BBB222'],
+        'State': ['Stock', 'Active'],
+        'Name': ['NB-1', 'NB-2'],
+        'lastuser': ['u1', 'u2'],
+        'Ativo': pd.array([None, 4321], dtype='Int64')
+    })
+    result = find_equipment('4321.0', df, build_lookup_index(df))
+    
+    assert result is not None
+    assert result['serialnumber'] == 'BBB222'
+    assert result['ativo'] == 4321
+
+
+# Testes para comparação em lote
+def test_compare_many_matches_compare_and_flag(database_with_patrimonio):
+    """Testa que o lote retorna o mesmo resultado que chamadas individuais"""
+    serials = ['jqhp813', '1234', 'UNKNOWN', '5678.0']
+    
+    results = compare_many(serials, database_with_patrimonio)
+    expected = [compare_and_flag(s, database_with_patrimonio) for s in serials]
+    
+    assert results == expected
+
+
+@pytest.mark.parametrize('serial', ['INF', '-inf', '1E400', '123456789012345678901234', 'nan'])
+def test_compare_many_non_finite_or_huge_numbers_not_found(database_with_patrimonio, serial):
+    """Testa paridade com compare_and_flag para entradas numéricas inválidas como patrimônio"""
+    serials = [serial, '1234']
+    
+    results = compare_many(serials, database_with_patrimonio)
+    
+    assert results == [compare_and_flag(s, database_with_patrimonio) for s in serials]
+    assert results[0]['found'] is False
+
+
+def test_compare_many_preserves_input_order(mock_database):
+    """Testa que a ordem de entrada é preservada, incluindo não encontrados"""
+    results = compare_many(['OLD11111', 'NOPE', 'ABC12345'], mock_database, build_lookup_index(mock_database))
+    
+    assert [r['serialnumber'] for r in results] == ['OLD11111', 'NOPE', 'ABC12345']
+    assert [r['found'] for r in results] == [True, False, True]
+
+
+def test_compare_many_empty_inputs(mock_database):
+    """Testa lote vazio e base vazia"""
+    assert compare_many([], mock_database) == []
+    assert compare_many(['ABC'], pd.DataFrame())[0]['found'] is False
+
+
+# Testes para seriais duplicados
+@pytest.fixture
+def database_with_duplicates():
+    """Database com serial repetido (ex: notebook e dock com mesmo serial)"""
+    data = {
+        'Serialnumber': ['DUP001', 'UNI002', 'dup001 ', 'DUP001'],
+        'State': ['stock', 'stock', 'active', 'old'],
+        'Name': ['NB-01', 'NB-02', 'DOCK-01', 'NB-OLD'],
+        'lastuser': ['u1', 'u2', 'u3', 'u4'],
+        'Ativo': [100.0, 200.0, 300.0, None]
+    }
+    return pd.DataFrame(data)
+
+
+def test_build_lookup_index_groups_duplicates(database_with_duplicates):
+    """Testa que o índice guarda todas as posições dos seriais repetidos"""
+    index = build_lookup_index(database_with_duplicates)
+    
+    assert index['serial']['DUP001'] == 0
+    assert index['serial_duplicates'] == {'DUP001': (0, 2, 3)}
+    assert get_duplicate_serials(index) == {'DUP001': (0, 2, 3)}
+    assert index['ativo_duplicates'] == {}
+
+
+def test_compare_and_flag_returns_all_candidates(database_with_duplicates):
+    """Testa que todos os candidatos são retornados, mantendo o primeiro como principal"""
+    result = compare_and_flag('dup001', database_with_duplicates)
+    
+    assert result['found'] is True
+    assert result['state'] == 'stock'
+    assert [c['name'] for c in result['candidates']] == ['NB-01', 'DOCK-01', 'NB-OLD']
+    
+    unique = compare_and_flag('UNI002', database_with_duplicates)
+    assert 'candidates' not in unique
+
+
+def test_compare_many_returns_candidates(database_with_duplicates):
+    """Testa que o lote também devolve candidatos duplicados"""
+    serials = ['DUP001', 'UNI002', '300']
+    
+    assert compare_many(serials, database_with_duplicates) == [
+        compare_and_flag(s, database_with_duplicates) for s in serials
+    ]
@@ -192,3 +192,463 @@ class TestExportAdjustmentList:
         
         # Mesmo vazio, deve retornar bytes válidos ou vazio
         assert isinstance(result_bytes, bytes)
+
+
+class TestCompactDataframe:
+    """Testes para o modo compacto da base em memória."""
+    
+    def test_compact_keeps_only_used_columns(self, sample_dataframe):
+        """Testa que colunas não usadas pela aplicação são descartadas."""
+        from app.services.excel_handler import compact_dataframe
+        
+        compact = compact_dataframe(sample_dataframe)
+        
+        assert 'Asset' not in compact.columns
+        assert list(compact.columns) == ['Serialnumber', 'State', 'Name', 'lastuser', 'Model']
+        assert compact['Serialnumber'].tolist() == sample_dataframe['Serialnumber'].tolist()
+    
+    def test_compact_uses_categorical_for_repetitive_text(self):
+        """Testa conversão de colunas repetitivas para Categorical."""
+        from app.services.excel_handler import compact_dataframe
+        
+        df = pd.DataFrame({
+            'Serialnumber': [f'SN{i}' for i in range(10)],
+            'State': ['stock'] * 8 + ['active'] * 2,
+            'Name': [f'NB-{i}' for i in range(10)],
+            'lastuser': ['user'] * 10,
+            'Ativo': pd.array(range(10), dtype='Int64')
+        })
+        compact = compact_dataframe(df)
+        
+        assert isinstance(compact['State'].dtype, pd.CategoricalDtype)
+        assert isinstance(compact['lastuser'].dtype, pd.CategoricalDtype)
+        assert not isinstance(compact['Name'].dtype, pd.CategoricalDtype)
+        assert str(compact['Ativo'].dtype) == 'Int64'
+        assert compact.memory_usage(deep=True).sum() < df.memory_usage(deep=True).sum()
+
+    def test_memory_report_measures_frames_entering_compaction(self, tmp_path, monkeypatch):
+        """Testa que a economia reportada é só a da compactação."""
+        from app.services import excel_handler
+
+        path = tmp_path / "lansweeper.xlsx"
+        pd.DataFrame({
+            'Serialnumber': ['ABC123', 'DEF456', 'GHI789'],
+            'State': ['stock', 'active', 'stock'],
+            'Name': ['NB-1', 'NB-2', 'VM-3'],
+            'lastuser': ['u1', 'u2', 'u3'],
+            'Model': ['Latitude 5420', 'Latitude 5420', 'VMware Virtual Platform']
+        }).to_excel(path, index=False)
+        monkeypatch.setattr(excel_handler, 'compact_dataframe', lambda df: df)
+
+        report = {}
+        import_excel(str(path), compact=True, import_report=report, use_cache=False)
+
+        assert report['memory']['pre_compact_bytes'] == report['memory']['compact_bytes']
+        assert report['memory']['category_saved_bytes'] == 0
+
+    def test_memory_report_estimates_columns_dropped_at_read(self, tmp_path):
+        """Testa que a economia estimada inclui as colunas não lidas."""
+        path = tmp_path / "lansweeper.csv"
+        df = pd.DataFrame({
+            'Serialnumber': [f'SN{i}' for i in range(50)],
+            'State': ['stock'] * 50,
+            'Name': [f'NB-{i}' for i in range(50)],
+            'lastuser': ['u1'] * 50,
+            'Model': ['Latitude 5420'] * 50
+        })
+        for i in range(20):
+            df[f'Extra{i}'] = [f'valor extra {i}-{n}' for n in range(50)]
+        df.to_csv(path, index=False)
+
+        report = {}
+        import_excel(str(path), compact=True, import_report=report, use_cache=False)
+        memory = report['memory']
+
+        assert memory['source_columns'] == 25
+        assert memory['kept_columns'] == 6
+        assert memory['raw_bytes_estimate'] > 3 * memory['pre_compact_bytes']
+        assert memory['saved_bytes_estimate'] == memory['raw_bytes_estimate'] - memory['compact_bytes']
+        assert memory['saved_bytes_estimate'] > memory['category_saved_bytes']
+
+
+class TestReadExcelColumns:
+    """Testes para a leitura em streaming com projeção de colunas."""
+    
+    def test_reads_only_requested_columns(self, tmp_path):
+        """Testa que apenas as colunas pedidas são materializadas."""
+        from app.services.excel_handler import read_excel_columns
+        
+        df = pd.DataFrame({
+            'Extra1': ['x', 'y'],
+            'Serialnumber': ['ABC123', 'DEF456'],
+            'Extra2': [1, 2],
+            'Ativo': [9856.0, None],
+            'State': ['stock', 'active']
+        })
+        path = tmp_path / "wide.xlsx"
+        df.to_excel(path, index=False)
+        
+        result = read_excel_columns(str(path), ['Serialnumber', 'State', 'Ativo', 'Missing'])
+        
+        assert list(result.columns) == ['Serialnumber', 'Ativo', 'State']
+        assert result['Serialnumber'].tolist() == ['ABC123', 'DEF456']
+        assert result['Ativo'].iloc[0] == 9856
+        assert pd.isna(result['Ativo'].iloc[1])
+    
+    def test_import_excel_compact_uses_projection(self, tmp_path):
+        """Testa importação compacta descartando colunas extras."""
+        df = pd.DataFrame({
+            'Serialnumber': ['ABC123', 'DEF456'],
+            'State': ['stock', 'active'],
+            'Name': ['NB-1', 'NB-2'],
+            'lastuser': ['u1', 'u2'],
+            'Model': ['Latitude 5420', 'OptiPlex 7040'],
+            'Asset': ['a', 'b']
+        })
+        path = tmp_path / "lansweeper.xlsx"
+        df.to_excel(path, index=False)
+        
+        df_notebooks, df_removed = import_excel(str(path), compact=True)
+        
+        assert len(df_notebooks) == 2
+        assert 'Asset' not in df_notebooks.columns
+    
+    def test_import_excel_compact_keeps_filter_reasons(self, tmp_path):
+        """Testa que o modo compacto mantém o motivo de cada removido."""
+        path = tmp_path / "lansweeper.xlsx"
+        pd.DataFrame({
+            'Serialnumber': ['ABC123', 'DEF456', 'GHI789'],
+            'State': ['stock', 'active', 'stock'],
+            'Name': ['NB-1', 'VM-2', 'FW-3'],
+            'lastuser': ['u1', 'u2', 'u3'],
+            'Model': ['Latitude 5420', 'VMware Virtual Platform', 'ThinkPad X1'],
+            'Asset': ['a', 'b', 'c']
+        }).to_excel(path, index=False)
+        
+        df_notebooks, df_removed = import_excel(str(path), compact=True, use_cache=False)
+        
+        assert df_removed['Serialnumber'].tolist() == ['DEF456', 'GHI789']
+        assert df_removed['Filter_reason'].astype(str).tolist() == ['excluded_model', 'unrecognized_model']
+        assert 'Filter_reason' not in df_notebooks.columns
+
+
+class TestReadCsvColumns:
+    """Testes para a importação de exportações CSV."""
+    
+    @pytest.fixture
+    def lansweeper_df(self):
+        return pd.DataFrame({
+            'Serialnumber': ['0012345', 'DEF456', 'GHI789'],
+            'State': ['Estoque', 'active', 'stock'],
+            'Name': ['NB-1', 'NB-2', 'VM-3'],
+            'lastuser': ['u1', 'u2', 'u3'],
+            'Ativo': [9856.0, None, 12.0],
+            'Model': ['Latitude 5420', 'MacBook Pro', 'VMware Virtual Platform'],
+            'Asset': ['a', 'b', 'c']
+        })
+    
+    def test_detects_semicolon_and_projects_columns(self, tmp_path, lansweeper_df):
+        """Testa delimitador ';' e leitura apenas das colunas pedidas, como texto."""
+        from app.services.excel_handler import read_csv_columns
+        
+        path = tmp_path / "lansweeper.csv"
+        lansweeper_df.to_csv(path, sep=';', index=False)
+        
+        result = read_csv_columns(str(path), ['Serialnumber', 'State', 'Missing'])
+        
+        assert list(result.columns) == ['Serialnumber', 'State']
+        assert result['Serialnumber'].tolist() == ['0012345', 'DEF456', 'GHI789']
+    
+    def test_import_csv_gz_matches_excel(self, tmp_path, lansweeper_df):
+        """Testa que CSV gzip passa pela mesma validação e filtro que o Excel."""
+        csv_path = tmp_path / "lansweeper.csv.gz"
+        xlsx_path = tmp_path / "lansweeper.xlsx"
+        lansweeper_df.to_csv(csv_path, index=False)
+        lansweeper_df.astype({'Serialnumber': str}).to_excel(xlsx_path, index=False)
+        
+        csv_notebooks, csv_removed = import_excel(str(csv_path))
+        xlsx_notebooks, xlsx_removed = import_excel(str(xlsx_path))
+        
+        assert csv_notebooks['Serialnumber'].tolist() == xlsx_notebooks['Serialnumber'].tolist()
+        assert csv_notebooks['Ativo'].tolist() == xlsx_notebooks['Ativo'].tolist()
+        assert csv_removed['Serialnumber'].tolist() == ['GHI789']
+        assert csv_notebooks['State_normalized'].tolist() == ['stock', 'active']
+    
+    def test_import_csv_missing_required_column(self, tmp_path):
+        """Testa que CSV sem colunas obrigatórias é rejeitado."""
+        path = tmp_path / "invalid.csv"
+        pd.DataFrame({'Serialnumber': ['ABC123']}).to_csv(path, index=False)
+        
+        df_notebooks, df_removed = import_excel(str(path))
+        
+        assert df_notebooks is None
+        assert df_removed is None
+
+
+class TestReaderEngine:
+    """Testes para a seleção da engine de leitura."""
+    
+    @pytest.fixture
+    def installed(self, monkeypatch):
+        """Simula quais módulos de engine estão instalados."""
+        from app.services import excel_handler
+        
+        available = set()
+        monkeypatch.setattr(
+            excel_handler.importlib.util, 'find_spec',
+            lambda name: object() if name in available else None
+        )
+        return available
+    
+    def test_prefers_fastest_installed_engine(self, installed):
+        from app.services.excel_handler import select_excel_engine
+        
+        installed.update({'python_calamine', 'openpyxl'})
+        assert select_excel_engine('.xlsx', 'auto') == 'calamine'
+        
+        installed.discard('python_calamine')
+        assert select_excel_engine('.xlsx', 'auto') == 'openpyxl'
+    
+    def test_xls_requires_capable_engine(self, installed):
+        from app.services.excel_handler import select_excel_engine
+        
+        installed.add('openpyxl')
+        with pytest.raises(ValueError, match='xlrd'):
+            select_excel_engine('.xls', 'auto')
+        
+        installed.add('xlrd')
+        assert select_excel_engine('.xls', 'auto') == 'xlrd'
+    
+    def test_forced_engine(self, installed):
+        from app.services.excel_handler import select_excel_engine
+        
+        installed.update({'python_calamine', 'openpyxl'})
+        assert select_excel_engine('.xlsx', 'openpyxl') == 'openpyxl'
+        with pytest.raises(ValueError):
+            select_excel_engine('.xls', 'openpyxl')
+    
+    def test_import_reports_engine_and_parse_time(self, tmp_path):
+        df = pd.DataFrame({
+            'Serialnumber': ['ABC123'],
+            'State': ['stock'],
+            'Name': ['NB-1'],
+            'lastuser': ['u1'],
+            'Model': ['Latitude 5420']
+        })
+        path = tmp_path / "lansweeper.xlsx"
+        df.to_excel(path, index=False)
+        
+        report = {}
+        df_notebooks, _ = import_excel(str(path), import_report=report)
+        
+        assert len(df_notebooks) == 1
+        assert report['engine']
+        assert report['parse_seconds'] >= 0
+
+
+class TestFilterNotebooksOnly:
+    """Testes para o filtro de notebooks e os motivos de exclusão."""
+    
+    def test_keeps_notebooks_and_records_reasons(self):
+        from app.services.excel_handler import filter_notebooks_only
+        
+        df = pd.DataFrame({
+            'Serialnumber': ['A', 'B', 'C', 'D', 'E', 'F'],
+            'Model': ['Latitude 5420', 'VMware Virtual Platform', 'ThinkPad X1', 'ThinkPad T14', None, 'Latitude VM'],
+            'OS': ['Windows 11', 'Windows 11', 'Ubuntu', 'FortiOS', None, 'Windows 11'],
+            'Type': ['Windows', 'Windows', 'Linux', 'Router', None, 'Windows']
+        })
+        
+        df_notebooks, df_removed = filter_notebooks_only(df)
+        
+        assert df_notebooks['Serialnumber'].tolist() == ['A', 'C', 'E']
+        assert df_removed['Serialnumber'].tolist() == ['B', 'D', 'F']
+        assert df_removed['Filter_reason'].tolist() == [
+            'excluded_model', 'unrecognized_model', 'excluded_model'
+        ]
+        assert 'Filter_reason' not in df_notebooks.columns
+    
+    def test_without_os_and_type_uses_model_only(self):
+        from app.services.excel_handler import get_filter_reasons
+        
+        df = pd.DataFrame({'Model': ['MacBookPro18,1', 'ThinkPad X1', '']})
+        
+        reasons = get_filter_reasons(df)
+        
+        assert pd.isna(reasons.iloc[0])
+        assert reasons.iloc[1] == 'unrecognized_model'
+        assert pd.isna(reasons.iloc[2])
+    
+    @pytest.mark.parametrize('column, values', [
+        ('OS', ['FortiOS', 'Windows 11', '', 'Windows 11']),
+        ('Type', ['Router', 'Windows', '', 'Windows']),
+    ])
+    def test_single_os_or_type_column_keeps_all_not_excluded(self, column, values):
+        """Com só OS ou só Type, a coluna ausente conta como válida"""
+        from app.services.excel_handler import filter_notebooks_only
+        
+        df = pd.DataFrame({
+            'Model': ['Lenovo T14', 'Latitude 5400', '', 'VMware Virtual Platform'],
+            column: values
+        })
+        
+        df_notebooks, df_removed = filter_notebooks_only(df)
+        
+        assert df_notebooks['Model'].tolist() == ['Lenovo T14', 'Latitude 5400', '']
+        assert df_removed['Filter_reason'].tolist() == ['excluded_model']
+
+
+class TestExportScannedHistory:
+    """Testes para a exportação do histórico de verificação."""
+    
+    def test_ativo_written_as_integer_cells(self):
+        from io import BytesIO
+        from openpyxl import load_workbook
+        from app.services.excel_handler import export_scanned_history
+        
+        history = [
+            {'timestamp': '2026-01-08T10:00:00', 'serialnumber': 'ABC123', 'ativo': 9856.0,
+             'candidates': ({'serialnumber': 'ABC123'},)},
+            {'timestamp': '2026-01-08T10:01:00', 'serialnumber': 'DEF456', 'ativo': None},
+            {'timestamp': '2026-01-08T10:02:00', 'serialnumber': 'GHI789', 'ativo': '-'},
+        ]
+        
+        ws = load_workbook(BytesIO(export_scanned_history(history))).active
+        header = [cell.value for cell in ws[1]]
+        ativo = [row[header.index('ativo')] for row in ws.iter_rows(min_row=2, values_only=True)]
+        
+        assert header[0] == 'timestamp'
+        assert 'candidates' not in header
+        assert ativo == [9856, None, None]
+        assert isinstance(ativo[0], int)
+        assert ws.cell(row=2, column=header.index('ativo') + 1).number_format == '0'
+    
+    def test_timestamp_written_as_datetime(self):
+        from io import BytesIO
+        from datetime import datetime
+        from zoneinfo import ZoneInfo
+        from openpyxl import load_workbook
+        from app.services.excel_handler import export_scanned_history
+        
+        scanned_at = datetime(2026, 1, 8, 10, 30, 15, 123456, tzinfo=ZoneInfo("America/Sao_Paulo"))
+        history = [
+            {'timestamp': scanned_at, 'serialnumber': 'ABC123', 'found': True},
+            {'serialnumber': 'DEF456', 'found': False, 'timestamp': '2026-01-08T11:00:00-03:00',
+             'name': float('nan')},
+        ]
+        
+        ws = load_workbook(BytesIO(export_scanned_history(history))).active
+        rows = list(ws.iter_rows(values_only=True))
+        
+        assert rows[0] == ('timestamp', 'serialnumber', 'found', 'name')
+        assert rows[1] == (datetime(2026, 1, 8, 10, 30, 15), 'ABC123', True, None)
+        assert rows[2] == (datetime(2026, 1, 8, 11, 0, 0), 'DEF456', False, None)
+        assert ws['A2'].number_format == 'yyyy-mm-dd hh:mm:ss'
+
+
+class TestImportFromBuffer:
+    """Testes para importação direta do buffer em memória do upload."""
+    
+    @staticmethod
+    def _named_buffer(data: bytes, name: str):
+        from io import BytesIO
+        
+        buffer = BytesIO(data)
+        buffer.name = name
+        return buffer
+    
+    @pytest.fixture
+    def lansweeper_df(self):
+        return pd.DataFrame({
+            'Serialnumber': ['ABC123', 'DEF456'],
+            'State': ['stock', 'active'],
+            'Name': ['NB-1', 'VM-2'],
+            'lastuser': ['u1', 'u2'],
+            'Ativo': [9856, None],
+            'Model': ['Latitude 5420', 'VMware Virtual Platform']
+        })
+    
+    @pytest.mark.parametrize('name', ['lansweeper.xlsx', 'lansweeper.csv', 'lansweeper.csv.gz'])
+    def test_import_matches_file_on_disk(self, tmp_path, lansweeper_df, name):
+        path = tmp_path / name
+        if name.endswith('.xlsx'):
+            lansweeper_df.to_excel(path, index=False)
+        else:
+            lansweeper_df.to_csv(path, index=False)
+        
+        buffer = self._named_buffer(path.read_bytes(), name)
+        buffer.seek(10)  # Leitura não depende da posição atual do buffer
+        
+        from_buffer, removed_buffer = import_excel(buffer, use_cache=False)
+        from_disk, removed_disk = import_excel(str(path), use_cache=False)
+        
+        pd.testing.assert_frame_equal(from_buffer, from_disk)
+        pd.testing.assert_frame_equal(removed_buffer, removed_disk)
+        assert from_buffer['Serialnumber'].tolist() == ['ABC123']
+    
+    def test_buffer_cache_key_matches_bytes(self, tmp_path, lansweeper_df):
+        from app.services.base_cache import make_cache_key
+        
+        path = tmp_path / 'lansweeper.xlsx'
+        lansweeper_df.to_excel(path, index=False)
+        data = path.read_bytes()
+        
+        buffer = self._named_buffer(data, 'lansweeper.xlsx')
+        
+        assert make_cache_key(buffer, True) == make_cache_key(data, True)
+        assert make_cache_key(str(path), True) == make_cache_key(data, True)
+        
+        report = {}
+        import_excel(buffer, import_report=report)
+        import_excel(self._named_buffer(data, 'copia.xlsx'), import_report=report)
+        assert report['cache'] == 'hit'
+
+
+class TestParallelPrepare:
+    """Testes para o processamento em blocos da importação."""
+    
+    def test_parallel_matches_serial(self):
+        from app.services.excel_handler import prepare_import_frame, prepare_import_frame_parallel
+        
+        df = pd.DataFrame({
+            'Serialnumber': [f'SN{i}' for i in range(9)],
+            'State': ['Estoque', 'active', 'Em uso'] * 3,
+            'Name': [f'NB-{i}' for i in range(9)],
+            'lastuser': ['u'] * 9,
+            'Ativo': ['100', '200.0', None] * 3,
+            'Model': ['Latitude 5420', 'VMware Virtual Platform', 'ThinkPad'] * 3,
+            'OS': ['Windows 11', 'Windows 11', 'FortiOS'] * 3
+        }, index=range(10, 19))
+        
+        serial_notebooks, serial_removed = prepare_import_frame(df)
+        parallel_notebooks, parallel_removed = prepare_import_frame_parallel(df, workers=3)
+        
+        pd.testing.assert_frame_equal(parallel_notebooks, serial_notebooks)
+        pd.testing.assert_frame_equal(parallel_removed, serial_removed)
+        assert isinstance(parallel_notebooks['State_normalized'].dtype, pd.CategoricalDtype)
+    
+    def test_pool_does_not_fork(self, monkeypatch):
+        """Testa que o pool não usa fork (servidor do Streamlit tem várias threads)."""
+        from concurrent.futures import ProcessPoolExecutor
+        from app.services import excel_handler
+        
+        contexts = []
+        
+        def recording_pool(*args, **kwargs):
+            contexts.append(kwargs.get('mp_context'))
+            return ProcessPoolExecutor(*args, **kwargs)
+        
+        monkeypatch.setattr(excel_handler, 'ProcessPoolExecutor', recording_pool)
+        df = pd.DataFrame({
+            'Serialnumber': ['A', 'B'],
+            'State': ['stock', 'active'],
+            'Name': ['NB-1', 'NB-2'],
+            'lastuser': ['u1', 'u2'],
+            'Model': ['Latitude 5420', 'Latitude 5420']
+        })
+        
+        df_notebooks, _ = excel_handler.prepare_import_frame_parallel(df, workers=2)
+        
+        assert len(df_notebooks) == 2
+        assert contexts[0] is not None
+        assert contexts[0].get_start_method() != 'fork'
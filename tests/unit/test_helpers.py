@@ -0,0 +1,56 @@
+"""
+Testes unitários para funções auxiliares.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import datetime
+from app.utils.helpers import sanitize_excel_value, sanitize_excel_series, normalize_ativo_series
+
+
+class TestSanitizeExcelSeries:
+    """Testes para a sanitização vetorizada de colunas exportadas."""
+    
+    @pytest.mark.parametrize('values', [
+        pd.Series(['=CMD|"/c calc"!A1', '+2+2', '-10', '@SUM(A1:A10)', 'ABC123', '', None]),
+        pd.Series(['=a', 'b', None], dtype='category'),
+        pd.Series([-1.5, 0.1, 9856.0, np.nan]),
+        pd.Series([-3, 4]),
+        pd.Series([True, False]),
+        pd.Series(['=x', -1, 2.5, None, datetime(2026, 1, 8), True], dtype=object),
+        pd.Series(pd.to_datetime(['2026-01-08', '2026-01-09'])),
+        pd.Series([], dtype=object),
+    ])
+    def test_matches_scalar_sanitizer(self, values):
+        expected = [sanitize_excel_value(str(x)) if pd.notna(x) else '' for x in values.tolist()]
+        
+        assert sanitize_excel_series(values).tolist() == expected
+    
+    def test_keeps_index(self):
+        values = pd.Series(['=1', 'ok'], index=[7, 3])
+        
+        result = sanitize_excel_series(values)
+        
+        assert result.index.tolist() == [7, 3]
+        assert result.tolist() == ["'=1", 'ok']
+
+
+class TestNormalizeAtivoSeries:
+    """Testes para a conversão vetorizada do patrimônio."""
+    
+    def test_floats_truncated_and_invalid_as_na(self):
+        """Testa truncamento de floats e não numéricos como <NA>"""
+        result = normalize_ativo_series(pd.Series(['9856.0', 9856.7, -3, 'abc', None]))
+        
+        assert str(result.dtype) == 'Int64'
+        assert result.tolist()[:3] == [9856, 9856, -3]
+        assert result.isna().tolist() == [False, False, False, True, True]
+    
+    @pytest.mark.parametrize('value', ['INF', '-inf', '1E400', '123456789012345678901234', 2.0**63])
+    def test_non_finite_and_out_of_range_as_na(self, value):
+        """Testa que infinitos e valores fora do int64 não derrubam a conversão"""
+        result = normalize_ativo_series(pd.Series([value, '42']))
+        
+        assert result.isna().tolist() == [True, False]
+        assert result.iloc[1] == 42
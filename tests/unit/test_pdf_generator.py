@@ -0,0 +1,137 @@
+import pandas as pd
+from datetime import datetime
+from reportlab.platypus import LongTable
+from app.services.pdf_generator import (
+    CONCILIATION_COLUMNS,
+    ITEMS_TABLE_STYLE,
+    PagedTable,
+    _frame_rows,
+    _get_styles,
+    _session_item_rows,
+    generate_conciliation_pdf,
+    generate_session_report_pdf
+)
+
+
+class TestPagedTable:
+    """Testes da divisão do detalhamento por página"""
+
+    def split_all(self, table, avail_height):
+        """Divide a tabela como o ReportLab faria, página a página"""
+        pages = []
+        while True:
+            _, height = table.wrap(500, avail_height)
+            if height <= avail_height:
+                return pages, table
+            first, table = table.split(500, avail_height)
+            pages.append(first)
+
+    def test_pages_have_header_and_keep_all_rows(self):
+        """Testa LongTables com cabeçalho, do tamanho da página, sem perder linhas"""
+        rows = [[str(i)] for i in range(100)]
+        table = PagedTable(['Serial'], rows, col_widths=[100], style=ITEMS_TABLE_STYLE)
+
+        pages, rest = self.split_all(table, avail_height=300)
+
+        assert len(pages) > 1
+        assert all(isinstance(page, LongTable) and page.repeatRows == 1 for page in pages)
+        assert all(page._cellvalues[0] == ['Serial'] for page in pages)
+        for page in pages:
+            _, height = page.wrap(500, 300)
+            assert height <= 300
+        assert [row for page in pages for row in page._cellvalues[1:]] + rows[rest.start:] == rows
+
+    def test_rows_of_mixed_height_fit_each_page(self):
+        """Testa linhas mais altas (texto com quebra de linha) após a primeira"""
+        rows = [[f'{i}\nlinha 2\nlinha 3' if i % 7 == 3 else str(i)] for i in range(100)]
+        table = PagedTable(['Serial'], rows, col_widths=[100], style=ITEMS_TABLE_STYLE)
+
+        pages, rest = self.split_all(table, avail_height=300)
+
+        for page in pages:
+            _, height = page.wrap(500, 300)
+            assert height <= 300
+        assert [row for page in pages for row in page._cellvalues[1:]] + rows[rest.start:] == rows
+
+    def test_split_never_passes_the_last_row(self):
+        """Testa que o fim da fatia é limitado ao total de linhas"""
+        table = PagedTable(['Serial'], [['A'], ['B']], col_widths=[100], style=ITEMS_TABLE_STYLE)
+
+        first, rest = table.split(500, 1000)
+
+        assert first._cellvalues[1:] == [['A'], ['B']]
+        assert rest.start == 2
+
+    def test_no_room_for_a_row_moves_to_next_page(self):
+        """Testa que sem espaço para cabeçalho e uma linha nada é desenhado"""
+        table = PagedTable(['Serial'], [['A'], ['B']], col_widths=[100], style=ITEMS_TABLE_STYLE)
+
+        assert table.split(500, 5) == []
+
+
+class TestRowExtraction:
+    """Testes da extração das linhas"""
+
+    def test_frame_rows_truncate_and_fill_missing(self):
+        """Testa limite de caracteres, ausentes e colunas inexistentes como 'N/A'"""
+        df = pd.DataFrame({
+            'Serialnumber': ['A' * 30, 'B1'],
+            'Model': ['Latitude 5440', None],
+            'Name': ['HOST-1', 'HOST-2']
+        })
+
+        rows = _frame_rows(df, CONCILIATION_COLUMNS)
+
+        assert rows == [
+            ['A' * 20, 'Latitude 5440', 'HOST-1', 'N/A'],
+            ['B1', 'N/A', 'HOST-2', 'N/A']
+        ]
+
+    def test_session_item_rows(self):
+        """Testa formatação das colunas do detalhamento da sessão"""
+        items = [
+            {'serialnumber': 'JQHP813', 'state': 'Stock', 'name': 'HOST', 'lastuser': 'ana', 'timestamp': '2024-05-01T10:20:30Z'},
+            {'serialnumber': 'XYZ', 'timestamp': 'invalid'}
+        ]
+
+        assert _session_item_rows(items) == [
+            ['JQHP813', 'STOCK', 'HOST', 'ana', '10:20:30'],
+            ['XYZ', 'N/A', 'N/A', 'N/A', 'N/A']
+        ]
+
+
+class TestGeneratePdf:
+    """Testes da geração dos PDFs"""
+
+    def test_styles_reused_between_calls(self):
+        """Testa que os estilos são criados uma única vez"""
+        assert _get_styles() is _get_styles()
+
+    def test_session_report_with_many_items(self):
+        """Testa relatório com várias páginas de itens"""
+        items = [
+            {'serialnumber': f'SN{i:05d}', 'state': 'Stock', 'timestamp': '2024-05-01T10:00:00'}
+            for i in range(200)
+        ]
+
+        pdf = generate_session_report_pdf({'session_id': 's1', 'timestamp': datetime(2024, 5, 1)}, items, pd.DataFrame())
+
+        assert pdf.startswith(b'%PDF')
+
+    def test_conciliation_report(self):
+        """Testa relatório de conciliação com itens faltantes"""
+        missing = pd.DataFrame({'Serialnumber': [f'SN{i}' for i in range(120)], 'Model': ['Latitude'] * 120})
+
+        pdf = generate_conciliation_pdf({'session_id': 's1', 'timestamp': datetime(2024, 5, 1)}, missing)
+
+        assert pdf.startswith(b'%PDF')
+
+    def test_conciliation_report_with_multiline_cells(self):
+        """Testa células com quebra de linha no meio do detalhamento"""
+        models = ['Latitude'] * 120
+        models[50] = 'Latitude\n5440\nrev. A'
+        missing = pd.DataFrame({'Serialnumber': [f'SN{i}' for i in range(120)], 'Model': models})
+
+        pdf = generate_conciliation_pdf({'session_id': 's1', 'timestamp': datetime(2024, 5, 1)}, missing)
+
+        assert pdf.startswith(b'%PDF')
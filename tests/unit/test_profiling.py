@@ -0,0 +1,111 @@
+"""
+Testes unitários para a medição por etapa da importação.
+"""
+
+import json
+import pandas as pd
+import pytest
+from app.utils import profiling
+from app.utils.profiling import measure_stage, trace_memory, log_stage_report
+from app.services.excel_handler import import_excel
+
+
+class TestMeasureStage:
+    """Testes para o context manager de medição."""
+    
+    def test_records_time_rows_and_memory(self):
+        stages = []
+        
+        with measure_stage(stages, 'filter', rows_in=10) as stage:
+            stage['rows_out'] = 4
+        
+        assert stages[0]['stage'] == 'filter'
+        assert stages[0]['rows_in'] == 10
+        assert stages[0]['rows_out'] == 4
+        assert stages[0]['seconds'] >= 0
+        assert 'peak_traced_bytes' not in stages[0]
+        assert 'peak_rss_bytes' not in stages[0]
+    
+    def test_records_current_rss_before_and_after(self, monkeypatch):
+        readings = iter([100, 40])
+        monkeypatch.setattr(profiling, 'get_current_rss_bytes', lambda: next(readings))
+        stages = []
+        
+        with measure_stage(stages, 'filter'):
+            pass
+        
+        assert stages[0]['rss_before_bytes'] == 100
+        assert stages[0]['rss_after_bytes'] == 40
+        assert stages[0]['rss_delta_bytes'] == -60
+    
+    def test_rss_unavailable_on_platform(self, monkeypatch):
+        monkeypatch.setattr(profiling, '_STATM_PATH', '/nonexistent/statm')
+        stages = []
+        
+        with measure_stage(stages, 'filter'):
+            pass
+        
+        assert profiling.get_current_rss_bytes() is None
+        assert stages[0]['rss_delta_bytes'] is None
+    
+    def test_records_stage_even_on_error(self):
+        stages = []
+        
+        with pytest.raises(ValueError):
+            with measure_stage(stages, 'validate'):
+                raise ValueError("estrutura inválida")
+        
+        assert [stage['stage'] for stage in stages] == ['validate']
+    
+    def test_traced_peak_when_memory_tracing_enabled(self):
+        stages = []
+        
+        with trace_memory(enabled=True):
+            with measure_stage(stages, 'alloc'):
+                data = bytearray(2 * 1024 * 1024)
+            del data
+        
+        assert stages[0]['peak_traced_bytes'] >= 2 * 1024 * 1024
+
+
+class TestStageReport:
+    """Testes para o relatório da importação."""
+    
+    def test_import_reports_each_stage(self, tmp_path):
+        path = tmp_path / "lansweeper.xlsx"
+        pd.DataFrame({
+            'Serialnumber': ['ABC123', 'DEF456'],
+            'State': ['stock', 'active'],
+            'Name': ['NB-1', 'VM-2'],
+            'lastuser': ['u1', 'u2'],
+            'Ativo': [9856, None],
+            'Model': ['Latitude 5420', 'VMware Virtual Platform']
+        }).to_excel(path, index=False)
+        
+        report = {}
+        import_excel(str(path), import_report=report)
+        
+        stages = {stage['stage']: stage for stage in report['stages']}
+        assert list(stages) == [
+            'cache_lookup', 'read', 'validate', 'ativo', 'state', 'filter', 'compact', 'cache_save'
+        ]
+        assert stages['read']['rows_out'] == 2
+        assert stages['filter']['rows_in'] == 2
+        assert stages['filter']['rows_out'] == 1
+    
+    def test_log_line_is_json(self, monkeypatch):
+        messages = []
+        monkeypatch.setattr(profiling.logger, 'info', lambda fmt, *args: messages.append(fmt % args))
+        monkeypatch.setattr(profiling, 'get_peak_rss_bytes', lambda: 2048)
+        stages = [{'stage': 'read', 'seconds': 0.5, 'rows_in': None, 'rows_out': 10}]
+        
+        log_stage_report(stages, file='base.xlsx')
+        
+        prefix, payload = messages[0].split(' ', 1)
+        assert prefix == profiling.STAGE_REPORT_LOG_PREFIX
+        assert json.loads(payload) == {
+            'file': 'base.xlsx',
+            'total_seconds': 0.5,
+            'process_peak_rss_bytes': 2048,
+            'stages': stages
+        }
@@ -0,0 +1,148 @@
+import threading
+import pytest
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from app.services.artifact_cache import get_artifact_key
+from app.services.barcode_handler import clear_scanned_items
+from app.services.report_jobs import (
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_DONE,
+    JOB_FAILED,
+    submit_report_job,
+    get_report_job,
+    get_job_status,
+    get_job_error,
+    collect_report_job,
+    request_report
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_session():
+    """Garante histórico vazio antes de cada teste"""
+    clear_scanned_items()
+    yield
+    clear_scanned_items()
+
+
+@pytest.fixture
+def executor():
+    """Pool dedicado ao teste"""
+    pool = ThreadPoolExecutor(max_workers=1)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def wait(job):
+    """Aguarda o job terminar (sem propagar o erro)"""
+    job['future'].exception(timeout=5)
+    return job
+
+
+class TestSubmitReportJob:
+    """Testes do agendamento de relatórios"""
+
+    def test_job_runs_in_background_and_collects_bytes(self, executor):
+        """Testa status em andamento e coleta dos bytes ao concluir"""
+        jobs, cache = {}, OrderedDict()
+        release = threading.Event()
+
+        def build():
+            release.wait(timeout=5)
+            return b'pdf'
+
+        job = submit_report_job('session_pdf', ('k', 1), build, jobs=jobs, executor=executor)
+
+        assert get_job_status(job) != JOB_DONE
+        assert collect_report_job(job, cache) is None
+
+        release.set()
+        wait(job)
+
+        assert get_job_status(job) == JOB_DONE
+        assert collect_report_job(job, cache) == b'pdf'
+        assert cache[('k', 1)] == b'pdf'
+
+    def test_same_key_reuses_job(self, executor):
+        """Testa que reruns não geram o mesmo relatório de novo"""
+        jobs = {}
+        calls = []
+
+        def build():
+            calls.append(1)
+            return b'x'
+
+        first = submit_report_job('r', ('k', 1), build, jobs=jobs, executor=executor)
+        second = submit_report_job('r', ('k', 1), build, jobs=jobs, executor=executor)
+        wait(first)
+
+        assert first is second
+        assert len(calls) == 1
+
+    def test_new_key_replaces_job(self, executor):
+        """Testa que nova chave substitui o job do relatório"""
+        jobs = {}
+
+        submit_report_job('r', ('k', 1), lambda: b'v1', jobs=jobs, executor=executor)
+        job = wait(submit_report_job('r', ('k', 2), lambda: b'v2', jobs=jobs, executor=executor))
+
+        assert get_report_job('r', jobs) is job
+        assert job['future'].result() == b'v2'
+
+    def test_failure_is_reported_and_retried_on_demand(self, executor):
+        """Testa erro exposto, sem repetir a cada rerun, e nova tentativa"""
+        jobs = {}
+
+        def broken():
+            raise RuntimeError("falhou")
+
+        job = wait(submit_report_job('r', ('k',), broken, jobs=jobs, executor=executor))
+
+        assert get_job_status(job) == JOB_FAILED
+        assert get_job_error(job) == "falhou"
+        assert submit_report_job('r', ('k',), broken, jobs=jobs, executor=executor) is job
+
+        retried = wait(submit_report_job('r', ('k',), lambda: b'ok', jobs=jobs, executor=executor, retry=True))
+
+        assert get_job_status(retried) == JOB_DONE
+
+    def test_empty_result_is_failure(self, executor):
+        """Testa que bytes vazios (falha tratada no gerador) contam como falha"""
+        job = wait(submit_report_job('r', ('k',), lambda: b'', jobs={}, executor=executor))
+
+        assert get_job_status(job) == JOB_FAILED
+        assert get_job_error(job) is not None
+
+
+class TestRequestReport:
+    """Testes do relatório do estado atual da sessão"""
+
+    def test_cached_report_returned_without_job(self):
+        """Testa que relatório em cache não agenda geração"""
+        jobs = {}
+        cache = OrderedDict({get_artifact_key('history_xlsx'): b'cached'})
+
+        status, data = request_report('history_xlsx', lambda: b'new', jobs=jobs, cache=cache)
+
+        assert (status, data) == (JOB_DONE, b'cached')
+        assert jobs == {}
+
+    def test_report_available_after_job_finishes(self):
+        """Testa andamento na primeira chamada e bytes quando pronto"""
+        jobs, cache = {}, OrderedDict()
+        release = threading.Event()
+
+        def build():
+            release.wait(timeout=5)
+            return b'xlsx'
+
+        status, data = request_report('history_xlsx', build, jobs=jobs, cache=cache)
+
+        assert data is None
+        assert status in (JOB_QUEUED, JOB_RUNNING)
+
+        release.set()
+        wait(get_report_job('history_xlsx', jobs))
+
+        assert request_report('history_xlsx', build, jobs=jobs, cache=cache) == (JOB_DONE, b'xlsx')
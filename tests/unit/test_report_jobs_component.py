@@ -0,0 +1,80 @@
+"""
+Testes do acompanhamento dos relatórios em segundo plano.
+
+O script roda no AppTest do Streamlit; render_job_progress (o fragmento
+atualizado periodicamente) é envolvido para contar quantas vezes é renderizado.
+"""
+
+import threading
+from streamlit.testing.v1 import AppTest
+from app.components.report_jobs_component import STATUS_LABELS
+
+
+def _download_script():
+    import streamlit as st
+    from app.components import report_jobs_component
+
+    progress = report_jobs_component.render_job_progress
+
+    def counted_progress(job):
+        st.session_state.progress_calls += 1
+        progress(job)
+
+    report_jobs_component.render_job_progress = counted_progress
+    try:
+        release = st.session_state.release
+        report_jobs_component.render_report_download(
+            'test_report',
+            lambda: b'pdf' if release.wait(timeout=5) else b'',
+            (),
+            label="Baixar",
+            file_name="relatorio.pdf",
+            mime="application/pdf",
+            key="btn_test_report"
+        )
+    finally:
+        report_jobs_component.render_job_progress = progress
+
+
+class TestRenderReportDownload:
+    """Testes do polling apenas enquanto o relatório é gerado"""
+
+    def _app(self):
+        at = AppTest.from_function(_download_script, default_timeout=30)
+        at.session_state.release = threading.Event()
+        at.session_state.progress_calls = 0
+        return at
+
+    def _wait_job(self, at):
+        at.session_state.report_jobs['test_report']['future'].result(timeout=5)
+
+    def test_pending_job_shows_progress_without_download(self):
+        """Testa que o andamento (com polling) aparece enquanto o job não termina"""
+        at = self._app()
+        at.run()
+        at.session_state.release.set()
+        self._wait_job(at)
+
+        assert not at.exception
+        assert at.session_state.progress_calls == 1
+        assert len(at.get('download_button')) == 0
+        assert at.caption[0].value.split(' (')[0] in STATUS_LABELS.values()
+
+    def test_finished_job_shows_static_download(self):
+        """Testa que, pronto o relatório, o polling deixa de ser renderizado"""
+        at = self._app()
+        at.session_state.release.set()
+        at.run()
+        self._wait_job(at)
+
+        at.run()
+
+        assert not at.exception
+        assert len(at.get('download_button')) == 1
+        assert len(at.caption) == 0
+        calls = at.session_state.progress_calls
+
+        at.run()
+
+        assert at.session_state.progress_calls == calls
+        assert len(at.get('download_button')) == 1
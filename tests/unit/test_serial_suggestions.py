@@ -0,0 +1,91 @@
+import pytest
+import pandas as pd
+from app.services.serial_suggestions import (
+    build_suggestion_index,
+    suggest_similar_serials,
+    build_prefix_index,
+    search_prefix
+)
+
+
+@pytest.fixture
+def database():
+    data = {
+        'Serialnumber': ['JQHP813', 'ABC12345', 'XYZ98765', 'BOOK001'],
+        'State': ['stock', 'active', 'broken', 'old'],
+        'Name': ['NB-01', 'NB-02', 'NB-03', 'NB-04'],
+        'lastuser': ['u1', 'u2', 'u3', 'u4']
+    }
+    return pd.DataFrame(data)
+
+
+@pytest.fixture
+def index(database):
+    return build_suggestion_index(database)
+
+
+def _serials(suggestions):
+    return [s['serialnumber'] for s in suggestions]
+
+
+def test_suggests_confusable_character(database, index):
+    """Testa confusão O/0 e I/1"""
+    assert _serials(suggest_similar_serials('JQHP8I3', database, index)) == ['JQHP813']
+    assert _serials(suggest_similar_serials('8OOKOO1', database, index)) == ['BOOK001']
+
+
+def test_suggests_dropped_extra_and_swapped_character(database, index):
+    """Testa caractere faltando, sobrando e trocado"""
+    assert _serials(suggest_similar_serials('JQH813', database, index)) == ['JQHP813']
+    assert _serials(suggest_similar_serials('ABC123456', database, index)) == ['ABC12345']
+    assert _serials(suggest_similar_serials('XYZ98766', database, index)) == ['XYZ98765']
+
+
+def test_ranks_by_distance(database, index):
+    """Testa que sugestões mais próximas vêm primeiro"""
+    suggestions = suggest_similar_serials('jqhp8i3', database, index)
+    
+    assert suggestions[0]['distance'] == 0.5
+    assert suggestions[0]['state'] == 'stock'
+    assert suggestions[0]['name'] == 'NB-01'
+
+
+def test_no_suggestions_for_unrelated_serial(database, index):
+    """Testa serial sem nenhum vizinho próximo"""
+    assert suggest_similar_serials('QWERTYUI', database, index) == []
+
+
+def test_empty_database_has_no_index():
+    """Testa base vazia"""
+    assert build_suggestion_index(pd.DataFrame()) is None
+    assert suggest_similar_serials('ABC', pd.DataFrame(), None) == []
+
+
+# Testes para autocompletar por prefixo
+@pytest.fixture
+def prefix_index(database):
+    database = database.assign(Ativo=[9856.0, None, 9801.0, 1234.0])
+    removed = pd.DataFrame({'Serialnumber': ['JQDESK1'], 'Name': ['DT-01'], 'Ativo': [None]})
+    return build_prefix_index(database, removed)
+
+
+def test_prefix_search_covers_included_and_removed(prefix_index):
+    """Testa que a busca retorna registros aceitos e filtrados"""
+    matches = search_prefix('jq', prefix_index)
+    
+    assert [(m['value'], m['removed']) for m in matches] == [('JQDESK1', True), ('JQHP813', False)]
+
+
+def test_prefix_search_by_name_and_ativo(prefix_index):
+    """Testa busca por hostname e patrimônio"""
+    assert [m['value'] for m in search_prefix('nb-0', prefix_index, limit=2)] == ['NB-01', 'NB-02']
+    
+    ativos = search_prefix('98', prefix_index)
+    assert [m['value'] for m in ativos] == ['9801', '9856']
+    assert ativos[1]['position'] == 0
+
+
+def test_prefix_search_field_filter(prefix_index):
+    """Testa restrição de campos"""
+    assert search_prefix('nb', prefix_index, fields=('serial',)) == []
+    assert search_prefix('', prefix_index) == []
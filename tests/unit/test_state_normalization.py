@@ -3,6 +3,7 @@ Testes unitários para normalização de estados PT-BR/EN.
 """
 
 import pytest
+import pandas as pd
 from app.services.comparator import normalize_state
 
 
@@ -52,3 +53,32 @@ class TestStateNormalization:
         """Testa que valores não-string retornam 'unknown'."""
         assert normalize_state(123) == "unknown"
         assert normalize_state(None) == "unknown"
+
+
+class TestStateNormalizationSeries:
+    """Testes para a normalização vetorizada da coluna State."""
+    
+    def test_normalize_state_series_matches_scalar(self):
+        """Testa que a versão vetorizada segue normalize_state."""
+        from app.services.comparator import normalize_state_series
+        
+        states = pd.Series(["Estoque", " ACTIVE ", "Ativo", None, "xyz", "Em Reparo"])
+        result = normalize_state_series(states)
+        
+        assert isinstance(result.dtype, pd.CategoricalDtype)
+        assert result.tolist() == ["stock", "active", "active", "unknown", "unknown", "in repair"]
+    
+    def test_get_adjustment_list_uses_normalized_state(self):
+        """Testa que estados em PT-BR também entram na lista de ajustes."""
+        from app.services.comparator import get_adjustment_list, normalize_state_series
+        from app.utils.constants import STATE_NORMALIZED_COLUMN
+        
+        df = pd.DataFrame({
+            'Serialnumber': ['A1', 'B2', 'C3'],
+            'State': ['Ativo', 'Estoque', 'active'],
+            'Name': ['n1', 'n2', 'n3'],
+            'lastuser': ['u1', 'u2', 'u3']
+        })
+        df[STATE_NORMALIZED_COLUMN] = normalize_state_series(df['State'])
+        
+        assert get_adjustment_list(df)['Serialnumber'].tolist() == ['A1', 'C3']
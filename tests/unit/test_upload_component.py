@@ -0,0 +1,92 @@
+"""
+Testes do componente de upload (atualização da base por delta).
+
+O script roda no AppTest do Streamlit; o file_uploader é substituído por um
+buffer em memória com name/size/file_id, como o UploadedFile real.
+"""
+
+from streamlit.testing.v1 import AppTest
+
+
+def _upload_script():
+    import io
+    import streamlit as st
+    from app.components.upload_component import render_upload_component
+    
+    header = "Serialnumber,State,Name,lastuser,Model\n"
+    files = {
+        'A': header + "AAA111,Stock,H1,u1,Latitude 5420\nBBB222,Active,H2,u2,Latitude 5420\n",
+        'B': header + "AAA111,Active,H1,u1,Latitude 5420\nBBB222,Active,H2,u2,Latitude 5420\nCCC333,Stock,H3,u3,Latitude 5420\n",
+    }
+    
+    def fake_uploader(*args, **kwargs):
+        data = files[st.session_state.upload_which].encode()
+        buffer = io.BytesIO(data)
+        buffer.name = 'base.csv'
+        buffer.size = len(data)
+        buffer.file_id = st.session_state.upload_which
+        return buffer
+    
+    st.file_uploader = fake_uploader
+    render_upload_component()
+
+
+def _serials(at):
+    return sorted(at.session_state.dataframe['Serialnumber'].tolist())
+
+
+class TestUploadRefreshMode:
+    """Testes da escolha entre substituir e atualizar a base"""
+    
+    def _loaded_app(self):
+        at = AppTest.from_function(_upload_script, default_timeout=30)
+        at.session_state.upload_which = 'A'
+        at.run()
+        assert not at.exception
+        assert at.session_state.base_file_id == 'A'
+        return at
+    
+    def test_new_file_waits_for_confirmation_before_import(self):
+        """Testa que a base carregada não é substituída antes da confirmação"""
+        at = self._loaded_app()
+        at.session_state.upload_which = 'B'
+        at.run()
+        
+        assert len(at.radio) == 1
+        assert _serials(at) == ['AAA111', 'BBB222']
+        assert at.session_state.base_file_id == 'A'
+    
+    def test_refresh_applies_delta_across_reruns(self):
+        """Testa que 'Atualizar' aplica o delta e se mantém nos reruns seguintes"""
+        at = self._loaded_app()
+        at.session_state.upload_which = 'B'
+        at.run()
+        
+        at.radio[0].set_value(True)
+        at.button[0].click()
+        at.run()
+        
+        assert not at.exception
+        assert at.session_state.refreshed_file_id == 'B'
+        assert at.session_state.base_file_id == 'A'
+        assert _serials(at) == ['AAA111', 'BBB222', 'CCC333']
+        summary = at.session_state.base_refresh_summary
+        
+        at.run()
+        
+        assert len(at.radio) == 0
+        assert at.session_state.base_refresh_summary is summary
+        assert _serials(at) == ['AAA111', 'BBB222', 'CCC333']
+    
+    def test_replace_loads_new_base(self):
+        """Testa que 'Substituir' importa o novo arquivo como base"""
+        at = self._loaded_app()
+        at.session_state.upload_which = 'B'
+        at.run()
+        
+        at.button[0].click()
+        at.run()
+        
+        assert not at.exception
+        assert at.session_state.base_file_id == 'B'
+        assert _serials(at) == ['AAA111', 'BBB222', 'CCC333']